@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Gemini Code Assist PR Poetry collection pipeline.
+
+Each stage of the pipeline is timed on its own and the results are written as
+JSON, so runs of different versions can be compared:
+
+- pr_listing: `_list_pull_requests` against the fake GitHub server
+- comment_fetch: `fetch_gemini_comments` against the fake GitHub server
+- traditional_extraction: `_try_traditional_extraction` on Gemini-style comments
+- llm_extraction: `extract_poem_from_comment` with a stubbed LiteLLM backend
+- is_duplicate, save_poems_to_json and generate_markdown on poem collections
+  of every size given with --sizes
+
+The GitHub stages run against utils/fake_github_server.py without rate-limit
+pacing, so they measure the client rather than GitHub's request ceilings.
+
+Usage examples:
+    # Run every stage on 1k, 10k and 100k poem collections
+    python benchmarks/benchmark_pipeline.py --output benchmark-results.json
+
+    # Quick run of the collection stages only
+    python benchmarks/benchmark_pipeline.py --sizes 1000 --stages is_duplicate,generate_markdown
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+import contextlib
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'utils'))
+
+from fake_github_server import start_server, HAIKU_LINES
+
+COLLECTION_STAGES = ["is_duplicate", "save_poems_to_json", "generate_markdown"]
+STAGES = ["pr_listing", "comment_fetch", "traditional_extraction", "llm_extraction"] + COLLECTION_STAGES
+
+# Number of new poems checked against the collection in the is_duplicate stage, half of them duplicates
+DUPLICATE_LOOKUPS = 100
+
+def make_poem(index):
+    """Build a poem entry shaped like the output of create_poem_entry."""
+    return {
+        "poem": [lines[(index + offset) % len(lines)] for offset, lines in enumerate(HAIKU_LINES)],
+        "link": f"https://github.com/synthetic/repo-{index % 50}/pull/{index}#issuecomment-{10_000_000 + index}",
+        "repository": f"synthetic/repo-{index % 50}",
+        "pr_number": index,
+        "collected_at": "2025-01-01T00:00:00",
+    }
+
+def make_comment(index):
+    """Build a Gemini Code Assist summary comment ending with a poem."""
+    poem = "\n".join(f"> {lines[index % len(lines)]}" for lines in HAIKU_LINES)
+    return (
+        "## Summary of Changes\n\n"
+        f"Hello! I'm Gemini Code Assist. This pull request #{index} tidies up the module and adds tests.\n\n"
+        f"{poem}\n"
+    )
+
+def stub_completion(**kwargs):
+    """Stand-in for litellm.completion answering with the quoted lines of the prompt."""
+    prompt = kwargs["messages"][-1]["content"]
+    poem = "\n".join(line[2:] for line in prompt.splitlines() if line.startswith("> "))
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = poem or "NO_POEM"
+    return response
+
+def measure(stage, size, items, func, repeat):
+    """Time `func` `repeat` times.
+
+    Args:
+        stage: Name of the stage.
+        size: Size of the input the stage runs on.
+        items: Number of items one call of `func` processes.
+        func: The work to time.
+        repeat: Number of timed calls.
+
+    Returns:
+        A result dictionary with latency and throughput figures.
+    """
+    durations = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+
+    median = statistics.median(durations)
+    result = {
+        "stage": stage,
+        "size": size,
+        "items": items,
+        "repeat": repeat,
+        "min_seconds": min(durations),
+        "median_seconds": median,
+        "max_seconds": max(durations),
+        "latency_ms_per_item": median * 1000 / items if items else None,
+        "items_per_second": items / median if median else None,
+    }
+    print(f"{stage:<24} size={size:<8} median={median * 1000:10.2f}ms  {result['items_per_second'] or 0:12.1f} items/s", file=sys.stderr)
+    return result
+
+def benchmark_github(gnf, prs, repeat):
+    """Time the GitHub listing and comment fetch stages against the fake server."""
+    results = []
+    listed = []
+
+    def list_prs():
+        prs_found, _ = gnf._list_pull_requests("synthetic", "repo-0", max_prs=prs)
+        listed[:] = prs_found
+
+    results.append(measure("pr_listing", prs, prs, list_prs, repeat))
+    pr_numbers = [pr["number"] for pr in listed]
+    results.append(measure("comment_fetch", prs, len(pr_numbers),
+                           lambda: gnf.fetch_gemini_comments("synthetic", "repo-0", pr_numbers), repeat))
+    return results
+
+def benchmark_extraction(gnf, comments, repeat, stages):
+    """Time traditional and stubbed LLM extraction on Gemini-style comments."""
+    results = []
+    bodies = [make_comment(index) for index in range(comments)]
+
+    if "traditional_extraction" in stages:
+        results.append(measure("traditional_extraction", comments, comments,
+                               lambda: [gnf._try_traditional_extraction(body) for body in bodies], repeat))
+
+    if "llm_extraction" in stages:
+        with patch("litellm.completion", side_effect=stub_completion):
+            results.append(measure("llm_extraction", comments, comments,
+                                   lambda: [gnf.extract_poem_from_comment(body, "stub/model") for body in bodies], repeat))
+    return results
+
+def benchmark_collections(gnf, sizes, repeat, stages, work_dir):
+    """Time duplicate detection, JSON saving and markdown generation on poem collections."""
+    import cleanup_poems
+
+    results = []
+    for size in sizes:
+        collection = [make_poem(index) for index in range(size)]
+
+        if "is_duplicate" in stages:
+            # Half of the lookups hit poems spread over the collection, half miss it
+            lookups = [make_poem(index * size // DUPLICATE_LOOKUPS) for index in range(DUPLICATE_LOOKUPS // 2)]
+            lookups += [make_poem(size + index) for index in range(DUPLICATE_LOOKUPS - len(lookups))]
+
+            def check_duplicates():
+                [gnf.is_duplicate(poem, collection) for poem in lookups]
+                gnf.run_stats["duplicates"].clear()
+
+            results.append(measure("is_duplicate", size, len(lookups), check_duplicates, repeat))
+
+        if "save_poems_to_json" in stages:
+            json_file = os.path.join(work_dir, "poems.json")
+            results.append(measure("save_poems_to_json", size, size,
+                                   lambda: gnf.save_poems_to_json(collection, json_file), repeat))
+
+        if "generate_markdown" in stages:
+            md_file = os.path.join(work_dir, "poems.md")
+            results.append(measure("generate_markdown", size, size,
+                                   lambda: cleanup_poems.generate_markdown(collection, md_file), repeat))
+    return results
+
+def get_revision():
+    """Get the git revision being benchmarked, if available."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the stages of the poem collection pipeline")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated poem collection sizes")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated stages to run ({', '.join(STAGES)})")
+    parser.add_argument("--prs", type=int, default=200, help="PRs listed and fetched in the GitHub stages")
+    parser.add_argument("--comments", type=int, default=1000, help="Comments processed in the extraction stages")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage and size")
+    parser.add_argument("--output", help="File to write the JSON results to (default: stdout)")
+    return parser.parse_args()
+
+def main():
+    """Run the benchmarks and write the results."""
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    stages = [stage for stage in args.stages.split(",") if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        print(f"Unknown stages: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    # The crawler reads the API URL when it is imported, so the server has to be up first
+    server = start_server(repos=1, prs=args.prs)
+    os.environ["GITHUB_API_URL"] = server.url
+    os.environ.setdefault("GITHUB_TOKEN", "benchmark")
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        import get_new_flowers as gnf
+    from src.rate_limiter import RateLimiter
+    gnf.github_client.rate_limiter = RateLimiter(max_rates={"core": 1e6, "search": 1e6, "graphql": 1e6})
+
+    results = []
+    try:
+        if "pr_listing" in stages or "comment_fetch" in stages:
+            results += [result for result in benchmark_github(gnf, args.prs, args.repeat) if result["stage"] in stages]
+        results += benchmark_extraction(gnf, args.comments, args.repeat, stages)
+        with tempfile.TemporaryDirectory() as work_dir:
+            results += benchmark_collections(gnf, sizes, args.repeat, stages, work_dir)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    report = {
+        "revision": get_revision(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
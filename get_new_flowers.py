@@ -5,6 +5,11 @@ import requests
 import sys
 import argparse
 import time
+import socket
+import asyncio
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import litellm
 import subprocess
@@ -16,9 +21,20 @@ print("Initial imports successful.")
 from src.config import Config
 from src.error_handler import ErrorHandler
 from src.logger import PoemLogger
-# We'll use these in future refactoring
-# from src.llm_client_template import get_client_for_model, list_available_clients
-from src.llm_client_template import LiteLLMClient # Import LiteLLMClient
+from src.github_client import GitHubClient
+from src.token_pool import TokenPool
+from src.response_cache import ResponseCache
+from src.crawl_state import CrawlState, COMMENT_ID_FIELDS
+from src.github_graphql import list_pull_requests_with_comments
+from src.cassette import Cassette, RECORD, REPLAY
+from src.work_queue import WorkQueue
+from src.comment_index import CommentIndex, POEM, NO_POEM, ERROR
+from src.poem_journal import PoemJournal
+from src.batch_extraction import BatchExtractors
+from src.poem_scorer import PoemScorer
+from src.model_router import ModelRouter
+from src.loop_thread import LoopThread
+from src.llm_client_template import LiteLLMClient, get_client_for_model
 
 # Configure LiteLLM
 litellm.api_key = Config.GITHUB_TOKEN
@@ -32,6 +48,29 @@ run_stats = Config.get_initial_stats()
 # Initialize error handler
 error_handler = ErrorHandler(run_stats) # No need to pass failed_litellm_models or failed_clients here, ErrorHandler manages them
 
+# Guards run_stats counters updated from parallel repository workers
+run_stats_lock = threading.Lock()
+
+# Shared pooled session for all GitHub API calls, spreading requests over every configured token
+github_tokens = Config.get_github_tokens()
+github_client = GitHubClient(token_pool=TokenPool(github_tokens) if github_tokens else None)
+
+# Local gate keeping comments that are unlikely to contain a poem away from the LLM
+poem_scorer = PoemScorer()
+
+# Optional ModelRouter spreading LLM calls over several models, set up by main() with --route-models
+model_router = None
+
+# One event loop running every LLM extraction of the process, whichever thread crawls the repository
+llm_loop = LoopThread()
+
+# Per-model caps on LLM calls in flight, keyed by limit; only used on llm_loop, so shared by every repository
+llm_semaphores = {}
+
+def _llm_slots(llm_concurrency):
+    """Get the per-model semaphores capping the LLM calls of every repository at `llm_concurrency`."""
+    return llm_semaphores.setdefault(llm_concurrency, defaultdict(lambda: asyncio.Semaphore(llm_concurrency)))
+
 def load_custom_llm_models():
     """Load custom LLM models from the JSON file."""
     try:
@@ -63,12 +102,15 @@ SEARCH_REPOS_URL = Config.SEARCH_REPOS_URL
 PR_LIST_URL = Config.PR_LIST_URL
 PR_COMMENTS_URL = Config.PR_COMMENTS_URL
 PR_REVIEW_COMMENTS_URL = Config.PR_REVIEW_COMMENTS_URL # Corrected URL for review comments
-HEADERS = Config.get_headers()
 
 def search_public_repos(query="gemini-code-assist", max_repos=10):
     """Search for public repositories that might contain Gemini Code Assist comments."""
     search_url = f"{SEARCH_REPOS_URL}?q={query}&sort=updated&order=desc&per_page={max_repos}"
-    response = requests.get(search_url, headers=HEADERS)
+    try:
+        response = github_client.get(search_url)
+    except requests.RequestException as e:
+        error_handler.handle_api_error(e, "searching repositories")
+        return []
 
     if response.status_code != 200:
         print(f"Error searching repositories: {response.status_code}")
@@ -76,73 +118,158 @@ def search_public_repos(query="gemini-code-assist", max_repos=10):
 
     return [(repo["owner"]["login"], repo["name"]) for repo in response.json().get("items", [])]
 
-def get_pull_requests(owner, repo):
-    """Fetch all pull requests from a repository."""
-    prs = []
-    page = 1
+def iter_pull_requests(owner, repo, updated_after=None, per_page=100):
+    """Yield the pull requests of a repository lazily, newest first.
 
-    while True:
-        url = PR_LIST_URL.format(owner=owner, repo=repo)
-        print(f"Fetching PRs from {url}?page={page}&state=all&per_page=100")
-        response = requests.get(f"{url}?page={page}&state=all&per_page=100", headers=HEADERS)
+    Pages are only requested as the consumer iterates, so stopping early skips
+    the remaining pages.
 
-        if response.status_code != 200:
-            print(f"Error fetching PRs for {owner}/{repo}: {response.status_code}")
-            break
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        updated_after: Optional ISO 8601 watermark. When given, PRs are listed by
+            most recent update and listing stops at the first PR not updated
+            after the watermark.
+        per_page: Number of PRs per page.
 
-        results = response.json()
-        print(f"Got {len(results)} results for page {page}")
-        if not results:
-            break
+    Raises:
+        requests.RequestException: If a page cannot be fetched.
+    """
+    url = PR_LIST_URL.format(owner=owner, repo=repo)
+    params = {"state": "all", "per_page": per_page}
+    if updated_after:
+        params.update(sort="updated", direction="desc")
+
+    print(f"Fetching PRs from {url}")
+    for pr in github_client.paginate(url, params=params):
+        if updated_after and pr["updated_at"] <= updated_after:
+            print(f"Reached watermark {updated_after}")
+            return
+        yield pr
+
+def _list_pull_requests(owner, repo, updated_after=None, max_prs=None):
+    """Fetch pull requests from a repository, newest first.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        updated_after: Optional ISO 8601 watermark; only PRs updated after it are returned.
+        max_prs: Optional maximum number of PRs to return. No further pages are
+            requested once it is reached.
+
+    Returns:
+        A (prs, complete) tuple, where `complete` is False if listing stopped
+        early because of an error or `max_prs`.
+    """
+    # One PR beyond max_prs tells whether the listing was cut short
+    per_page = 100 if max_prs is None else max(1, min(100, max_prs + 1))
+    prs = []
+    try:
+        for pr in iter_pull_requests(owner, repo, updated_after, per_page):
+            if max_prs is not None and len(prs) >= max_prs:
+                return prs, False
+            prs.append(pr)
+    except requests.RequestException as e:
+        error_handler.handle_api_error(e, f"fetching PRs for {owner}/{repo}")
+        return prs, False
 
-        prs.extend(results)
-        page += 1
+    print(f"Got {len(prs)} PRs for {owner}/{repo}")
+    return prs, True
 
-        # Respect GitHub API rate limits
-        if page % 10 == 0:
-            time.sleep(1)
+def get_pull_requests(owner, repo, updated_after=None, max_prs=None):
+    """Fetch all pull requests from a repository.
 
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        updated_after: Optional ISO 8601 watermark; only PRs updated after it are returned.
+        max_prs: Optional maximum number of PRs to fetch.
+    """
+    prs, _ = _list_pull_requests(owner, repo, updated_after, max_prs)
     return prs
 
-def get_comments_for_pr(owner, repo, pr_number):
-    """Fetch all comments for a given PR."""
-    url = PR_COMMENTS_URL.format(owner=owner, repo=repo, pr_number=pr_number)
-    print(f"Fetching comments from {url}")
-    response = requests.get(url, headers=HEADERS)
+def discover_bot_pull_requests(owner, repo, updated_after=None, max_prs=None):
+    """Find the PRs of a repository that Gemini Code Assist commented on.
 
-    if response.status_code != 200:
-        print(f"Error fetching comments for PR #{pr_number} in {owner}/{repo}: {response.status_code}")
-        return []
+    Uses the issue search API, so PRs the bot never touched are not fetched at all.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        updated_after: Optional ISO 8601 watermark; only PRs updated after it are returned.
+        max_prs: Optional maximum number of PRs to return. No further result
+            pages are requested once it is reached.
+
+    Returns:
+        A (prs, complete) tuple, most recently updated PR first. `complete` is
+        False if a page failed, `max_prs` was reached or the search hit GitHub's
+        result limit.
+    """
+    query = Config.BOT_PR_SEARCH_QUERY.format(owner=owner, repo=repo, bot=Config.BOT_NAME)
+    if updated_after:
+        query += f" updated:>{updated_after}"
+    per_page = 100 if max_prs is None else max(1, min(100, max_prs + 1))
+    params = {"q": query, "sort": "updated", "order": "desc", "per_page": per_page}
+    print(f"Discovering PRs with Gemini Code Assist comments: {query}")
 
-    comments = response.json()
+    prs = []
+    try:
+        for item in github_client.paginate(Config.SEARCH_ISSUES_URL, params=params):
+            if updated_after and item["updated_at"] <= updated_after:
+                continue
+            if max_prs is not None and len(prs) >= max_prs:
+                return prs, False
+            prs.append({"number": item["number"], "updated_at": item["updated_at"]})
+    except requests.RequestException as e:
+        error_handler.handle_api_error(e, f"discovering PRs for {owner}/{repo}")
+        return prs, False
+
+    if len(prs) >= Config.SEARCH_RESULTS_LIMIT:
+        print(f"Search for {owner}/{repo} reached the {Config.SEARCH_RESULTS_LIMIT} result limit; older PRs were not discovered")
+        return prs, False
+
+    return prs, True
+
+def iter_list_items(url, context, failures=None):
+    """Yield every item of a GitHub list endpoint, streaming page by page.
+
+    Pages are requested with Config.GITHUB_PAGE_SIZE items each, following the
+    `Link: rel="next"` header until the last page.
+
+    Args:
+        url: URL of the list endpoint.
+        context: Description of the request used in error messages.
+        failures: Optional list the context is appended to when a page fails,
+            so callers can tell a partial list from a complete one.
+    """
+    try:
+        yield from github_client.paginate(url, params={"per_page": Config.GITHUB_PAGE_SIZE})
+    except requests.RequestException as e:
+        error_handler.handle_api_error(e, context)
+        if failures is not None:
+            failures.append(context)
+
+def get_comments_for_pr(owner, repo, pr_number, failures=None):
+    """Fetch all comments for a given PR; see `iter_list_items` for `failures`."""
+    url = PR_COMMENTS_URL.format(owner=owner, repo=repo, pr_number=pr_number)
+    print(f"Fetching comments from {url}")
+    comments = list(iter_list_items(url, f"fetching comments for PR #{pr_number} in {owner}/{repo}", failures))
     print(f"Found {len(comments)} comments for PR #{pr_number}")
     return comments
 
-def get_reviews_for_pr(owner, repo, pr_number):
-    """Fetch all reviews for a given PR."""
+def get_reviews_for_pr(owner, repo, pr_number, failures=None):
+    """Fetch all reviews for a given PR; see `iter_list_items` for `failures`."""
     url = Config.PR_REVIEWS_URL.format(owner=owner, repo=repo, pr_number=pr_number)
     print(f"Fetching reviews from {url}")
-    response = requests.get(url, headers=HEADERS)
-
-    if response.status_code != 200:
-        print(f"Error fetching reviews for PR #{pr_number} in {owner}/{repo}: {response.status_code}")
-        return []
-
-    reviews = response.json()
+    reviews = list(iter_list_items(url, f"fetching reviews for PR #{pr_number} in {owner}/{repo}", failures))
     print(f"Found {len(reviews)} reviews for PR #{pr_number}")
     return reviews
 
-def get_comments_from_review(owner, repo, pr_number, review_id):
-    """Fetch comments for a specific review."""
+def get_comments_from_review(owner, repo, pr_number, review_id, failures=None):
+    """Fetch comments for a specific review; see `iter_list_items` for `failures`."""
     url = Config.PR_REVIEW_COMMENTS_URL.format(owner=owner, repo=repo, pr_number=pr_number, review_id=review_id)
     print(f"Fetching comments for review {review_id} from {url}")
-    response = requests.get(url, headers=HEADERS)
-
-    if response.status_code != 200:
-        print(f"Error fetching comments for review {review_id} in PR #{pr_number} in {owner}/{repo}: {response.status_code}")
-        return []
-
-    comments = response.json()
+    comments = list(iter_list_items(url, f"fetching comments for review {review_id} in PR #{pr_number} in {owner}/{repo}", failures))
     print(f"Found {len(comments)} comments for review {review_id}")
     return comments
 
@@ -265,49 +392,189 @@ def extract_poem_from_comment(comment_body, model_name_to_use, ollama_only=False
         model_name_to_use: The specific model name to use (e.g., "gemini/gemini-1.5-flash")
         ollama_only: If True, only use Ollama models for LLM processing (Note: this flag might be redundant if model_name_to_use already specifies an ollama model)
     """
+    poem_lines, link_line, _ = _extract_poem_with_outcome(comment_body, model_name_to_use, ollama_only)
+    return (poem_lines, link_line)
+
+def _prepare_extraction(comment_body, model_name_to_use, ollama_only=False):
+    """Run the extraction steps that need no LLM call.
+
+    Returns:
+        A (result, prompt) tuple. `result` is the (poem_lines, link_line, outcome)
+        tuple when the comment was settled without the LLM; otherwise it is None
+        and `prompt` is the prompt to send to the LLM.
+    """
     if not comment_body:
-        return (None, None)
+        return (None, None, NO_POEM), None
 
-    lines = comment_body.strip().splitlines()
     poem_lines, link_line = _try_traditional_extraction(comment_body)
     if poem_lines and link_line:
-        return (poem_lines, link_line)
+        return (poem_lines, link_line, POEM), None
 
-    prompt = Config.POEM_EXTRACTION_PROMPT.format(comment_body=comment_body)
+    if not poem_scorer.should_extract(comment_body):
+        print(f"    Comment scored below the poem threshold of {poem_scorer.threshold}. Not sent to the LLM.")
+        return (None, None, NO_POEM), None
 
     if ollama_only and not model_name_to_use.startswith("ollama/"):
         print(f"    Ollama-only mode is enabled, but the specified model '{model_name_to_use}' is not an Ollama model. Skipping.")
-        return (None, None)
+        return (None, None, ERROR), None
 
     if ollama_only and not is_ollama_running():
         print("    Ollama-only mode is enabled but Ollama server is not running.")
-        return (None, None)
+        return (None, None, ERROR), None
 
     print(f"    Trying to extract poem using LiteLLM with {model_name_to_use}...")
+    return None, Config.POEM_EXTRACTION_PROMPT.format(comment_body=comment_body)
+
+def _interpret_llm_response(poem_text, comment_body, model_name_to_use):
+    """Turn the LLM answer for a comment into a (poem_lines, link_line, outcome) tuple."""
+    if not poem_text or poem_text == "NO_POEM" or "NO_POEM" in poem_text:
+        print(f"    LiteLLM ({model_name_to_use}) found no poem or indicated NO_POEM.")
+        return (None, None, NO_POEM)
+
+    print(f"    LiteLLM response from {model_name_to_use}: {poem_text[:100]}...")
+    poem_lines, link_line = _process_llm_response(poem_text, comment_body, comment_body.strip().splitlines())
+    return (poem_lines, link_line, POEM if poem_lines else NO_POEM)
+
+def _record_llm_failure(error, model_name_to_use):
+    """Report a failed LLM call and get the (poem_lines, link_line, outcome) tuple of the comment.
+
+    The comment is recorded as an error, so the comment index retries it on a later run.
+    """
+    print(f"    Error using LiteLLM client with {model_name_to_use}: {error}")
+    error_handler.handle_litellm_error(error, model_name_to_use)
+    return (None, None, ERROR)
+
+def _handle_llm_failure(error, model_name_to_use):
+    """Report a failed LLM call, exiting when every model has failed, and get the (poem_lines, link_line, outcome) tuple of the comment."""
+    _record_llm_failure(error, model_name_to_use)
+    error_handler.check_all_models_failed(
+        primary_models=[Config.DEFAULT_MODEL], # Assuming DEFAULT_MODEL is the only primary
+        custom_models=load_custom_llm_models(), # Still need to load custom models to check if all failed
+        llm_clients=[] # No separate client implementations anymore
+    )
+    return (None, None, ERROR)
+
+def _extract_poem_with_outcome(comment_body, model_name_to_use, ollama_only=False):
+    """Extract poem and link from a comment, reporting how the extraction went.
+
+    Returns:
+        A (poem_lines, link_line, outcome) tuple, where `outcome` is POEM,
+        NO_POEM, or ERROR when the comment could not be analyzed.
+    """
+    result, prompt = _prepare_extraction(comment_body, model_name_to_use, ollama_only)
+    if result is not None:
+        return result
 
-    # Instantiate LiteLLMClient with the specified model
-    llm_client = LiteLLMClient(model_name=model_name_to_use)
+    # Reuse the shared client of the specified model
+    llm_client = get_client_for_model(model_name_to_use)
 
     try:
         poem_text = llm_client.extract_poem(prompt)
         run_stats["models_used"].add(model_name_to_use) # Track model usage
 
-        if not poem_text or poem_text == "NO_POEM" or "NO_POEM" in poem_text:
-            print(f"    LiteLLM ({model_name_to_use}) found no poem or indicated NO_POEM.")
-            return (None, None)
+        # The client answers NO_POEM when the completion itself failed
+        if isinstance(getattr(llm_client, "last_error", None), Exception):
+            return (None, None, ERROR)
 
-        print(f"    LiteLLM response from {model_name_to_use}: {poem_text[:100]}...")
-        return _process_llm_response(poem_text, comment_body, lines)
+        return _interpret_llm_response(poem_text, comment_body, model_name_to_use)
 
     except Exception as e:
-        print(f"    Error using LiteLLM client with {model_name_to_use}: {e}")
-        error_handler.handle_litellm_error(e, model_name_to_use)
-        error_handler.check_all_models_failed(
-            primary_models=[Config.DEFAULT_MODEL], # Assuming DEFAULT_MODEL is the only primary
-            custom_models=load_custom_llm_models(), # Still need to load custom models to check if all failed
-            llm_clients=[] # No separate client implementations anymore
-        )
-        return (None, None)
+        return _handle_llm_failure(e, model_name_to_use)
+
+async def _aextract_poem_with_outcome(comment_body, model_name_to_use, ollama_only, semaphores, batchers=None):
+    """Extract poem and link from a comment with an asynchronous LLM call.
+
+    Args:
+        comment_body: The comment text to analyze
+        model_name_to_use: The specific model name to use for LLM processing.
+        ollama_only: If True, only use Ollama models for LLM processing
+        semaphores: Per-model semaphores bounding the LLM calls in flight.
+        batchers: Optional BatchExtractors packing the comments into batched prompts.
+
+    Returns:
+        A (poem_lines, link_line, outcome) tuple, like `_extract_poem_with_outcome`.
+    """
+    result, prompt = _prepare_extraction(comment_body, model_name_to_use, ollama_only)
+    if result is not None:
+        return result
+
+    if model_router is not None:
+        return await _aextract_with_router(comment_body, prompt, semaphores, batchers)
+
+    for attempt in range(Config.LLM_RATE_LIMIT_RETRIES + 1):
+        try:
+            poem_text = await _acall_llm(model_name_to_use, comment_body, prompt, semaphores, batchers)
+        except Exception as e:
+            if attempt < Config.LLM_RATE_LIMIT_RETRIES and error_handler.is_rate_limit_error(e):
+                # Defer this comment only; comments of other models and other stages keep going
+                print(f"    Rate limit hit with {model_name_to_use}; deferring the comment until the model is available again.")
+                error_handler.handle_litellm_error(e, model_name_to_use)
+                continue
+            # No exit check here: failures pile up over concurrent calls, and
+            # exiting from inside the event loop would lose the poems found so far
+            return _record_llm_failure(e, model_name_to_use)
+        error_handler.record_llm_success(model_name_to_use)
+        run_stats["models_used"].add(model_name_to_use) # Track model usage
+        return _interpret_llm_response(poem_text, comment_body, model_name_to_use)
+
+async def _await_model_available(model_name):
+    """Wait without blocking the event loop until a rate-limited model can be called again."""
+    wait_time = error_handler.cooldown_remaining(model_name)
+    if wait_time > 0:
+        await asyncio.sleep(wait_time)
+
+async def _acall_llm(model_name, comment_body, prompt, semaphores, batchers):
+    """Send a comment to a model, alone or as part of a batch, and get its answer.
+
+    The rate limit cooldown is checked once the semaphore is held, so comments
+    that queued for the model before it was rate limited wait it out too.
+    """
+    if batchers is not None:
+        return await batchers[model_name].extract(comment_body)
+    async with semaphores[model_name]:
+        await _await_model_available(model_name)
+        return await get_client_for_model(model_name).aextract_poem(prompt)
+
+async def _aextract_with_router(comment_body, prompt, semaphores, batchers):
+    """Extract a comment with the models picked by the router, moving on to another model when one fails.
+
+    A rate-limited model is not dropped: it is left out until its cooldown is
+    over, and the comment waits for it only when no other model is left.
+
+    Returns:
+        A (poem_lines, link_line, outcome) tuple. The outcome is ERROR when no
+        healthy model answered within Config.ROUTER_MAX_ATTEMPTS attempts.
+    """
+    tried = set()
+    attempts = 0
+    while attempts < Config.ROUTER_MAX_ATTEMPTS:
+        # Rate-limited models are skipped until their cooldown is over
+        throttled = {model: error_handler.cooldown_remaining(model) for model in model_router.models if model not in tried}
+        throttled = {model: wait_time for model, wait_time in throttled.items() if wait_time > 0}
+        model_name = model_router.choose(exclude=tried | set(throttled))
+        if model_name is None:
+            if not throttled:
+                break
+            await asyncio.sleep(min(throttled.values()))
+            continue
+        attempts += 1
+        start = time.monotonic()
+        try:
+            poem_text = await _acall_llm(model_name, comment_body, prompt, semaphores, batchers)
+        except Exception as e:
+            model_router.record_failure(model_name, time.monotonic() - start)
+            print(f"    Error using LiteLLM client with {model_name}: {e}")
+            rate_limited, _ = error_handler.handle_litellm_error(e, model_name)
+            if not rate_limited:
+                tried.add(model_name)
+            continue
+        model_router.record_success(model_name, time.monotonic() - start)
+        error_handler.record_llm_success(model_name)
+        run_stats["models_used"].add(model_name) # Track model usage
+        return _interpret_llm_response(poem_text, comment_body, model_name)
+
+    print("    No healthy model could extract this comment; it will be retried in a later run.")
+    return (None, None, ERROR)
 
 
 def create_poem_entry(poem_lines, link, repo_owner, repo_name, pr_number):
@@ -355,7 +622,7 @@ def save_poems_to_json(poems, json_file):
     with open(json_file, 'w', encoding='utf-8') as f:
         json.dump(poems, f, indent=2)
 
-def _process_gemini_comment(comment, owner, repo, pr_number, model_name_to_use, comment_type="comment", ollama_only=False):
+async def _process_gemini_comment(comment, owner, repo, pr_number, model_name_to_use, semaphores, comment_type="comment", ollama_only=False, batchers=None):
     """Process a comment from Gemini Code Assist to extract poems.
 
     Args:
@@ -364,8 +631,14 @@ def _process_gemini_comment(comment, owner, repo, pr_number, model_name_to_use,
         repo: Repository name
         pr_number: Pull request number
         model_name_to_use: The specific model name to use for LLM processing.
+        semaphores: Per-model semaphores bounding the LLM calls in flight.
         comment_type: Type of comment ("comment" or "review")
         ollama_only: If True, only use Ollama models for LLM processing
+        batchers: Optional BatchExtractors packing the comments into batched prompts.
+
+    Returns:
+        An (entry, outcome) tuple. `entry` is the poem entry or None, and
+        `outcome` is POEM, NO_POEM or ERROR.
     """
     no_poem_phrases = [
         "The GitHub comment does not contain a poem",
@@ -374,23 +647,335 @@ def _process_gemini_comment(comment, owner, repo, pr_number, model_name_to_use,
     ]
     if any(phrase.lower() in comment["body"].lower() for phrase in no_poem_phrases):
         print("    Comment contains a NO POEM phrase. Skipping.")
-        return None
+        return None, NO_POEM
 
     print(f"    Found {comment_type} from Gemini Code Assist: {comment['user']['login']}")
-    poem_lines, link = extract_poem_from_comment(comment["body"], model_name_to_use=model_name_to_use, ollama_only=ollama_only)
+    poem_lines, link, outcome = await _aextract_poem_with_outcome(comment["body"], model_name_to_use, ollama_only, semaphores, batchers)
 
     if not (poem_lines and link):
         print(f"    No poem found in {comment_type} from {comment['user']['login']} using model {model_name_to_use}")
-        return None
+        return None, NO_POEM if outcome == POEM else outcome
 
     if comment.get("html_url"):
         link = f"<{comment['html_url']}>"
 
     entry = create_poem_entry(poem_lines, link, owner, repo, pr_number)
     print(f"    Found poem in PR #{pr_number} from {comment_type}")
-    return entry
+    return entry, POEM
+
+def _is_gemini_user(item):
+    """Check whether a comment or review was authored by Gemini Code Assist."""
+    return "gemini-code-assist" in item["user"]["login"].lower()
 
-def collect_poems_from_repo(owner, repo, model_name_to_use, max_prs=100, ollama_only=False):
+async def _fetch_gemini_comments_for_pr(owner, repo, pr_number, semaphore, failures):
+    """Fetch the Gemini Code Assist comments of a single PR.
+
+    The issue comments and reviews are requested in parallel, followed by the
+    comments of every Gemini review. Each request holds the shared semaphore so
+    the total number of in-flight requests stays bounded.
+
+    Returns:
+        A list of (comment, comment_type) tuples in a deterministic order. A
+        request that failed is appended to `failures`.
+    """
+    async def fetch(func, *args):
+        async with semaphore:
+            return await asyncio.to_thread(func, owner, repo, pr_number, *args, failures=failures)
+
+    comments, reviews = await asyncio.gather(
+        fetch(get_comments_for_pr),
+        fetch(get_reviews_for_pr)
+    )
+
+    gemini_comments = []
+    for comment in comments:
+        print(f"    Comment from user: {comment['user']['login']}")
+        if _is_gemini_user(comment):
+            gemini_comments.append((comment, "comment"))
+
+    gemini_reviews = []
+    for review in reviews:
+        print(f"    Review from user: {review['user']['login']}")
+        if _is_gemini_user(review):
+            gemini_reviews.append(review)
+
+    review_comment_lists = await asyncio.gather(
+        *(fetch(get_comments_from_review, review["id"]) for review in gemini_reviews)
+    )
+    for review_comments in review_comment_lists:
+        for review_comment in review_comments:
+            print(f"      Review comment from user: {review_comment['user']['login']}")
+            if _is_gemini_user(review_comment):
+                gemini_comments.append((review_comment, "review_comment"))
+
+    return gemini_comments
+
+async def _fetch_gemini_comments_async(owner, repo, pr_numbers, concurrency, failed_prs):
+    """Fan out the per-PR fetches with at most `concurrency` requests in flight."""
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    semaphore = asyncio.Semaphore(concurrency)
+    failures_by_pr = {pr_number: [] for pr_number in pr_numbers}
+    results = await asyncio.gather(
+        *(_fetch_gemini_comments_for_pr(owner, repo, pr_number, semaphore, failures_by_pr[pr_number]) for pr_number in pr_numbers)
+    )
+    failed_prs.extend(pr_number for pr_number in pr_numbers if failures_by_pr[pr_number])
+    return results
+
+def fetch_gemini_comments(owner, repo, pr_numbers, concurrency=Config.DEFAULT_CONCURRENCY, failed_prs=None):
+    """Fetch the Gemini Code Assist comments for several PRs concurrently.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        pr_numbers: The PR numbers to fetch comments for
+        concurrency: Maximum number of GitHub requests in flight at once
+        failed_prs: Optional list the number of every PR whose comments or
+            reviews could not all be fetched is appended to.
+
+    Returns:
+        A list with one entry per PR number, in the same order as `pr_numbers`.
+        Each entry is a list of (comment, comment_type) tuples.
+    """
+    if not pr_numbers:
+        return []
+    return asyncio.run(_fetch_gemini_comments_async(owner, repo, pr_numbers, max(1, concurrency), failed_prs if failed_prs is not None else []))
+
+def select_gemini_comments_from_graphql(pr):
+    """Select the Gemini Code Assist comments of a PR fetched through GraphQL.
+
+    Args:
+        pr: A PR as returned by `list_pull_requests_with_comments`.
+
+    Returns:
+        A list of (comment, comment_type) tuples, in the same order as the REST fetch engine.
+    """
+    gemini_comments = []
+    for comment in pr["comments"]:
+        print(f"    Comment from user: {comment['user']['login']}")
+        if _is_gemini_user(comment):
+            gemini_comments.append((comment, "comment"))
+
+    for review in pr["reviews"]:
+        print(f"    Review from user: {review['user']['login']}")
+        if _is_gemini_user(review):
+            for review_comment in review["comments"]:
+                print(f"      Review comment from user: {review_comment['user']['login']}")
+                if _is_gemini_user(review_comment):
+                    gemini_comments.append((review_comment, "review_comment"))
+
+    return gemini_comments
+
+def _pr_number_from_url(url):
+    """Get the PR number from an issue_url or pull_request_url."""
+    return int(url.rstrip("/").rsplit("/", 1)[1])
+
+def fetch_gemini_comments_in_bulk(owner, repo, since=None):
+    """Fetch the Gemini Code Assist comments of a whole repository at 100 comments per request.
+
+    Instead of calling the comment endpoints once per PR, this pages through the
+    repository-level issue comment and review comment endpoints and groups the
+    comments by PR client-side. Comments on plain issues are ignored.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        since: Optional ISO 8601 timestamp; only comments updated after it are fetched.
+
+    Returns:
+        A (prs, complete) tuple. `prs` lists every PR that has comments, newest
+        PR number first, as dictionaries with `number`, `updated_at` (the latest
+        comment update) and `gemini_comments`, a list of (comment, comment_type)
+        tuples ordered like the per-PR fetch engine. `complete` is False if a
+        page failed to load.
+    """
+    params = {"per_page": 100, "sort": "updated", "direction": "desc"}
+    if since:
+        params["since"] = since
+
+    prs = {}
+    sources = (
+        (Config.REPO_ISSUE_COMMENTS_URL, "comment", "issue_url"),
+        (Config.REPO_REVIEW_COMMENTS_URL, "review_comment", "pull_request_url"),
+    )
+    try:
+        for url_template, comment_type, pr_url_field in sources:
+            url = url_template.format(owner=owner, repo=repo)
+            print(f"Fetching {comment_type}s in bulk from {url}")
+            for comment in github_client.paginate(url, params=params):
+                if comment_type == "comment" and "/pull/" not in comment["html_url"]:
+                    continue
+                pr_number = _pr_number_from_url(comment[pr_url_field])
+                pr = prs.setdefault(pr_number, {"number": pr_number, "updated_at": comment["updated_at"], "gemini_comments": []})
+                pr["updated_at"] = max(pr["updated_at"], comment["updated_at"])
+                if _is_gemini_user(comment):
+                    pr["gemini_comments"].append((comment, comment_type))
+    except requests.RequestException as e:
+        error_handler.handle_api_error(e, f"fetching comments in bulk for {owner}/{repo}")
+        complete = False
+    else:
+        complete = True
+
+    type_order = {"comment": 0, "review_comment": 1}
+    for pr in prs.values():
+        pr["gemini_comments"].sort(key=lambda item: (type_order[item[1]], item[0]["id"]))
+
+    return sorted(prs.values(), key=lambda pr: pr["number"], reverse=True), complete
+
+def _highest_comment_ids(gemini_comments_by_pr, failed_comments=()):
+    """Get the highest comment id per watermark field, e.g. {"issue_comment_id": 42}.
+
+    Ids stop below the lowest failed comment of each field, so the watermark
+    does not hide failed comments from the next run.
+    """
+    lowest_failed = {}
+    for _, comment, comment_type in failed_comments:
+        field = COMMENT_ID_FIELDS[comment_type]
+        lowest_failed[field] = min(lowest_failed.get(field, comment["id"]), comment["id"])
+
+    highest_ids = {}
+    for gemini_comments in gemini_comments_by_pr:
+        for comment, comment_type in gemini_comments:
+            field = COMMENT_ID_FIELDS[comment_type]
+            if field in lowest_failed and comment["id"] >= lowest_failed[field]:
+                continue
+            highest_ids[field] = max(highest_ids.get(field, 0), comment["id"])
+    return highest_ids
+
+def _advance_watermark(crawl_state, repo_key, prs, gemini_comments_by_pr, failed_comments=()):
+    """Record the newest PR update and comment ids processed for a repository.
+
+    PRs with a failed comment, and every PR updated after them, stay above the
+    watermark so the next run lists them again.
+    """
+    failed_prs = {pr_number for pr_number, _, _ in failed_comments}
+    oldest_failed = min((pr["updated_at"] for pr in prs if pr["number"] in failed_prs), default=None)
+    crawl_state.advance_watermark(
+        repo_key,
+        pr_updated_at=max((pr["updated_at"] for pr in prs if oldest_failed is None or pr["updated_at"] < oldest_failed), default=None),
+        **_highest_comment_ids(gemini_comments_by_pr, failed_comments)
+    )
+
+def _extract_poems(owner, repo, pr_numbers, gemini_comments_by_pr, model_name_to_use, ollama_only=False, watermark=None, comment_index=None, journal=None, llm_concurrency=Config.LLM_CONCURRENCY, llm_batch_size=Config.LLM_BATCH_SIZE, failed_comments=None):
+    """Extract the poems from the Gemini Code Assist comments of several PRs.
+
+    The comments of every PR are extracted concurrently on `llm_loop`, with at
+    most `llm_concurrency` LLM calls in flight per model across every repository
+    crawled in parallel. With an `llm_batch_size`
+    above 1, the comments that need the LLM are packed into batched prompts.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        pr_numbers: The PR numbers
+        gemini_comments_by_pr: One list of (comment, comment_type) tuples per PR number
+        model_name_to_use: The specific model name to use for LLM processing.
+        ollama_only: If True, only use Ollama models for LLM processing
+        watermark: Optional repository watermark; comments at or below its comment ids are
+            skipped, unless the comment index holds them as failed or edited since.
+        comment_index: Optional CommentIndex; unchanged comments it already holds
+            are skipped, and the outcome of every processed comment is recorded.
+        journal: Optional PoemJournal; PRs it marks as completed are skipped, and
+            every poem is appended to it, as is every PR completed without a failed comment.
+        llm_concurrency: Maximum number of LLM calls in flight per model
+        llm_batch_size: Maximum number of comments per LLM prompt
+        failed_comments: Optional list the (pr_number, comment, comment_type) of
+            every comment whose extraction failed is appended to.
+
+    Returns:
+        The poems in PR order, and in comment order within a PR.
+    """
+    return llm_loop.run(_extract_poems_async(
+        owner, repo, pr_numbers, gemini_comments_by_pr, model_name_to_use, ollama_only,
+        watermark or {}, comment_index, journal, max(1, llm_concurrency), llm_batch_size,
+        failed_comments if failed_comments is not None else []
+    ))
+
+async def _extract_poems_async(owner, repo, pr_numbers, gemini_comments_by_pr, model_name_to_use, ollama_only, watermark, comment_index, journal, llm_concurrency, llm_batch_size, failed_comments):
+    """Extract the poems of several PRs concurrently; see `_extract_poems`."""
+    repo_key = f"{owner}/{repo}"
+    semaphores = _llm_slots(llm_concurrency)
+    batchers = BatchExtractors(get_client_for_model, semaphores, llm_batch_size, ready=_await_model_available, error_handler=error_handler) if llm_batch_size > 1 else None
+
+    async def process_pr(pr_number, gemini_comments):
+        print(f"  Processing PR #{pr_number}...")
+        pending = []
+        for comment, comment_type in gemini_comments:
+            seen_id = watermark.get(COMMENT_ID_FIELDS[comment_type])
+            retry = comment_index is not None and comment_index.needs_retry(comment_type, comment)
+            if not retry and seen_id is not None and comment["id"] <= seen_id:
+                print(f"    Skipping {comment_type} {comment['id']} already seen in a previous run")
+                continue
+            if comment_index is not None and comment_index.is_processed(comment_type, comment):
+                print(f"    Skipping {comment_type} {comment['id']} processed in a previous run and unchanged since")
+                continue
+            pending.append((comment, comment_type))
+
+        results = await asyncio.gather(*(
+            _process_gemini_comment(comment, owner, repo, pr_number, model_name_to_use, semaphores, comment_type=comment_type, ollama_only=ollama_only, batchers=batchers)
+            for comment, comment_type in pending
+        ))
+
+        # Match the results back to their comments once the whole PR is done
+        poems = []
+        pr_failed = False
+        for (comment, comment_type), (entry, outcome) in zip(pending, results):
+            if entry:
+                poems.append(entry)
+                if journal is not None:
+                    journal.append_poem(repo_key, pr_number, entry)
+            if outcome == ERROR:
+                failed_comments.append((pr_number, comment, comment_type))
+                pr_failed = True
+            if comment_index is not None:
+                comment_index.record(comment_type, comment, outcome)
+        # A PR with a failed comment is processed again on --resume
+        if journal is not None and not pr_failed:
+            journal.mark_pr_done(repo_key, pr_number)
+        return poems
+
+    tasks = []
+    for pr_number, gemini_comments in zip(pr_numbers, gemini_comments_by_pr):
+        if journal is not None and journal.is_pr_done(repo_key, pr_number):
+            print(f"  Skipping PR #{pr_number} completed before the run was interrupted")
+            continue
+        tasks.append(process_pr(pr_number, gemini_comments))
+
+    poems_by_pr = await asyncio.gather(*tasks)
+    if batchers:
+        batches = sum(batcher.batches for batcher in batchers.values())
+        fallbacks = sum(batcher.fallbacks for batcher in batchers.values())
+        print(f"Sent {batches} batched LLM prompts for {repo_key}; {fallbacks} comments fell back to single prompts")
+    return [poem for pr_poems in poems_by_pr for poem in pr_poems]
+
+def collect_poems_from_prs(owner, repo, pr_numbers, model_name_to_use, ollama_only=False, concurrency=Config.DEFAULT_CONCURRENCY, watermark=None, llm_concurrency=Config.LLM_CONCURRENCY, llm_batch_size=Config.LLM_BATCH_SIZE):
+    """Collect the poems of a given set of PRs through the REST API.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        pr_numbers: The PR numbers to process
+        model_name_to_use: The specific model name to use for LLM processing.
+        ollama_only: If True, only use Ollama models for LLM processing
+        concurrency: Maximum number of GitHub requests in flight at once
+        watermark: Optional repository watermark; comments at or below its comment ids are skipped.
+        llm_concurrency: Maximum number of LLM calls in flight per model
+        llm_batch_size: Maximum number of comments per LLM prompt
+
+    Returns:
+        A (poems, highest_ids, complete) tuple, where `highest_ids` maps each
+        comment id watermark field to the highest Gemini comment id that can be
+        covered by the watermark, and `complete` is False when a comment failed
+        or the comments of a PR could not all be fetched.
+    """
+    with run_stats_lock:
+        run_stats["prs_checked"] += len(pr_numbers)
+    failed_prs = []
+    gemini_comments_by_pr = fetch_gemini_comments(owner, repo, pr_numbers, concurrency, failed_prs)
+    failed_comments = []
+    poems = _extract_poems(owner, repo, pr_numbers, gemini_comments_by_pr, model_name_to_use, ollama_only, watermark, llm_concurrency=llm_concurrency, llm_batch_size=llm_batch_size, failed_comments=failed_comments)
+    return poems, _highest_comment_ids(gemini_comments_by_pr, failed_comments), not (failed_comments or failed_prs)
+
+def collect_poems_from_repo(owner, repo, model_name_to_use, max_prs=100, ollama_only=False, concurrency=Config.DEFAULT_CONCURRENCY, crawl_state=None, use_watermarks=True, ingestion="rest", comment_index=None, journal=None, llm_concurrency=Config.LLM_CONCURRENCY, llm_batch_size=Config.LLM_BATCH_SIZE):
     """Collect all poems from a specific repository.
 
     Args:
@@ -399,41 +984,252 @@ def collect_poems_from_repo(owner, repo, model_name_to_use, max_prs=100, ollama_
         model_name_to_use: The specific model name to use for LLM processing.
         max_prs: Maximum number of PRs to check
         ollama_only: If True, only use Ollama models for LLM processing
+        concurrency: Maximum number of GitHub requests in flight at once
+        crawl_state: Optional CrawlState holding the per-repository watermarks.
+            Watermarks only advance when every PR updated since the previous
+            watermark was processed, i.e. the listing was not cut by `max_prs`.
+        use_watermarks: If False, the stored watermarks are ignored (but still advanced).
+        ingestion: "rest" to fetch comments per PR through the REST API,
+            "discover" to do the same only for the PRs the bot commented on,
+            "graphql" to fetch pages of PRs with their comments in batched GraphQL queries, or
+            "bulk" to page through the repository-wide comment endpoints.
+        comment_index: Optional CommentIndex used to skip comments processed in
+            a previous run that have not changed since.
+        journal: Optional PoemJournal the poems are appended to as they are found.
+            PRs it marks as completed are skipped without fetching their comments.
+        llm_concurrency: Maximum number of LLM calls in flight per model
+        llm_batch_size: Maximum number of comments per LLM prompt
     """
-    poems = []
-    print(f"Collecting poems from {owner}/{repo} using model {model_name_to_use}...")
+    repo_key = f"{owner}/{repo}"
+    print(f"Collecting poems from {repo_key} using model {model_name_to_use}...")
     if ollama_only:
         print(f"Using Ollama-only mode (effective if '{model_name_to_use}' is an Ollama model and server is running)")
 
-    prs = get_pull_requests(owner, repo)[:max_prs]
-    print(f"Found {len(prs)} PRs in {owner}/{repo}")
+    watermark = crawl_state.get_watermark(repo_key) if crawl_state is not None and use_watermarks else {}
+    if watermark:
+        print(f"Incremental crawl of {repo_key} from watermark {watermark}")
 
-    run_stats["prs_checked"] += len(prs)
+    updated_after = watermark.get("pr_updated_at")
+    if ingestion == "graphql":
+        prs, listing_complete = list_pull_requests_with_comments(
+            github_client, owner, repo, updated_after=updated_after, max_prs=max_prs
+        )
+    elif ingestion == "bulk":
+        prs, listing_complete = fetch_gemini_comments_in_bulk(owner, repo, since=updated_after)
+    elif ingestion == "discover":
+        prs, listing_complete = discover_bot_pull_requests(owner, repo, updated_after=updated_after, max_prs=max_prs)
+    else:
+        prs, listing_complete = _list_pull_requests(owner, repo, updated_after=updated_after, max_prs=max_prs)
+    if len(prs) > max_prs:
+        listing_complete = False
+        prs = prs[:max_prs]
+    print(f"Found {len(prs)} PRs in {repo_key}")
+
+    with run_stats_lock:
+        run_stats["prs_checked"] += len(prs)
+
+    pr_numbers = [pr["number"] for pr in prs]
+    failed_prs = []
+    if ingestion == "graphql":
+        comments_by_number = {pr["number"]: select_gemini_comments_from_graphql(pr) for pr in prs}
+        # Connections cut at one GraphQL page are fetched again in full through REST
+        truncated = [pr["number"] for pr in prs if pr["truncated"]]
+        if truncated:
+            print(f"PRs {truncated} in {repo_key} have more comments or reviews than a GraphQL page; fetching them through REST")
+            comments_by_number.update(zip(truncated, fetch_gemini_comments(owner, repo, truncated, concurrency, failed_prs)))
+    elif ingestion == "bulk":
+        comments_by_number = {pr["number"]: pr["gemini_comments"] for pr in prs}
+    else:
+        pending = [n for n in pr_numbers if journal is None or not journal.is_pr_done(repo_key, n)]
+        comments_by_number = dict(zip(pending, fetch_gemini_comments(owner, repo, pending, concurrency, failed_prs)))
+    if failed_prs:
+        # Comment ids are shared across the repository, so the missing comments
+        # could sit below any comment id watermark: hold the whole watermark back
+        print(f"Comments of PRs {failed_prs} in {repo_key} could not all be fetched; they are retried in a later run")
+        listing_complete = False
+        pr_numbers = [n for n in pr_numbers if n not in failed_prs]
+    gemini_comments_by_pr = [comments_by_number.get(n, []) for n in pr_numbers]
+
+    journal_done = [n for n in pr_numbers if journal is not None and journal.is_pr_done(repo_key, n)]
+    if journal_done and crawl_state is not None:
+        # The comment index of the interrupted run was not saved, so nothing
+        # records which comments of these PRs the watermark would cover
+        print(f"PRs {journal_done} in {repo_key} were completed before the run was interrupted; the watermark is held back")
+        listing_complete = False
+
+    failed_comments = []
+    poems = _extract_poems(owner, repo, pr_numbers, gemini_comments_by_pr, model_name_to_use, ollama_only, watermark, comment_index, journal, llm_concurrency, llm_batch_size, failed_comments)
+
+    if crawl_state is not None:
+        if listing_complete:
+            _advance_watermark(crawl_state, repo_key, prs, gemini_comments_by_pr, failed_comments)
+        else:
+            print(f"Watermark for {repo_key} not advanced: not every updated PR was processed in this run"
+                  f" (if --max-prs={max_prs} cut the listing, rerun with a higher --max-prs)")
 
-    for pr in prs:
-        pr_number = pr["number"]
-        print(f"  Processing PR #{pr_number}...")
+    return poems
+
+def collect_poems_from_repos(repos, model_name_to_use, max_prs=100, repo_workers=1, **collect_kwargs):
+    """Collect poems from several repositories, crawling up to `repo_workers` of them in parallel.
+
+    Workers share the GitHub client (and with it the rate limiter and token
+    pool), the crawl state and run_stats.
+
+    Args:
+        repos: List of (owner, repo) tuples.
+        model_name_to_use: The specific model name to use for LLM processing.
+        max_prs: Maximum number of PRs to check per repository
+        repo_workers: Maximum number of repositories crawled at once
+        **collect_kwargs: Further arguments passed to collect_poems_from_repo.
+
+    Returns:
+        The poems of every repository, merged in the order of `repos` regardless
+        of which repository finished first.
+    """
+    def collect(owner_repo):
+        owner, repo = owner_repo
+        run_stats["repositories_checked"].add(f"{owner}/{repo}")
+        repo_poems = collect_poems_from_repo(owner, repo, model_name_to_use, max_prs, **collect_kwargs)
+        print(f"Collected {len(repo_poems)} poems from {owner}/{repo}")
+        return repo_poems
+
+    with ThreadPoolExecutor(max_workers=max(1, repo_workers)) as executor:
+        poems_by_repo = list(executor.map(collect, repos))
+
+    return [poem for repo_poems in poems_by_repo for poem in repo_poems]
 
-        comments = get_comments_for_pr(owner, repo, pr_number)
-        for comment in comments:
-            print(f"    Comment from user: {comment['user']['login']}")
-            if "gemini-code-assist" in comment["user"]["login"].lower():
-                if entry := _process_gemini_comment(comment, owner, repo, pr_number, model_name_to_use=model_name_to_use, ollama_only=ollama_only):
-                    poems.append(entry)
-
-        reviews = get_reviews_for_pr(owner, repo, pr_number) # Use the new get_reviews_for_pr
-        for review in reviews:
-            print(f"    Review from user: {review['user']['login']}")
-            if "gemini-code-assist" in review["user"]["login"].lower():
-                # Now fetch comments for this specific review
-                review_comments = get_comments_from_review(owner, repo, pr_number, review["id"])
-                for review_comment in review_comments:
-                    print(f"      Review comment from user: {review_comment['user']['login']}")
-                    if "gemini-code-assist" in review_comment["user"]["login"].lower():
-                        if entry := _process_gemini_comment(review_comment, owner, repo, pr_number, model_name_to_use=model_name_to_use, comment_type="review_comment", ollama_only=ollama_only):
-                            poems.append(entry)
-
-        time.sleep(0.5)
+def enqueue_repository(queue, owner, repo, max_prs=100, task_size=None, watermark=None):
+    """List the PRs of a repository and enqueue them as tasks of `task_size` PRs.
+
+    Args:
+        queue: The WorkQueue to add the tasks to.
+        owner: Repository owner
+        repo: Repository name
+        max_prs: Maximum number of PRs to enqueue
+        task_size: PRs per task. Defaults to Config.QUEUE_TASK_SIZE.
+        watermark: Optional repository watermark; only PRs updated after it are
+            listed and workers skip the comments it already covers.
+
+    Returns:
+        A (task_count, listing_complete) tuple.
+    """
+    watermark = watermark or {}
+    task_size = task_size or Config.QUEUE_TASK_SIZE
+    prs, listing_complete = _list_pull_requests(owner, repo, watermark.get("pr_updated_at"), max_prs)
+
+    task_count = 0
+    for start in range(0, len(prs), task_size):
+        task_prs = prs[start:start + task_size]
+        queue.enqueue(owner, repo, {
+            "pr_numbers": [pr["number"] for pr in task_prs],
+            "pr_updated_at": max(pr["updated_at"] for pr in task_prs),
+            "watermark": watermark,
+        })
+        task_count += 1
+    return task_count, listing_complete
+
+def process_queue(queue, worker_id, model_name_to_use, ollama_only=False, concurrency=Config.DEFAULT_CONCURRENCY, poll_interval=None, llm_concurrency=Config.LLM_CONCURRENCY, llm_batch_size=Config.LLM_BATCH_SIZE):
+    """Lease and process queued tasks until every task is done or failed.
+
+    Until the coordinator has enqueued every task, and while other workers
+    still hold leases, this keeps polling so it can take new tasks or take
+    over the tasks of a worker whose lease expired. The lease on the task
+    being processed is renewed by a heartbeat.
+
+    Args:
+        queue: The WorkQueue to take tasks from.
+        worker_id: Identifier of this worker.
+        model_name_to_use: The specific model name to use for LLM processing.
+        ollama_only: If True, only use Ollama models for LLM processing
+        concurrency: Maximum number of GitHub requests in flight at once
+        poll_interval: Seconds between checks for available tasks. Defaults to Config.QUEUE_POLL_SECONDS.
+        llm_concurrency: Maximum number of LLM calls in flight per model
+        llm_batch_size: Maximum number of comments per LLM prompt
+
+    Returns:
+        The number of tasks this worker completed.
+    """
+    processed = 0
+    while True:
+        task = queue.lease(worker_id)
+        if task is None:
+            if queue.is_enqueueing_done() and queue.is_finished():
+                return processed
+            time.sleep(poll_interval or Config.QUEUE_POLL_SECONDS)
+            continue
+
+        owner, repo, payload = task["owner"], task["repo"], task["payload"]
+        pr_numbers = payload["pr_numbers"]
+        print(f"Task {task['id']}: {owner}/{repo} PRs #{pr_numbers[0]}..#{pr_numbers[-1]} (attempt {task['attempts']})")
+        try:
+            with queue.heartbeat(task["id"], worker_id):
+                poems, highest_ids, complete = collect_poems_from_prs(owner, repo, pr_numbers, model_name_to_use, ollama_only=ollama_only, concurrency=concurrency, watermark=payload["watermark"], llm_concurrency=llm_concurrency, llm_batch_size=llm_batch_size)
+        except Exception as e:
+            error_handler.handle_api_error(e, f"processing task {task['id']} for {owner}/{repo}")
+            queue.fail(task["id"], worker_id, e)
+            continue
+
+        if queue.complete(task["id"], worker_id, {"poems": poems, "highest_ids": highest_ids, "complete": complete}):
+            processed += 1
+        else:
+            print(f"Lease on task {task['id']} was lost before it completed; its result was dropped")
+
+def coordinate_queue(queue, repos, model_name_to_use, max_prs, worker_id, task_size=None, crawl_state=None, use_watermarks=True, **process_kwargs):
+    """Split a crawl into queued tasks, work on them alongside the workers and merge the results.
+
+    Any tasks left in the queue from a previous crawl are removed first.
+
+    Args:
+        queue: The WorkQueue shared with the workers.
+        repos: List of (owner, repo) tuples.
+        model_name_to_use: The specific model name to use for LLM processing.
+        max_prs: Maximum number of PRs to check per repository
+        worker_id: Identifier of the coordinator when it processes tasks itself.
+        task_size: PRs per task. Defaults to Config.QUEUE_TASK_SIZE.
+        crawl_state: Optional CrawlState. A repository's watermark only advances
+            when its listing was complete and all of its tasks are done.
+        use_watermarks: If False, the stored watermarks are ignored (but still advanced).
+        **process_kwargs: Further arguments passed to process_queue.
+
+    Returns:
+        The poems of every task, in enqueue order.
+    """
+    queue.reset()
+    listing_complete = {}
+    for owner, repo in repos:
+        repo_key = f"{owner}/{repo}"
+        run_stats["repositories_checked"].add(repo_key)
+        watermark = crawl_state.get_watermark(repo_key) if crawl_state is not None and use_watermarks else {}
+        task_count, listing_complete[repo_key] = enqueue_repository(queue, owner, repo, max_prs, task_size, watermark)
+        print(f"Enqueued {task_count} tasks for {repo_key}")
+    queue.finish_enqueueing()
+
+    process_queue(queue, worker_id, model_name_to_use, **process_kwargs)
+    print(f"Queue finished: {queue.counts()}")
+
+    poems = []
+    watermarks = {}
+    for task in queue.tasks():
+        repo_key = f"{task['owner']}/{task['repo']}"
+        if task["status"] != "done":
+            print(f"Task {task['id']} for {repo_key} failed: {task['error']}")
+            listing_complete[repo_key] = False
+            continue
+        poems.extend(task["result"]["poems"])
+        if not task["result"].get("complete", True):
+            # The comments that failed are retried once the next run lists their PRs again
+            listing_complete[repo_key] = False
+        watermark = watermarks.setdefault(repo_key, {})
+        watermark["pr_updated_at"] = max(watermark.get("pr_updated_at", ""), task["payload"]["pr_updated_at"])
+        for field, comment_id in task["result"]["highest_ids"].items():
+            watermark[field] = max(watermark.get(field, 0), comment_id)
+
+    if crawl_state is not None:
+        for repo_key, watermark in watermarks.items():
+            if listing_complete[repo_key]:
+                crawl_state.advance_watermark(repo_key, **watermark)
+            else:
+                print(f"Watermark for {repo_key} not advanced: not every updated PR was processed in this run")
 
     return poems
 
@@ -452,6 +1248,36 @@ def is_duplicate(new_poem, existing_poems):
 
     return False
 
+def save_new_poems(new_poems, json_file):
+    """Merge newly collected poems into the JSON collection and regenerate the markdown file.
+
+    Duplicates of poems already in the collection and NO_POEM entries are left out.
+    """
+    existing_poems = load_existing_poems(json_file)
+    unique_new_poems = [poem for poem in new_poems if not is_duplicate(poem, existing_poems)]
+
+    run_stats["new_poems"] = len(unique_new_poems)
+    run_stats["total_poems"] = len(existing_poems) + len(unique_new_poems)
+
+    if not unique_new_poems:
+        print("No new poems found.")
+        return
+
+    all_poems = unique_new_poems + existing_poems
+
+    def is_no_poem_entry(poem):
+        poem_lines = poem.get("poem", [])
+        return (len(poem_lines) == 1 and
+                (poem_lines[0] == "\"NO_POEM\"" or "NO_POEM" in poem_lines[0]))
+
+    filtered_poems = [poem for poem in all_poems if not is_no_poem_entry(poem)]
+    save_poems_to_json(filtered_poems, json_file)
+    run_stats["total_poems"] = len(filtered_poems)
+
+    # Call cleanup_poems.main() to generate the markdown file
+    import cleanup_poems
+    cleanup_poems.main()
+
 def get_next_log_file():
     """Get the next available log file name."""
     return logger._get_log_file()
@@ -515,6 +1341,7 @@ def run_wizard(args):
     return args
 
 def main():
+    global model_router
     print("Script execution started.")
     print("Starting Gemini Code Assist poem collection script")
     parser = argparse.ArgumentParser(description="Collect Gemini Code Assist poems from GitHub repositories")
@@ -522,17 +1349,52 @@ def main():
     parser.add_argument("--repo", help="GitHub repository name", default=Config.DEFAULT_REPO_NAME)
     parser.add_argument("--search", help="Search for public repositories with Gemini poems", action="store_true")
     parser.add_argument("--max-repos", help="Maximum number of repositories to search", type=int, default=5)
-    parser.add_argument("--max-prs", help="Maximum number of PRs to check per repository", type=int, default=100)
+    parser.add_argument("--max-prs", help="Maximum number of PRs to check per repository. A repository's watermark is only recorded once a run lists all of its updated PRs, so the first run of a large repository needs a value above its PR count", type=int, default=100)
     parser.add_argument("--output", help="Output JSON file", default=Config.GEM_FLOWERS_FILE)
     parser.add_argument("--ollama", help="Use only local Ollama models for LLM processing (Note: --model takes precedence)", action="store_true")
     parser.add_argument("--wizard", "-w", help="Run in wizard mode to interactively set parameters", action="store_true")
     parser.add_argument("--model", help="Specify the LLM model to use (e.g., 'gemini/gemini-1.5-flash', 'ollama/llama2'). Overrides default and Ollama-only mode for model selection.", default=None)
+    parser.add_argument("--concurrency", help="Maximum number of concurrent GitHub requests per repository", type=int, default=Config.DEFAULT_CONCURRENCY)
+    parser.add_argument("--llm-concurrency", help="Maximum number of concurrent LLM calls per model, shared by every repository crawled in parallel", type=int, default=Config.LLM_CONCURRENCY)
+    parser.add_argument("--llm-batch-size", help="Maximum number of comments packed into one LLM prompt (1 disables batching)", type=int, default=Config.LLM_BATCH_SIZE)
+    parser.add_argument("--poem-threshold", help="Minimum poem likelihood score (0-1) of the comments sent to the LLM; 0 sends every comment", type=float, default=Config.POEM_SCORE_THRESHOLD)
+    parser.add_argument("--route-models", help="Spread LLM calls over the model and every model in llm_client/custom_llm_model.json, preferring fast healthy ones", action="store_true")
+    parser.add_argument("--repo-workers", help="Number of repositories crawled in parallel in --search mode", type=int, default=1)
+    parser.add_argument("--no-cache", help="Disable the on-disk ETag cache for GitHub API responses", action="store_true")
+    parser.add_argument("--cache-dir", help="Directory for the GitHub API response cache", default=Config.HTTP_CACHE_DIR)
+    parser.add_argument("--clear-cache", help="Empty the GitHub API and LLM response caches before collecting", action="store_true")
+    parser.add_argument("--no-llm-cache", help="Disable the on-disk cache of LLM completions", action="store_true")
+    parser.add_argument("--llm-cache-dir", help="Directory for the LLM completion cache", default=Config.LLM_CACHE_DIR)
+    parser.add_argument("--state-file", help="JSON file holding the per-repository crawl watermarks", default=Config.CRAWL_STATE_FILE)
+    parser.add_argument("--full-crawl", help="Ignore the stored watermarks and check every PR again", action="store_true")
+    parser.add_argument("--index-file", help="JSON file recording the comments already processed", default=Config.COMMENT_INDEX_FILE)
+    parser.add_argument("--reprocess", help="Process every comment again, even those recorded in the comment index", action="store_true")
+    parser.add_argument("--journal-file", help="JSON Lines journal the poems are written to as they are found", default=Config.POEM_JOURNAL_FILE)
+    parser.add_argument("--resume", help="Resume an interrupted run from its journal, skipping the PRs it already completed", action="store_true")
+    ingestion_group = parser.add_mutually_exclusive_group()
+    ingestion_group.add_argument("--graphql", help="Fetch PRs with their comments and reviews through batched GraphQL queries instead of per-PR REST calls", action="store_true")
+    ingestion_group.add_argument("--bulk-comments", help="Page through the repository-wide comment endpoints instead of fetching comments PR by PR", action="store_true")
+    ingestion_group.add_argument("--discover", help="Use the search API to find the PRs Gemini Code Assist commented on and only fetch comments for those", action="store_true")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="DIR", help="Record every GitHub and LLM response into a cassette directory")
+    cassette_group.add_argument("--replay", metavar="DIR", help="Serve GitHub and LLM responses from a recorded cassette directory, without network access")
+    queue_group = parser.add_argument_group("work queue", "Split the crawl over several processes sharing a SQLite queue (REST ingestion only)")
+    queue_group.add_argument("--queue", metavar="DB", help="SQLite database holding the shared task queue")
+    queue_group.add_argument("--queue-role", choices=["coordinator", "worker"], default="coordinator", help="The coordinator enqueues the PRs, works on tasks too and saves the merged poems; workers only process tasks")
+    queue_group.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}", help="Identifier of this process in the queue")
+    queue_group.add_argument("--task-size", type=int, default=Config.QUEUE_TASK_SIZE, help="PRs per queued task")
     args = parser.parse_args()
 
+    if args.queue and (args.graphql or args.bulk_comments or args.discover):
+        parser.error("--queue only supports the default REST ingestion")
+    if args.queue and args.resume:
+        parser.error("--resume does not apply to --queue, whose tasks are kept in the queue database")
+
     if args.wizard:
         args = run_wizard(args)
 
     model_name_to_use = args.model or Config.DEFAULT_MODEL
+    poem_scorer.threshold = args.poem_threshold
 
     effective_ollama_only = args.ollama
     if args.model:
@@ -540,59 +1402,129 @@ def main():
     elif args.ollama and not model_name_to_use.startswith("ollama/"):
         print(f"Warning: --ollama flag is set, but the effective default model '{model_name_to_use}' is not an Ollama model. Poems will be extracted using '{model_name_to_use}'. Consider using --model to specify an Ollama model if that's the intent.")
 
-    print(f"Configuration: owner={args.owner}, repo={args.repo}, search={args.search}, max_repos={args.max_repos}, max_prs={args.max_prs}, ollama_flag={args.ollama}, model_to_use='{model_name_to_use}'")
+    if args.route_models:
+        # --model comes first, but the default model stays in the pool; duplicates keep their first place
+        routed_models = list(dict.fromkeys(([args.model] if args.model else []) + [Config.DEFAULT_MODEL] + load_custom_llm_models()))
+        if effective_ollama_only:
+            routed_models = [model for model in routed_models if model.startswith("ollama/")]
+        model_router = ModelRouter(routed_models)
+        print(f"Routing LLM calls over: {', '.join(model_router.models)}")
+
+    print(f"Configuration: owner={args.owner}, repo={args.repo}, search={args.search}, max_repos={args.max_repos}, max_prs={args.max_prs}, concurrency={args.concurrency}, llm_concurrency={args.llm_concurrency}, repo_workers={args.repo_workers}, ollama_flag={args.ollama}, model_to_use='{model_name_to_use}'")
     print(f"GitHub token available: {bool(Config.GITHUB_TOKEN)}")
+    print(f"GitHub tokens in pool: {len(github_tokens)}")
+
+    max_connections = args.concurrency * (args.repo_workers if args.search else 1)
+    if max_connections > github_client.pool_size:
+        github_client.set_pool_size(max_connections)
+
+    cassette = None
+    if args.record or args.replay:
+        cassette = Cassette(args.record or args.replay, RECORD if args.record else REPLAY)
+        github_client.cassette = cassette
+        LiteLLMClient.cassette = cassette
+        print(f"Cassette {cassette.mode} mode: {cassette.directory}")
+
+    # Conditional requests would record 304s that cannot be replayed on their own
+    if not args.no_cache and cassette is None:
+        github_client.cache = ResponseCache(args.cache_dir, Config.HTTP_CACHE_MAX_BYTES)
+        if args.clear_cache:
+            print(f"Clearing GitHub API response cache in {args.cache_dir}")
+            github_client.cache.clear()
+
+    # A completion served from the cache would be missing from a recorded cassette
+    if not args.no_llm_cache and cassette is None:
+        LiteLLMClient.response_cache = ResponseCache(args.llm_cache_dir, Config.LLM_CACHE_MAX_BYTES)
+        if args.clear_cache:
+            print(f"Clearing LLM response cache in {args.llm_cache_dir}")
+            LiteLLMClient.response_cache.clear()
+
+    crawl_state = CrawlState(args.state_file)
+    comment_index = None if args.reprocess else CommentIndex(args.index_file)
+    if args.graphql:
+        ingestion = "graphql"
+    elif args.bulk_comments:
+        ingestion = "bulk"
+    elif args.discover:
+        ingestion = "discover"
+    else:
+        ingestion = "rest"
 
     json_file = args.output
     new_poems = []
 
-    try:
-        if args.search:
-            print("Searching for public repositories with Gemini Code Assist comments...")
-            repos = search_public_repos(max_repos=args.max_repos)
-            print(f"Found {len(repos)} repositories to check")
-
-            for owner, repo in repos:
-                run_stats["repositories_checked"].add(f"{owner}/{repo}")
-                repo_poems = collect_poems_from_repo(owner, repo, model_name_to_use, args.max_prs, ollama_only=effective_ollama_only)
-                new_poems.extend(repo_poems)
-                print(f"Collected {len(repo_poems)} poems from {owner}/{repo}")
-        else:
-            print(f"Checking specified repository: {args.owner}/{args.repo}")
-            run_stats["repositories_checked"].add(f"{args.owner}/{args.repo}")
-            repo_poems = collect_poems_from_repo(args.owner, args.repo, model_name_to_use, args.max_prs, ollama_only=effective_ollama_only)
-            new_poems.extend(repo_poems)
-            print(f"Collected {len(repo_poems)} poems from {args.owner}/{args.repo}")
-
-        existing_poems = load_existing_poems(json_file)
-        unique_new_poems = [poem for poem in new_poems if not is_duplicate(poem, existing_poems)]
+    # Queued crawls keep their results in the queue database instead
+    journal = None if args.queue else PoemJournal(args.journal_file)
+    if journal is not None and args.resume:
+        new_poems.extend(journal.replay())
+        print(f"Resuming from {args.journal_file}: {len(journal.completed_prs)} PRs already completed, {len(new_poems)} poems recovered")
+    elif journal is not None and journal.exists():
+        print(f"Discarding the journal of an interrupted run in {args.journal_file} (use --resume to continue it)")
+        journal.clear()
 
-        run_stats["new_poems"] = len(unique_new_poems)
-        run_stats["total_poems"] = len(existing_poems) + len(unique_new_poems)
-
-        if not unique_new_poems:
-            print("No new poems found.")
+    try:
+        if args.queue and args.queue_role == "worker":
+            queue = WorkQueue(args.queue)
+            print(f"Worker {args.worker_id} processing tasks from {args.queue}")
+            processed = process_queue(queue, args.worker_id, model_name_to_use, ollama_only=effective_ollama_only, concurrency=args.concurrency, llm_concurrency=args.llm_concurrency, llm_batch_size=args.llm_batch_size)
+            print(f"Worker {args.worker_id} processed {processed} tasks")
         else:
-            all_poems = unique_new_poems + existing_poems
-
-            def is_no_poem_entry(poem):
-                poem_lines = poem.get("poem", [])
-                return (len(poem_lines) == 1 and
-                        (poem_lines[0] == "\"NO_POEM\"" or "NO_POEM" in poem_lines[0]))
+            if args.search:
+                print("Searching for public repositories with Gemini Code Assist comments...")
+                repos = search_public_repos(max_repos=args.max_repos)
+                print(f"Found {len(repos)} repositories to check")
+            else:
+                print(f"Checking specified repository: {args.owner}/{args.repo}")
+                repos = [(args.owner, args.repo)]
+
+            if args.queue:
+                queue = WorkQueue(args.queue)
+                new_poems.extend(coordinate_queue(queue, repos, model_name_to_use, args.max_prs, args.worker_id, task_size=args.task_size, crawl_state=crawl_state, use_watermarks=not args.full_crawl, ollama_only=effective_ollama_only, concurrency=args.concurrency, llm_concurrency=args.llm_concurrency, llm_batch_size=args.llm_batch_size))
+            elif args.search:
+                new_poems.extend(collect_poems_from_repos(repos, model_name_to_use, args.max_prs, repo_workers=args.repo_workers, ollama_only=effective_ollama_only, concurrency=args.concurrency, crawl_state=crawl_state, use_watermarks=not args.full_crawl, ingestion=ingestion, comment_index=comment_index, journal=journal, llm_concurrency=args.llm_concurrency, llm_batch_size=args.llm_batch_size))
+            else:
+                run_stats["repositories_checked"].add(f"{args.owner}/{args.repo}")
+                repo_poems = collect_poems_from_repo(args.owner, args.repo, model_name_to_use, args.max_prs, ollama_only=effective_ollama_only, concurrency=args.concurrency, crawl_state=crawl_state, use_watermarks=not args.full_crawl, ingestion=ingestion, comment_index=comment_index, journal=journal, llm_concurrency=args.llm_concurrency, llm_batch_size=args.llm_batch_size)
+                new_poems.extend(repo_poems)
+                print(f"Collected {len(repo_poems)} poems from {args.owner}/{args.repo}")
 
-            filtered_poems = [poem for poem in all_poems if not is_no_poem_entry(poem)]
-            save_poems_to_json(filtered_poems, json_file)
-            run_stats["total_poems"] = len(filtered_poems)
+            save_new_poems(new_poems, json_file)
 
-            # Call cleanup_poems.main() to generate the markdown file
-            import cleanup_poems
-            cleanup_poems.main()
+            # Only persist watermarks and processed comments once the poems they cover have been saved
+            crawl_state.save()
+            if comment_index is not None:
+                comment_index.save()
+            if journal is not None:
+                journal.clear()
 
     except Exception as e:
         error_msg = f"Error during execution: {str(e)}"
         print(error_msg)
         run_stats["errors"].append(error_msg)
 
+    if github_client.cache is not None:
+        print(f"GitHub API responses served from cache: {github_client.cache_hits}")
+
+    run_stats["llm_gate_passed"] = poem_scorer.passed
+    run_stats["llm_gate_skipped"] = poem_scorer.skipped
+    if poem_scorer.threshold > 0:
+        print(f"Comments sent to the LLM by the poem gate: {poem_scorer.passed}, skipped: {poem_scorer.skipped}")
+
+    if model_router is not None:
+        for model, health in model_router.snapshot().items():
+            latency = "n/a" if health["mean_latency"] is None else f"{health['mean_latency']:.2f}s"
+            print(f"Model {model}: circuit {health['state']}, {health['calls']} recent calls, "
+                  f"error rate {health['error_rate']:.0%}, mean latency {latency}")
+
+    if LiteLLMClient.response_cache is not None:
+        run_stats["llm_cache_hits"] = LiteLLMClient.cache_hits
+        run_stats["llm_cache_misses"] = LiteLLMClient.cache_misses
+        print(f"LLM completions served from cache: {LiteLLMClient.cache_hits}, requested: {LiteLLMClient.cache_misses}")
+
+    if cassette is not None:
+        cassette.save()
+        print(f"Cassette responses recorded: {cassette.recorded}, replayed: {cassette.replayed}, missing: {cassette.misses}")
+
     write_log_summary()
 
 if __name__ == "__main__":
@@ -6,6 +6,19 @@ This package provides tools for collecting poems from Gemini Code Assist comment
 from .config import Config
 from .error_handler import ErrorHandler
 from .logger import PoemLogger
+from .github_client import GitHubClient
+from .rate_limiter import RateLimiter
+from .token_pool import TokenPool
+from .response_cache import ResponseCache
+from .crawl_state import CrawlState
+from .comment_index import CommentIndex
+from .poem_journal import PoemJournal
+from .batch_extraction import BatchExtractor
+from .poem_scorer import PoemScorer
+from .model_router import ModelRouter
+from .loop_thread import LoopThread
+from .cassette import Cassette
+from .work_queue import WorkQueue
 from .llm_client_template import (
     BaseLLMClient,
     LiteLLMClient,
@@ -15,6 +28,19 @@ __all__ = [
     'Config',
     'ErrorHandler',
     'PoemLogger',
+    'GitHubClient',
+    'RateLimiter',
+    'TokenPool',
+    'ResponseCache',
+    'CrawlState',
+    'CommentIndex',
+    'PoemJournal',
+    'BatchExtractor',
+    'PoemScorer',
+    'ModelRouter',
+    'LoopThread',
+    'Cassette',
+    'WorkQueue',
     'BaseLLMClient',
     'LiteLLMClient',
 ]
@@ -0,0 +1,213 @@
+"""
+Batch extraction module for the Gemini Code Assist PR Poetry collection script.
+This packs several comments into one LLM prompt and splits the JSON answer back per comment.
+"""
+
+import re
+import json
+import asyncio
+import logging
+from src.config import Config
+from src.error_handler import ErrorHandler
+
+logger = logging.getLogger("gemini-poetry")
+
+NO_POEM = "NO_POEM"
+
+def build_batch_prompt(comment_bodies):
+    """Build the prompt extracting the poems of several comments.
+
+    Args:
+        comment_bodies: Dictionary mapping each comment id to its body.
+
+    Returns:
+        The prompt text.
+    """
+    comments = "\n\n".join(f"### COMMENT {comment_id}\n{body}" for comment_id, body in comment_bodies.items())
+    return Config.BATCH_POEM_EXTRACTION_PROMPT.format(comments=comments)
+
+def parse_batch_response(text, comment_ids):
+    """Split the JSON answer to a batch prompt into per-comment results.
+
+    The answer may be wrapped in a Markdown code fence. Values that are neither
+    a list of strings nor "NO_POEM" are left out, like ids missing from the answer.
+
+    Args:
+        text: The raw answer of the model.
+        comment_ids: The ids of the comments in the batch.
+
+    Returns:
+        A dictionary mapping comment ids to poem text, with one poem line per
+        line, or "NO_POEM".
+
+    Raises:
+        ValueError: If the answer is not a JSON object.
+    """
+    if not text:
+        raise ValueError("empty answer")
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    try:
+        answer = json.loads(fenced.group(1) if fenced else text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"answer is not valid JSON: {e}") from e
+    if not isinstance(answer, dict):
+        raise ValueError("answer is not a JSON object")
+
+    results = {}
+    for comment_id in comment_ids:
+        value = answer.get(comment_id)
+        if value == NO_POEM or value == []:
+            results[comment_id] = NO_POEM
+        elif isinstance(value, list) and all(isinstance(line, str) for line in value):
+            results[comment_id] = "\n".join(value)
+    return results
+
+class BatchExtractor:
+    """Collects the comments extracted with one model and sends them in batched prompts.
+
+    Callers await `extract` once per comment. Comments are sent together once
+    `batch_size` of them are waiting, or after `wait_seconds` for a partly
+    filled batch. Comments the batch answer does not cover, and every comment
+    of a batch that failed, are extracted again one prompt at a time, except
+    when the model is rate limited: the error is then raised to every comment
+    of the batch instead of multiplying the calls to a throttled model.
+    """
+
+    def __init__(self, client, semaphore, batch_size, wait_seconds=None, ready=None, error_handler=None):
+        """Initialize the extractor.
+
+        Args:
+            client: The LiteLLMClient of the model.
+            semaphore: Semaphore bounding the LLM calls in flight for the model.
+            batch_size: Maximum number of comments per prompt.
+            wait_seconds: How long a partly filled batch waits for more comments.
+            ready: Optional coroutine function awaited with the model name once
+                the semaphore is held, e.g. to wait out a rate limit cooldown.
+            error_handler: Optional ErrorHandler recording the cooldown of a
+                rate-limited batch before its comments get the error.
+        """
+        self.client = client
+        self.semaphore = semaphore
+        self.batch_size = batch_size
+        self.wait_seconds = Config.LLM_BATCH_WAIT_SECONDS if wait_seconds is None else wait_seconds
+        self.ready = ready
+        self.error_handler = error_handler
+        self.batches = 0
+        self.fallbacks = 0
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    async def extract(self, comment_body):
+        """Extract the poem of a comment.
+
+        Returns:
+            The poem text or "NO_POEM". Errors of the per-comment fallback are raised.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((comment_body, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = self._spawn(self._flush_later())
+        return await future
+
+    def _spawn(self, coroutine):
+        """Run a coroutine in a task kept alive until it finishes."""
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _ready(self):
+        """Wait until the model can be called, if a `ready` check was given."""
+        if self.ready is not None:
+            await self.ready(self.client.model_name)
+
+    async def _flush_later(self):
+        """Send a partly filled batch once no more comments arrived in time."""
+        await asyncio.sleep(self.wait_seconds)
+        self._timer = None
+        self._flush()
+
+    def _flush(self):
+        """Send the waiting comments as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._spawn(self._run_batch(batch))
+
+    async def _run_batch(self, batch):
+        """Extract a batch, falling back to one prompt per comment where it fails for another reason than a rate limit."""
+        if len(batch) == 1:
+            await self._extract_one(*batch[0])
+            return
+
+        comment_ids = [f"c{index}" for index in range(1, len(batch) + 1)]
+        results = {}
+        try:
+            async with self.semaphore:
+                await self._ready()
+                text = await self.client.acomplete(build_batch_prompt(dict(zip(comment_ids, (body for body, _ in batch)))))
+            self.batches += 1
+            results = parse_batch_response(text, comment_ids)
+        except Exception as e:
+            if ErrorHandler.is_rate_limit_error(e):
+                logger.warning(f"Batch of {len(batch)} comments rate limited by {self.client.model_name}: {e}")
+                if self.error_handler is not None:
+                    self.error_handler.handle_litellm_error(e, self.client.model_name)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            logger.warning(f"Batch of {len(batch)} comments failed with {self.client.model_name}: {e}; extracting them one by one")
+
+        fallbacks = []
+        for comment_id, (body, future) in zip(comment_ids, batch):
+            if comment_id in results:
+                if not future.done():
+                    future.set_result(results[comment_id])
+            else:
+                fallbacks.append(self._extract_one(body, future))
+        self.fallbacks += len(fallbacks)
+        await asyncio.gather(*fallbacks)
+
+    async def _extract_one(self, comment_body, future):
+        """Extract a single comment with its own prompt."""
+        try:
+            async with self.semaphore:
+                await self._ready()
+                poem_text = await self.client.aextract_poem(Config.POEM_EXTRACTION_PROMPT.format(comment_body=comment_body))
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(poem_text)
+
+class BatchExtractors(dict):
+    """The BatchExtractor of each model, created on first use."""
+
+    def __init__(self, client_factory, semaphores, batch_size, ready=None, error_handler=None):
+        """Initialize the extractors.
+
+        Args:
+            client_factory: Function returning the client of a model name.
+            semaphores: Mapping from model name to the semaphore bounding its LLM calls.
+            batch_size: Maximum number of comments per prompt.
+            ready: Optional coroutine function passed to every BatchExtractor.
+            error_handler: Optional ErrorHandler passed to every BatchExtractor.
+        """
+        super().__init__()
+        self.client_factory = client_factory
+        self.semaphores = semaphores
+        self.batch_size = batch_size
+        self.ready = ready
+        self.error_handler = error_handler
+
+    def __missing__(self, model_name):
+        extractor = BatchExtractor(self.client_factory(model_name), self.semaphores[model_name], self.batch_size, ready=self.ready, error_handler=self.error_handler)
+        self[model_name] = extractor
+        return extractor
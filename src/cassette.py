@@ -0,0 +1,168 @@
+"""
+Cassette module for the Gemini Code Assist PR Poetry collection script.
+This records GitHub and LLM responses to disk and replays them without network access.
+"""
+
+import os
+import json
+import gzip
+import hashlib
+import logging
+import tempfile
+import threading
+from datetime import datetime
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger("gemini-poetry")
+
+RECORD = "record"
+REPLAY = "replay"
+
+INDEX_FILE = "index.json"
+
+# Transport headers that no longer describe a recorded body once it is decoded
+SKIPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+class CassetteMissError(requests.ConnectionError):
+    """Raised in replay mode for a request that was never recorded.
+
+    It is a `requests.ConnectionError`, so callers handle it like a request
+    that could not reach the network.
+    """
+
+class Cassette:
+    """Compressed, indexed archive of recorded responses.
+
+    Every response is stored as a gzip-compressed JSON file named after the
+    SHA-256 of its request key, and `index.json` maps each key to its file. In
+    record mode responses are added as they arrive; in replay mode they are
+    served back and requests that were not recorded raise CassetteMissError.
+    """
+
+    def __init__(self, directory, mode):
+        """Initialize the cassette.
+
+        Args:
+            directory: Directory holding the archive. Created in record mode.
+            mode: RECORD to capture responses or REPLAY to serve them back.
+
+        Raises:
+            ValueError: If the mode is unknown or there is nothing to replay.
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(directory, INDEX_FILE)
+
+        if mode == RECORD:
+            os.makedirs(directory, exist_ok=True)
+        elif not os.path.exists(self._index_path):
+            raise ValueError(f"No cassette to replay in {directory}")
+        self.index = self._load_index()
+
+    @property
+    def recording(self):
+        """Whether responses are being recorded."""
+        return self.mode == RECORD
+
+    @property
+    def replaying(self):
+        """Whether responses are served from the archive."""
+        return self.mode == REPLAY
+
+    def _load_index(self):
+        """Load the index, starting empty if there is none yet."""
+        if not os.path.exists(self._index_path):
+            return {}
+        with open(self._index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)["entries"]
+
+    @staticmethod
+    def http_key(method, url, params=None, json_body=None):
+        """Build the key of an HTTP request from its method, full URL and JSON body."""
+        full_url = requests.Request(method, url, params=params).prepare().url
+        key = f"{method} {full_url}"
+        if json_body is not None:
+            body = json.dumps(json_body, sort_keys=True)
+            key += f" {hashlib.sha256(body.encode('utf-8')).hexdigest()}"
+        return key
+
+    @staticmethod
+    def llm_key(model_name, messages, params):
+        """Build the key of an LLM completion from its model, messages and sampling parameters."""
+        request = json.dumps({"messages": messages, "params": params}, sort_keys=True)
+        return f"LLM {model_name} {hashlib.sha256(request.encode('utf-8')).hexdigest()}"
+
+    def record(self, key, entry):
+        """Store the entry recorded for a key.
+
+        Args:
+            key: The request key.
+            entry: A JSON-serializable value.
+        """
+        filename = f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json.gz"
+        data = gzip.compress(json.dumps(entry).encode("utf-8"))
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(self.directory, filename))
+            self.index[key] = {"file": filename, "recorded_at": datetime.now().isoformat()}
+            self.recorded += 1
+
+    def replay(self, key):
+        """Get the entry recorded for a key.
+
+        Raises:
+            CassetteMissError: If the key was not recorded.
+        """
+        with self._lock:
+            item = self.index.get(key)
+            if item is None:
+                self.misses += 1
+                raise CassetteMissError(f"No recorded response for {key}")
+            self.replayed += 1
+        with gzip.open(os.path.join(self.directory, item["file"]), 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def record_response(self, key, response):
+        """Record an HTTP response."""
+        self.record(key, {
+            "status_code": response.status_code,
+            "url": response.url,
+            "headers": {name: value for name, value in response.headers.items() if name.lower() not in SKIPPED_HEADERS},
+            "body": response.text,
+        })
+
+    def replay_response(self, key):
+        """Rebuild the HTTP response recorded for a key.
+
+        Raises:
+            CassetteMissError: If the key was not recorded.
+        """
+        entry = self.replay(key)
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.reason = ""
+        response.url = entry["url"]
+        response.encoding = "utf-8"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"].encode("utf-8")
+        return response
+
+    def save(self):
+        """Write the index in record mode."""
+        if not self.recording:
+            return
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"entries": self.index}, f, indent=2)
+            os.replace(tmp_path, self._index_path)
+        logger.info(f"Saved {len(self.index)} recorded responses to {self.directory}")
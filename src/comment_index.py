@@ -0,0 +1,106 @@
+"""
+Comment index module for the Gemini Code Assist PR Poetry collection script.
+This remembers which comments were already processed so reruns skip them.
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+
+logger = logging.getLogger("gemini-poetry")
+
+# Extraction outcomes recorded per comment
+POEM = "poem"
+NO_POEM = "no_poem"
+ERROR = "error"
+
+class CommentIndex:
+    """Index of processed comments stored in a JSON file.
+
+    Every processed comment is recorded with its `updated_at` and the outcome
+    of the extraction. A comment whose `updated_at` is unchanged and whose
+    extraction succeeded (poem or no poem) does not need to be processed
+    again; comments that failed with an error are retried.
+    """
+
+    def __init__(self, index_file):
+        """Initialize the index from an index file.
+
+        Args:
+            index_file: Path of the JSON index file. It does not need to exist yet.
+        """
+        self.index_file = index_file
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.comments = self._load()
+
+    def _load(self):
+        """Load the index file, starting empty if it is missing or invalid."""
+        if not os.path.exists(self.index_file):
+            return {}
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("comments", {})
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable comment index {self.index_file}: {e}")
+            return {}
+
+    @staticmethod
+    def _key(comment_type, comment):
+        """Get the index key of a comment; issue and review comment ids are separate sequences."""
+        return f"{comment_type}:{comment['id']}"
+
+    def is_processed(self, comment_type, comment):
+        """Check whether a comment was processed successfully and has not changed since.
+
+        Args:
+            comment_type: "comment" or "review_comment".
+            comment: The comment in the REST API shape.
+        """
+        with self._lock:
+            entry = self.comments.get(self._key(comment_type, comment))
+        return (entry is not None
+                and entry["outcome"] != ERROR
+                and entry["updated_at"] == comment.get("updated_at"))
+
+    def needs_retry(self, comment_type, comment):
+        """Check whether a comment was processed before but failed or has been edited since.
+
+        Such comments are processed again even when a watermark already covers them.
+
+        Args:
+            comment_type: "comment" or "review_comment".
+            comment: The comment in the REST API shape.
+        """
+        with self._lock:
+            known = self._key(comment_type, comment) in self.comments
+        return known and not self.is_processed(comment_type, comment)
+
+    def record(self, comment_type, comment, outcome):
+        """Record the outcome of processing a comment.
+
+        Args:
+            comment_type: "comment" or "review_comment".
+            comment: The comment in the REST API shape.
+            outcome: POEM, NO_POEM or ERROR.
+        """
+        with self._lock:
+            self.comments[self._key(comment_type, comment)] = {
+                "updated_at": comment.get("updated_at"),
+                "outcome": outcome,
+            }
+            self._dirty = True
+
+    def save(self):
+        """Write the index file if any comment was recorded."""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(os.path.abspath(self.index_file))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"comments": self.comments}, f)
+            os.replace(tmp_path, self.index_file)
+            self._dirty = False
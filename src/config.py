@@ -14,12 +14,64 @@ class Config:
 
     # GitHub API configuration
     GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-    GITHUB_API_URL = "https://api.github.com"
+    GITHUB_TOKENS = os.getenv("GITHUB_TOKENS", "")  # Optional comma-separated token pool
+    GITHUB_TOKEN_FILE = os.getenv("GITHUB_TOKEN_FILE")  # Optional file with one token per line
+    GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")  # Overridable, e.g. for utils/fake_github_server.py
     SEARCH_REPOS_URL = f"{GITHUB_API_URL}/search/repositories"
+    SEARCH_ISSUES_URL = f"{GITHUB_API_URL}/search/issues"
     PR_LIST_URL = f"{GITHUB_API_URL}/repos/{{owner}}/{{repo}}/pulls"
     PR_COMMENTS_URL = f"{GITHUB_API_URL}/repos/{{owner}}/{{repo}}/issues/{{pr_number}}/comments"
     PR_REVIEWS_URL = f"{GITHUB_API_URL}/repos/{{owner}}/{{repo}}/pulls/{{pr_number}}/reviews"
     PR_REVIEW_COMMENTS_URL = f"{GITHUB_API_URL}/repos/{{owner}}/{{repo}}/pulls/{{pr_number}}/comments"
+    REPO_ISSUE_COMMENTS_URL = f"{GITHUB_API_URL}/repos/{{owner}}/{{repo}}/issues/comments"
+    REPO_REVIEW_COMMENTS_URL = f"{GITHUB_API_URL}/repos/{{owner}}/{{repo}}/pulls/comments"
+    GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+    # Largest page size GitHub's REST list endpoints accept (the default is 30)
+    GITHUB_PAGE_SIZE = 100
+    GRAPHQL_PR_PAGE_SIZE = 25  # PRs per GraphQL query, each with up to 100 comments and 50 reviews
+
+    # Maximum number of GitHub requests in flight at once while fetching PR comments
+    DEFAULT_CONCURRENCY = 8
+
+    # GitHub HTTP session configuration
+    GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "16"))  # Pooled connections kept alive per host
+    GITHUB_REQUEST_TIMEOUT = float(os.getenv("GITHUB_REQUEST_TIMEOUT", "30"))  # Seconds before a request is abandoned
+
+    # GitHub rate-limit scheduling
+    # Request rate ceilings per rate-limit resource, kept below GitHub's secondary limits
+    GITHUB_MAX_REQUESTS_PER_SECOND = {"core": 10.0, "search": 0.5, "graphql": 2.0}
+    GITHUB_RATE_LIMIT_RESERVE = 10  # Remaining quota at which requests wait for the reset
+    GITHUB_MAX_RETRIES = 3  # Retries for responses rejected by a rate limit
+
+    # Shared work queue for crawls split over several worker processes
+    QUEUE_TASK_SIZE = 25  # PRs per queued task
+    QUEUE_LEASE_SECONDS = 900  # A task leased by a worker that stops responding is re-queued after this
+    QUEUE_MAX_ATTEMPTS = 3  # Leases per task before it is marked failed
+    QUEUE_POLL_SECONDS = 5  # Wait between checks while other workers hold the remaining tasks
+
+    # Conditional-request (ETag) cache for GitHub API responses
+    HTTP_CACHE_DIR = os.path.join(".cache", "github")
+    HTTP_CACHE_MAX_BYTES = 100 * 1024 * 1024  # 100MB - Least recently used entries are evicted beyond this
+
+    # Cache of LLM completions, keyed by model, prompt and sampling parameters
+    LLM_CACHE_DIR = os.path.join(".cache", "llm")
+    LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024  # 50MB - Least recently used entries are evicted beyond this
+    LLM_CONCURRENCY = 4  # LLM calls in flight per model during extraction
+    LLM_BATCH_SIZE = 1  # Comments per batched extraction prompt; 1 sends one prompt per comment
+    LLM_BATCH_WAIT_SECONDS = 0.05  # How long a partly filled batch waits for more comments
+
+    # Local poem likelihood gate in front of the LLM
+    POEM_SCORE_THRESHOLD = 0.3  # Comments scoring below this are not sent to the LLM; 0 sends every comment
+    POEM_MIN_LINE_LENGTH = 8  # Shortest line counted as a line of verse
+    POEM_MAX_LINE_LENGTH = 70  # Longest line counted as a line of verse
+
+    # Routing of LLM calls over several models (--route-models)
+    ROUTER_WINDOW = 20  # Latest calls per model the latency and error rate are computed over
+    ROUTER_FAILURE_THRESHOLD = 0.5  # Error rate that opens a model's circuit breaker
+    ROUTER_MIN_CALLS = 4  # Calls in the window before the error rate can open the circuit
+    ROUTER_COOLDOWN_SECONDS = 60  # Time an open circuit keeps a model out of rotation
+    ROUTER_MAX_ATTEMPTS = 3  # Models tried for one comment before it is recorded as an error
+    LLM_RATE_LIMIT_RETRIES = 3  # Times a rate-limited comment is deferred and retried on the same model
 
     # Default repository information
     DEFAULT_REPO_OWNER = "TheRealFREDP3D"
@@ -27,12 +79,19 @@ class Config:
 
     # Output files and directories
     GEM_FLOWERS_FILE = "gem-flowers.json"  # Main JSON output file
+    CRAWL_STATE_FILE = "crawl-state.json"  # Per-repository watermarks for incremental crawls
+    COMMENT_INDEX_FILE = "comment-index.json"  # Processed comments and their extraction outcome
+    POEM_JOURNAL_FILE = "poem-journal.jsonl"  # Poems found by the current run, for --resume
     LOGS_DIR = "logs"  # Directory for log files
     MAX_LOG_SIZE_BYTES = 1024 * 1024  # 1MB - Maximum size for log files before rotation
 
     # Bot name to look for in comments
     BOT_NAME = "gemini-code-assist[bot]"
 
+    # Issue search query listing the PRs of a repository the bot commented on
+    BOT_PR_SEARCH_QUERY = "repo:{owner}/{repo} type:pr commenter:{bot}"
+    SEARCH_RESULTS_LIMIT = 1000  # GitHub search never returns more results than this
+
     # LLM configuration
     # The default LLM model to use if no model is specified at runtime.
     # This value is used as a fallback when the `--model` command-line argument is not provided.
@@ -55,15 +114,37 @@ class Config:
     Extract ONLY the poem lines (if any):
     """
 
+    # Prompt extracting the poems of several comments at once; each comment is preceded by its id
+    BATCH_POEM_EXTRACTION_PROMPT = """
+    Analyze each of the following GitHub comments and determine if it contains a poem or poetic content.
+    Each comment starts with a line "### COMMENT <id>".
+
+    {comments}
+
+    Answer with a single JSON object and nothing else. It must have one key per comment id.
+    The value is the list of the poem lines of that comment, or the string "NO_POEM" if it does not contain a poem.
+    Example: {{"c1": ["First poem line", "Second poem line"], "c2": "NO_POEM"}}
+    """
+
     # HTTP request headers
     @classmethod
-    def get_headers(cls):
+    def get_headers(cls, token=None):
         """Get headers for GitHub API requests."""
         return {
-            "Authorization": f"token {cls.GITHUB_TOKEN}",
+            "Authorization": f"token {token or cls.GITHUB_TOKEN}",
             "Accept": "application/vnd.github.v3+json"
         }
 
+    @classmethod
+    def get_github_tokens(cls):
+        """Get every configured GitHub token, from GITHUB_TOKENS, GITHUB_TOKEN_FILE and GITHUB_TOKEN."""
+        tokens = [token.strip() for token in cls.GITHUB_TOKENS.split(",")]
+        if cls.GITHUB_TOKEN_FILE and os.path.exists(cls.GITHUB_TOKEN_FILE):
+            with open(cls.GITHUB_TOKEN_FILE, 'r', encoding='utf-8') as f:
+                tokens.extend(line.strip() for line in f if not line.strip().startswith("#"))
+        tokens.append(cls.GITHUB_TOKEN)
+        return list(dict.fromkeys(token for token in tokens if token))
+
     # Runtime statistics template
     @classmethod
     def get_initial_stats(cls):
@@ -75,5 +156,9 @@ class Config:
             "new_poems": 0,
             "total_poems": 0,
             "repositories_checked": set(),
-            "prs_checked": 0
+            "prs_checked": 0,
+            "llm_cache_hits": 0,
+            "llm_cache_misses": 0,
+            "llm_gate_passed": 0,
+            "llm_gate_skipped": 0
         }
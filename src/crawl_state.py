@@ -0,0 +1,96 @@
+"""
+Crawl state module for the Gemini Code Assist PR Poetry collection script.
+This persists per-repository high-water marks so reruns only fetch what changed.
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+
+logger = logging.getLogger("gemini-poetry")
+
+# Watermark field tracking the highest comment id seen, per comment type
+COMMENT_ID_FIELDS = {
+    "comment": "issue_comment_id",
+    "review_comment": "review_comment_id",
+}
+
+class CrawlState:
+    """Per-repository crawl watermarks stored in a JSON state file.
+
+    For every repository the state records the newest PR `updated_at` that was
+    processed and the highest issue / review comment ids seen. Watermarks only
+    ever move forward.
+    """
+
+    def __init__(self, state_file):
+        """Initialize the crawl state from a state file.
+
+        Args:
+            state_file: Path of the JSON state file. It does not need to exist yet.
+        """
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.repositories = self._load()
+
+    def _load(self):
+        """Load the state file, starting empty if it is missing or invalid."""
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("repositories", {})
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable crawl state file {self.state_file}: {e}")
+            return {}
+
+    def get_watermark(self, repo_key):
+        """Get the watermark of a repository.
+
+        Args:
+            repo_key: Repository in "owner/repo" form.
+
+        Returns:
+            A dictionary with the `pr_updated_at`, `issue_comment_id` and
+            `review_comment_id` watermarks recorded so far (empty on first run).
+        """
+        with self._lock:
+            return dict(self.repositories.get(repo_key, {}))
+
+    def advance_watermark(self, repo_key, pr_updated_at=None, issue_comment_id=None, review_comment_id=None):
+        """Move the watermark of a repository forward.
+
+        Values that are None or older than the recorded watermark are ignored.
+
+        Args:
+            repo_key: Repository in "owner/repo" form.
+            pr_updated_at: ISO 8601 `updated_at` of the newest processed PR.
+            issue_comment_id: Highest issue comment id seen.
+            review_comment_id: Highest review comment id seen.
+        """
+        updates = {
+            "pr_updated_at": pr_updated_at,
+            "issue_comment_id": issue_comment_id,
+            "review_comment_id": review_comment_id,
+        }
+        with self._lock:
+            watermark = self.repositories.setdefault(repo_key, {})
+            for field, value in updates.items():
+                if value is not None and (watermark.get(field) is None or value > watermark[field]):
+                    watermark[field] = value
+                    self._dirty = True
+
+    def save(self):
+        """Write the state file if any watermark changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(os.path.abspath(self.state_file))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"repositories": self.repositories}, f, indent=2)
+            os.replace(tmp_path, self.state_file)
+            self._dirty = False
@@ -7,6 +7,7 @@ import re
 import sys
 import time
 import logging
+import threading
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +20,9 @@ logging.basicConfig(
 
 logger = logging.getLogger("gemini-poetry")
 
+# Longest a rate-limited model is deferred, however often it was rate limited in a row
+MAX_RATE_LIMIT_WAIT_SECONDS = 300
+
 class ErrorHandler:
     """Centralized error handling for the Gemini Code Assist PR Poetry collection script."""
     
@@ -27,6 +31,9 @@ class ErrorHandler:
         self.run_stats = run_stats
         self.failed_litellm_models = failed_litellm_models or []
         self.failed_clients = failed_clients or []
+        self.available_after = {}  # Monotonic time each rate-limited model can be called again
+        self.rate_limit_streaks = {}  # Rate limits hit in a row per model, reset by a successful call
+        self._cooldown_lock = threading.Lock()
     
     def handle_api_error(self, error, context="API request"):
         """Handle errors from API requests."""
@@ -48,11 +55,17 @@ class ErrorHandler:
         # Check if it's a rate limit error
         rate_limit_error = False
         wait_time = 0
-        if "rate limit" in error_str.lower() or "429" in error_str:
+        if self.is_rate_limit_error(error):
             rate_limit_error, wait_time = self.handle_rate_limit(error_str, model_name)
         
         return rate_limit_error, wait_time
     
+    @staticmethod
+    def is_rate_limit_error(error):
+        """Check whether an error reports a rate limit."""
+        error_str = str(error)
+        return "rate limit" in error_str.lower() or "429" in error_str
+
     def handle_client_error(self, error, client_filename, error_type=""):
         """Handle errors in client execution and log them appropriately."""
         error_prefix = error_type or "Error using client"
@@ -67,7 +80,17 @@ class ErrorHandler:
         return None
     
     def handle_rate_limit(self, error_str, model_name):
-        """Handle rate limit errors with exponential backoff."""
+        """Handle rate limit errors with exponential backoff.
+
+        Nothing waits here: the model is marked unavailable until the backoff
+        is over, and callers check `cooldown_remaining` before calling it again,
+        so other models and stages keep working in the meantime.
+
+        The backoff doubles with every rate limit hit in a row, until
+        `record_llm_success` resets it. Calls that were already in flight when
+        the model was deferred fail into the running cooldown and do not
+        double it again.
+        """
         rate_limit_error = True
         base_wait_time = 5  # Default wait time in seconds
         
@@ -75,16 +98,27 @@ class ErrorHandler:
         if wait_match := re.search(r"wait (\d+) seconds", error_str):
             base_wait_time = int(wait_match[1])
         
-        # Apply exponential backoff based on how many times this model has failed
-        # Count how many times this model appears in failed_litellm_models
-        failure_count = self.failed_litellm_models.count(model_name)
-        wait_time = base_wait_time * (2 ** failure_count)
-        
-        logger.warning(f"Rate limit detected for {model_name}. Waiting {wait_time} seconds before retry.")
-        time.sleep(wait_time)  # Actually wait here to respect rate limits
+        with self._cooldown_lock:
+            now = time.monotonic()
+            if now < self.available_after.get(model_name, 0):
+                return rate_limit_error, self.available_after[model_name] - now
+            streak = self.rate_limit_streaks.get(model_name, 0)
+            self.rate_limit_streaks[model_name] = streak + 1
+            wait_time = min(base_wait_time * (2 ** streak), MAX_RATE_LIMIT_WAIT_SECONDS)
+            self.available_after[model_name] = now + wait_time
         
+        logger.warning(f"Rate limit detected for {model_name}. Deferring its calls for {wait_time} seconds.")
         return rate_limit_error, wait_time
     
+    def record_llm_success(self, model_name):
+        """Reset the rate limit backoff of a model after a successful call."""
+        with self._cooldown_lock:
+            self.rate_limit_streaks.pop(model_name, None)
+    
+    def cooldown_remaining(self, model_name):
+        """Get how many seconds are left before a rate-limited model can be called again (0 if it can now)."""
+        return max(0.0, self.available_after.get(model_name, 0) - time.monotonic())
+    
     def check_all_models_failed(self, primary_models, custom_models, llm_clients):
         """Check if all available models have failed and exit if necessary."""
         if (len(self.failed_litellm_models) >= len(primary_models) + len(custom_models) and
@@ -0,0 +1,216 @@
+"""
+GitHub API client module for the Gemini Code Assist PR Poetry collection script.
+This provides a single pooled HTTP session shared by every GitHub API call.
+"""
+
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from src.config import Config
+from src.rate_limiter import RateLimiter, get_resource_for_url
+
+logger = logging.getLogger("gemini-poetry")
+
+# Response headers kept alongside cached bodies so replayed responses still paginate
+CACHED_HEADERS = ("Content-Type", "Link")
+
+class GitHubClient:
+    """Pooled HTTP client for the GitHub REST API.
+
+    All requests go through one `requests.Session`, so TCP and TLS connections
+    are kept alive and reused across calls instead of being re-established for
+    every request. Responses are negotiated with gzip compression and every
+    request carries a timeout.
+
+    When a `ResponseCache` is attached, successful responses are stored with
+    their ETag / Last-Modified validators and later requests for the same URL
+    are sent as conditional requests. A 304 Not Modified answer, which does not
+    count against the rate limit, is then served from the cache.
+
+    Every request is scheduled through a `RateLimiter`, and responses rejected
+    by a primary or secondary rate limit are retried once the limiter allows.
+    With a `TokenPool`, each attempt is sent with the token that has the most
+    quota left, so a rejected request fails over to another token.
+
+    With a `Cassette`, final responses are recorded, or in replay mode served
+    from the cassette without touching the network or the rate limiter.
+    """
+
+    def __init__(self, token=None, pool_size=None, timeout=None, cache=None, rate_limiter=None, token_pool=None, cassette=None):
+        """Initialize the client.
+
+        Args:
+            token: GitHub token to authenticate with. Defaults to Config.GITHUB_TOKEN.
+            pool_size: Maximum number of pooled connections per host.
+            timeout: Default per-request timeout in seconds.
+            cache: Optional ResponseCache used for conditional requests.
+            rate_limiter: Scheduler for the requests. Defaults to a new RateLimiter.
+            token_pool: Optional TokenPool; when given, it overrides `token`.
+            cassette: Optional Cassette to record responses to or replay them from.
+        """
+        self.timeout = timeout or Config.GITHUB_REQUEST_TIMEOUT
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.token_pool = token_pool
+        self.cassette = cassette
+        self.cache_hits = 0
+        self.session = requests.Session()
+        self.session.headers.update(Config.get_headers(token))
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.set_pool_size(pool_size or Config.GITHUB_POOL_SIZE)
+
+    def set_pool_size(self, pool_size):
+        """Resize the connection pool.
+
+        Args:
+            pool_size: Maximum number of pooled connections per host.
+        """
+        self.pool_size = pool_size
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        """Send a GET request through the pooled session.
+
+        Args:
+            url: The URL to request.
+            params: Optional query string parameters.
+            headers: Optional headers, merged over the session headers.
+            timeout: Optional timeout overriding the client default.
+
+        Returns:
+            The `requests.Response` for the request.
+        """
+        if self.cache is None:
+            return self._send(url, params, headers, timeout)
+
+        cache_key = requests.Request("GET", url, params=params).prepare().url
+        entry = self.cache.get(cache_key)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self._send(url, params, request_headers, timeout)
+
+        if response.status_code == 304 and entry:
+            self.cache_hits += 1
+            return self._response_from_cache(entry, response)
+
+        if response.status_code == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.cache.set(cache_key, {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "headers": {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+                    "body": response.text
+                })
+
+        return response
+
+    def paginate(self, url, params=None, headers=None):
+        """Iterate over the items of a paginated list endpoint.
+
+        Pages are requested lazily, following the `Link: rel="next"` header, so
+        the consumer can stop early without fetching the remaining pages.
+
+        Args:
+            url: URL of the first page.
+            params: Optional query string parameters for the first page. Later
+                pages use the URL from the Link header, which already carries them.
+            headers: Optional headers sent with every page.
+
+        Yields:
+            The items of each page. For search endpoints, the entries of `items`.
+
+        Raises:
+            requests.HTTPError: If a page cannot be fetched.
+        """
+        while url:
+            response = self.get(url, params=params, headers=headers)
+            response.raise_for_status()
+            data = response.json()
+            yield from (data["items"] if isinstance(data, dict) else data)
+            url = response.links.get("next", {}).get("url")
+            params = None
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        """Send a POST request, such as a GraphQL query, through the pooled session.
+
+        POST responses are never cached.
+
+        Args:
+            url: The URL to request.
+            json: JSON body of the request.
+            headers: Optional headers, merged over the session headers.
+            timeout: Optional timeout overriding the client default.
+
+        Returns:
+            The `requests.Response` for the request.
+        """
+        return self._send(url, None, headers, timeout, json=json)
+
+    def _send(self, url, params, headers, timeout, json=None):
+        """Send a request, or replay it from the cassette.
+
+        A GET is sent unless a JSON body is given, in which case the request is a POST.
+        """
+        if self.cassette is None:
+            return self._send_with_retries(url, params, headers, timeout, json)
+
+        key = self.cassette.http_key("GET" if json is None else "POST", url, params, json)
+        if self.cassette.replaying:
+            return self.cassette.replay_response(key)
+        response = self._send_with_retries(url, params, headers, timeout, json)
+        self.cassette.record_response(key, response)
+        return response
+
+    def _send_with_retries(self, url, params, headers, timeout, json):
+        """Send a request when the rate limiter allows, retrying rate-limited responses."""
+        resource = get_resource_for_url(url)
+        for attempt in range(Config.GITHUB_MAX_RETRIES + 1):
+            token_id, request_headers = self._select_token(resource, headers)
+            self.rate_limiter.acquire(resource, token_id)
+            if json is None:
+                response = self.session.get(url, params=params, headers=request_headers, timeout=timeout or self.timeout)
+            else:
+                response = self.session.post(url, json=json, headers=request_headers, timeout=timeout or self.timeout)
+            retry_delay = self.rate_limiter.update(resource, response, attempt, token_id)
+            if retry_delay is None or attempt == Config.GITHUB_MAX_RETRIES:
+                return response
+            logger.warning(f"GitHub rate limit hit for {url} (status {response.status_code}). Retrying in {retry_delay:.0f} seconds.")
+        return response
+
+    def _select_token(self, resource, headers):
+        """Pick the pooled token for a request and merge its header into the request headers.
+
+        Requests that carry their own Authorization header keep it.
+        """
+        if self.token_pool is None or (headers and "Authorization" in headers):
+            return 0, headers
+        token_id, token = self.token_pool.select(self.rate_limiter, resource)
+        return token_id, {**(headers or {}), **self.token_pool.get_headers(token)}
+
+    def _response_from_cache(self, entry, not_modified_response):
+        """Build a 200 response from a cache entry after a 304 answer."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = not_modified_response.url
+        response.request = not_modified_response.request
+        response.encoding = "utf-8"
+        response.headers = CaseInsensitiveDict(not_modified_response.headers)
+        response.headers.update(entry.get("headers", {}))
+        response._content = entry["body"].encode("utf-8")
+        return response
+
+    def close(self):
+        """Close the session and release pooled connections."""
+        self.session.close()
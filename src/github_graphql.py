@@ -0,0 +1,161 @@
+"""
+GitHub GraphQL ingestion module for the Gemini Code Assist PR Poetry collection script.
+This fetches pull requests together with their comments and reviews in batched queries.
+"""
+
+import logging
+import requests
+from src.config import Config
+
+logger = logging.getLogger("gemini-poetry")
+
+COMMENT_FIELDS = """
+        databaseId
+        body
+        url
+        updatedAt
+        author { login __typename }
+"""
+
+PULL_REQUESTS_QUERY = """
+query($owner: String!, $repo: String!, $pageSize: Int!, $cursor: String, $orderField: PullRequestOrderField!) {
+  repository(owner: $owner, name: $repo) {
+    pullRequests(first: $pageSize, after: $cursor, states: [OPEN, CLOSED, MERGED], orderBy: {field: $orderField, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        updatedAt
+        comments(first: 100) {
+          pageInfo { hasNextPage }
+          nodes {%(comment_fields)s}
+        }
+        reviews(first: 50) {
+          pageInfo { hasNextPage }
+          nodes {
+            databaseId
+            author { login __typename }
+            comments(first: 50) {
+              pageInfo { hasNextPage }
+              nodes {%(comment_fields)s}
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" % {"comment_fields": COMMENT_FIELDS}
+
+def _login(node):
+    """Get the REST-style login of a GraphQL author, e.g. "gemini-code-assist[bot]"."""
+    author = node.get("author") or {"login": "ghost", "__typename": "User"}
+    if author.get("__typename") == "Bot":
+        return f"{author['login']}[bot]"
+    return author["login"]
+
+def _to_rest_comment(node):
+    """Convert a GraphQL comment node to the REST comment dictionary shape."""
+    return {
+        "id": node["databaseId"],
+        "body": node["body"],
+        "html_url": node["url"],
+        "updated_at": node["updatedAt"],
+        "user": {"login": _login(node)},
+    }
+
+def _to_rest_pull_request(node):
+    """Convert a GraphQL pull request node to a REST-shaped PR with nested comments and reviews.
+
+    Comment and review connections are fetched with a single page each. When
+    GitHub reports more pages for any of them, the PR is marked `truncated`
+    so its comments can be fetched in full another way.
+    """
+    number = node["number"]
+    truncated = node["comments"]["pageInfo"]["hasNextPage"] or node["reviews"]["pageInfo"]["hasNextPage"]
+
+    reviews = []
+    for review in node["reviews"]["nodes"]:
+        truncated = truncated or review["comments"]["pageInfo"]["hasNextPage"]
+        reviews.append({
+            "id": review["databaseId"],
+            "user": {"login": _login(review)},
+            "comments": [_to_rest_comment(comment) for comment in review["comments"]["nodes"]],
+        })
+
+    return {
+        "number": number,
+        "updated_at": node["updatedAt"],
+        "comments": [_to_rest_comment(comment) for comment in node["comments"]["nodes"]],
+        "reviews": reviews,
+        "truncated": truncated,
+    }
+
+def list_pull_requests_with_comments(client, owner, repo, updated_after=None, max_prs=None, page_size=None):
+    """Fetch pull requests with their issue comments, reviews and review comments.
+
+    Each GraphQL request returns a whole page of PRs including their comments,
+    replacing the per-PR REST calls.
+
+    Args:
+        client: The GitHubClient used to send the queries.
+        owner: Repository owner
+        repo: Repository name
+        updated_after: Optional ISO 8601 watermark. When given, PRs are ordered by
+            most recent update and listing stops at the first PR not updated after it.
+        max_prs: Optional maximum number of PRs to return.
+        page_size: Number of PRs per query. Defaults to Config.GRAPHQL_PR_PAGE_SIZE.
+
+    Returns:
+        A (prs, complete) tuple. Each PR is a dictionary with `number`,
+        `updated_at`, `comments` and `reviews` (each review carrying its own
+        `comments`), all in the REST API shape, and `truncated`, True when some
+        of its comments or reviews did not fit in the query's single page.
+        `complete` is False if listing stopped because of an error or `max_prs`.
+    """
+    prs = []
+    cursor = None
+    page_size = page_size or Config.GRAPHQL_PR_PAGE_SIZE
+    variables = {
+        "owner": owner,
+        "repo": repo,
+        "orderField": "UPDATED_AT" if updated_after else "CREATED_AT",
+    }
+
+    while True:
+        if max_prs is not None:
+            variables["pageSize"] = max(1, min(page_size, max_prs - len(prs) + 1))
+        else:
+            variables["pageSize"] = page_size
+        variables["cursor"] = cursor
+        print(f"Fetching PRs with comments from {Config.GRAPHQL_URL} for {owner}/{repo} (cursor={cursor})")
+
+        try:
+            response = client.post(Config.GRAPHQL_URL, json={"query": PULL_REQUESTS_QUERY, "variables": variables})
+        except requests.RequestException as e:
+            logger.error(f"Error querying GraphQL for {owner}/{repo}: {e}")
+            return prs, False
+
+        if response.status_code != 200:
+            print(f"Error querying GraphQL for {owner}/{repo}: {response.status_code}")
+            return prs, False
+
+        data = response.json()
+        if data.get("errors"):
+            print(f"GraphQL errors for {owner}/{repo}: {data['errors']}")
+            return prs, False
+
+        connection = data["data"]["repository"]["pullRequests"]
+        for node in connection["nodes"]:
+            if updated_after and node["updatedAt"] <= updated_after:
+                print(f"Reached watermark {updated_after}")
+                return prs, True
+            if max_prs is not None and len(prs) >= max_prs:
+                return prs, False
+            pr = _to_rest_pull_request(node)
+            if pr["truncated"]:
+                logger.info(f"PR #{pr['number']} in {owner}/{repo} has more comments or reviews than a single GraphQL page")
+            prs.append(pr)
+
+        if not connection["pageInfo"]["hasNextPage"]:
+            return prs, True
+        cursor = connection["pageInfo"]["endCursor"]
@@ -6,7 +6,9 @@ This provides a standard structure for all LLM clients to follow.
 import os
 import abc
 import json
-from typing import Dict, Any, Optional, List
+import hashlib
+import threading
+from typing import Dict, Any, Optional, List, Tuple
 import litellm
 from src.config import Config
 
@@ -82,6 +84,15 @@ class BaseLLMClient(abc.ABC):
 class LiteLLMClient(BaseLLMClient):
     """Client for LiteLLM supported models."""
 
+    # Cassette shared by every client to record completions to or replay them from
+    cassette = None
+
+    # Optional ResponseCache of completions shared by every client, with its lookup counts
+    response_cache = None
+    cache_hits = 0
+    cache_misses = 0
+    _cache_stats_lock = threading.Lock()
+
     def __init__(self, model_name: str):
         """Initialize the LiteLLM client.
 
@@ -89,6 +100,86 @@ class LiteLLMClient(BaseLLMClient):
             model_name: The name of the model to use (e.g., "gemini/gemini-1.5-flash").
         """
         super().__init__(model_name)
+        # Clients are shared between threads, so each thread sees its own last error
+        self._local = threading.local()
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        """The error of this thread's last failed completion, or None if it succeeded."""
+        return getattr(self._local, "last_error", None)
+
+    @last_error.setter
+    def last_error(self, error: Optional[Exception]) -> None:
+        self._local.last_error = error
+
+    @staticmethod
+    def completion_key(model_name: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        """Build the response cache key of a completion.
+
+        Args:
+            model_name: The model the completion is requested from.
+            messages: The chat messages sent to the model.
+            params: The sampling parameters of the completion.
+
+        Returns:
+            A key derived from the SHA-256 of the model, messages and parameters.
+        """
+        request = json.dumps({"model": model_name, "messages": messages, "params": params}, sort_keys=True)
+        return f"completion:{hashlib.sha256(request.encode('utf-8')).hexdigest()}"
+
+    @classmethod
+    def _count_cache_lookup(cls, hit: bool) -> None:
+        """Count a response cache lookup."""
+        with cls._cache_stats_lock:
+            if hit:
+                cls.cache_hits += 1
+            else:
+                cls.cache_misses += 1
+
+    def _build_request(self, prompt: str) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """Build the messages and sampling parameters of a completion request."""
+        messages = [
+            {"role": "system", "content": ""},
+            {"role": "user", "content": prompt}
+        ]
+        params = {"temperature": 0.8, "top_p": 0.1, "max_tokens": 2048}
+        return messages, params
+
+    def _lookup(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """Look up a completion in the replayed cassette or the response cache.
+
+        Returns:
+            A (found, content) tuple.
+
+        Raises:
+            CassetteMissError: In replay mode, for a completion that was never recorded.
+        """
+        if self.cassette is not None and self.cassette.replaying:
+            return True, self.cassette.replay(self.cassette.llm_key(self.model_name, messages, params))["content"]
+
+        if self.response_cache is not None:
+            cached = self.response_cache.get(self.completion_key(self.model_name, messages, params))
+            self._count_cache_lookup(cached is not None)
+            if cached is not None:
+                return True, cached["content"]
+        return False, None
+
+    def _store(self, messages: List[Dict[str, str]], params: Dict[str, Any], response: Any) -> Optional[str]:
+        """Record and cache a completion response.
+
+        Returns:
+            The content of the response.
+        """
+        # Accessing the content correctly based on LiteLLM's response structure
+        # LiteLLM typically returns a ModelResponse object, then access message via .choices[0].message.content
+        content = None
+        if response.choices and response.choices[0].message and response.choices[0].message.content:
+            content = response.choices[0].message.content
+        if self.cassette is not None:
+            self.cassette.record(self.cassette.llm_key(self.model_name, messages, params), {"content": content})
+        if self.response_cache is not None:
+            self.response_cache.set(self.completion_key(self.model_name, messages, params), {"content": content})
+        return content
 
     def extract_poem(self, prompt: str) -> str:
         """Extract a poem using LiteLLM.
@@ -97,29 +188,87 @@ class LiteLLMClient(BaseLLMClient):
             prompt: The prompt to send to the LLM.
 
         Returns:
-            The extracted poem text or "NO_POEM" if no poem is found.
+            The extracted poem text or "NO_POEM" if no poem is found. When the
+            completion fails, "NO_POEM" is returned and the error is kept in `last_error`.
         """
+        self.last_error = None
+        messages, params = self._build_request(prompt)
         try:
-            response = litellm.completion(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": ""},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8,
-                top_p=0.1,
-                max_tokens=2048,
-                base_url=Config.OLLAMA_API_URL,
-            )
-            # Accessing the content correctly based on LiteLLM's response structure
-            # LiteLLM typically returns a ModelResponse object, then access message via .choices[0].message.content
-            if response.choices and response.choices[0].message and response.choices[0].message.content:
-                return self.clean_response(response.choices[0].message.content)
-            return "NO_POEM"
+            found, content = self._lookup(messages, params)
+            if not found:
+                response = litellm.completion(
+                    model=self.model_name,
+                    messages=messages,
+                    **params,
+                    base_url=Config.OLLAMA_API_URL,
+                )
+                content = self._store(messages, params, response)
+            return self.clean_response(content)
         except Exception as e:
+            self.last_error = e
             # It's good practice to log the exception or handle it more gracefully
             print(f"Error using LiteLLM client with {self.model_name}: {e}")
             # Check if the exception is due to missing API keys for the specific model
             if "api_key" in str(e).lower():
                 print(f"Please ensure the API key for {self.model_name} is set in your environment variables.")
             return "NO_POEM"
+
+    async def acomplete(self, prompt: str) -> Optional[str]:
+        """Send a prompt to the model without blocking the event loop.
+
+        Args:
+            prompt: The prompt to send to the LLM.
+
+        Returns:
+            The raw content of the answer, or None if it is empty. Errors are raised.
+        """
+        messages, params = self._build_request(prompt)
+        found, content = self._lookup(messages, params)
+        if not found:
+            response = await litellm.acompletion(
+                model=self.model_name,
+                messages=messages,
+                **params,
+                base_url=Config.OLLAMA_API_URL,
+            )
+            content = self._store(messages, params, response)
+        return content
+
+    async def aextract_poem(self, prompt: str) -> str:
+        """Extract a poem using LiteLLM without blocking the event loop.
+
+        Unlike `extract_poem`, a failed completion raises its error, since
+        coroutines sharing a thread cannot tell their errors apart in `last_error`.
+
+        Args:
+            prompt: The prompt to send to the LLM.
+
+        Returns:
+            The extracted poem text or "NO_POEM" if no poem is found.
+        """
+        return self.clean_response(await self.acomplete(prompt))
+
+# One client per model, shared by every extraction call and thread
+_clients: Dict[str, LiteLLMClient] = {}
+_clients_lock = threading.Lock()
+
+def get_client_for_model(model_name: str) -> LiteLLMClient:
+    """Get the shared client for a model, creating it on first use.
+
+    Args:
+        model_name: The name of the model to use (e.g., "gemini/gemini-1.5-flash").
+
+    Returns:
+        The LiteLLMClient of the model.
+    """
+    with _clients_lock:
+        client = _clients.get(model_name)
+        if client is None:
+            client = LiteLLMClient(model_name)
+            _clients[model_name] = client
+        return client
+
+def list_available_clients() -> List[str]:
+    """List the models a shared client was created for."""
+    with _clients_lock:
+        return sorted(_clients)
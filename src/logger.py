@@ -80,7 +80,9 @@ class PoemLogger:
             f.write(f"- Total poems: {run_stats['total_poems']}\n")
             f.write(f"- Repositories checked: {len(run_stats['repositories_checked'])}\n")
             f.write(f"- PRs checked: {run_stats['prs_checked']}\n")
-            f.write(f"- Models used: {', '.join(run_stats['models_used'])}\n\n")
+            f.write(f"- Models used: {', '.join(run_stats['models_used'])}\n")
+            f.write(f"- LLM response cache: {run_stats['llm_cache_hits']} hits, {run_stats['llm_cache_misses']} misses\n")
+            f.write(f"- Poem gate: {run_stats['llm_gate_passed']} comments sent to the LLM, {run_stats['llm_gate_skipped']} skipped\n\n")
             
             # Write duplicates
             if run_stats["duplicates"]:
@@ -0,0 +1,69 @@
+"""
+Loop thread module for the Gemini Code Assist PR Poetry collection script.
+This runs every LLM extraction of the process on one long-lived event loop.
+"""
+
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger("gemini-poetry")
+
+class LoopThread:
+    """An event loop running forever in a daemon thread, shared by every caller in the process.
+
+    LiteLLM caches its async HTTP clients on the loop that created them, so
+    extracting each repository under its own asyncio.run() breaks once that
+    loop is closed. Submitting every extraction to this loop instead keeps
+    those clients, and the per-model semaphores, on a single loop.
+    """
+
+    def __init__(self, name="llm-loop"):
+        """Initialize the loop thread; the loop is started on first use.
+
+        Args:
+            name: Name of the thread running the loop.
+        """
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        """The running event loop, started on first access."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+                logger.debug(f"Started the {self.name} event loop thread")
+            return self._loop
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def run(self, coroutine):
+        """Run a coroutine on the loop and wait for its result.
+
+        Safe to call from any thread except the loop thread itself.
+
+        Args:
+            coroutine: The coroutine to run.
+
+        Returns:
+            The coroutine's result; its exception is raised in the caller, and
+            the coroutine is cancelled if the wait is interrupted.
+        """
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError(f"LoopThread.run() called from the {self.name} thread would deadlock")
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        try:
+            return future.result()
+        except BaseException:
+            # Stop the coroutine when the caller gives up, e.g. on Ctrl+C
+            future.cancel()
+            raise
@@ -0,0 +1,148 @@
+"""
+Model router module for the Gemini Code Assist PR Poetry collection script.
+This spreads LLM calls over several models, preferring fast healthy ones and tripping circuit breakers on failing ones.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from src.config import Config
+
+logger = logging.getLogger("gemini-poetry")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class _ModelHealth:
+    """Rolling latency and error record of one model, with its circuit breaker state."""
+
+    def __init__(self, window):
+        self.calls = deque(maxlen=window)  # (latency, succeeded) of the latest calls
+        self.state = CLOSED
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def mean_latency(self):
+        latencies = [latency for latency, succeeded in self.calls if succeeded]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    def error_rate(self):
+        return sum(1 for _, succeeded in self.calls if not succeeded) / len(self.calls) if self.calls else 0.0
+
+class ModelRouter:
+    """Route each LLM call to the fastest healthy model.
+
+    Every call's latency and outcome are kept over a rolling window per model.
+    A model whose error rate over the window reaches `failure_threshold` (once
+    at least `min_calls` calls were made) has its circuit opened and gets no
+    calls for `cooldown_seconds`. It then gets a single trial call: success
+    closes the circuit, failure opens it again.
+
+    Models that were never called rank first, in the order given, so every
+    model gets measured; afterwards the model with the lowest mean latency of
+    its successful calls wins, and models without a successful call rank last.
+    """
+
+    def __init__(self, models, window=None, failure_threshold=None, min_calls=None, cooldown_seconds=None, clock=time.monotonic):
+        """Initialize the router.
+
+        Args:
+            models: Model names, in order of preference for models not measured yet.
+            window: Number of latest calls kept per model.
+            failure_threshold: Error rate over the window that opens a model's circuit.
+            min_calls: Calls needed in the window before the error rate is trusted.
+            cooldown_seconds: How long an open circuit keeps a model out of rotation.
+            clock: Monotonic clock used for cooldowns.
+        """
+        self.models = list(dict.fromkeys(models))
+        self.window = window or Config.ROUTER_WINDOW
+        self.failure_threshold = failure_threshold or Config.ROUTER_FAILURE_THRESHOLD
+        self.min_calls = min_calls or Config.ROUTER_MIN_CALLS
+        self.cooldown_seconds = Config.ROUTER_COOLDOWN_SECONDS if cooldown_seconds is None else cooldown_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._health = {model: _ModelHealth(self.window) for model in self.models}
+
+    def choose(self, exclude=()):
+        """Pick the model for the next call.
+
+        Args:
+            exclude: Models not to pick, e.g. those that already failed this call.
+
+        Returns:
+            A model name, or None if every model is excluded or cooling down.
+        """
+        now = self._clock()
+        with self._lock:
+            candidates = []
+            for position, model in enumerate(self.models):
+                health = self._health[model]
+                if model in exclude:
+                    continue
+                if health.state == OPEN:
+                    if now - health.opened_at < self.cooldown_seconds:
+                        continue
+                    health.state = HALF_OPEN
+                    logger.info(f"Circuit for {model} half-open after its cooldown; sending a trial call")
+                if health.state == HALF_OPEN and health.trial_in_flight:
+                    continue
+                latency = health.mean_latency()
+                candidates.append((bool(health.calls), float("inf") if latency is None else latency, position, model))
+
+            if not candidates:
+                return None
+            model = min(candidates)[3]
+            if self._health[model].state == HALF_OPEN:
+                self._health[model].trial_in_flight = True
+            return model
+
+    def record_success(self, model, latency):
+        """Record a successful call.
+
+        Args:
+            model: The model called.
+            latency: Duration of the call in seconds.
+        """
+        with self._lock:
+            health = self._health[model]
+            health.calls.append((latency, True))
+            if health.state == HALF_OPEN:
+                logger.info(f"Circuit for {model} closed after a successful trial call")
+                health.state = CLOSED
+                health.calls.clear()
+                health.calls.append((latency, True))
+            health.trial_in_flight = False
+
+    def record_failure(self, model, latency):
+        """Record a failed call, opening the model's circuit if it fails too often.
+
+        Args:
+            model: The model called.
+            latency: Duration of the call in seconds.
+        """
+        with self._lock:
+            health = self._health[model]
+            health.calls.append((latency, False))
+            trial_failed = health.state == HALF_OPEN
+            health.trial_in_flight = False
+            if trial_failed or (health.state == CLOSED and len(health.calls) >= self.min_calls
+                                and health.error_rate() >= self.failure_threshold):
+                health.state = OPEN
+                health.opened_at = self._clock()
+                logger.warning(f"Circuit for {model} opened (error rate {health.error_rate():.0%}); "
+                               f"retrying it in {self.cooldown_seconds} seconds")
+
+    def snapshot(self):
+        """Get the state, call count, error rate and mean latency of every model."""
+        with self._lock:
+            return {
+                model: {
+                    "state": health.state,
+                    "calls": len(health.calls),
+                    "error_rate": health.error_rate(),
+                    "mean_latency": health.mean_latency(),
+                }
+                for model, health in self._health.items()
+            }
@@ -0,0 +1,117 @@
+"""
+Poem journal module for the Gemini Code Assist PR Poetry collection script.
+This appends found poems to a durable journal so an interrupted run can be resumed.
+"""
+
+import os
+import json
+import logging
+import threading
+
+logger = logging.getLogger("gemini-poetry")
+
+# Journal record types
+POEM = "poem"
+PR_DONE = "pr_done"
+
+class PoemJournal:
+    """Append-only JSON Lines journal of the poems found during a run.
+
+    Every poem is written as soon as it is found, followed by a `pr_done`
+    marker once all comments of its PR were processed. Each record is flushed
+    and fsynced before the call returns, so a crash or Ctrl-C loses at most the
+    PR being processed. Replaying the journal gives back the poems of the
+    completed PRs; PRs without a marker are processed again on resume.
+    """
+
+    def __init__(self, journal_file):
+        """Initialize the journal.
+
+        Args:
+            journal_file: Path of the JSON Lines journal. It does not need to exist yet.
+        """
+        self.journal_file = journal_file
+        self._lock = threading.Lock()
+        self._file = None
+        self.completed_prs = set()
+
+    @staticmethod
+    def _pr_key(repo_key, pr_number):
+        """Get the key of a PR in `completed_prs`."""
+        return f"{repo_key}#{pr_number}"
+
+    def exists(self):
+        """Check whether a journal was left by a previous run."""
+        return os.path.exists(self.journal_file) and os.path.getsize(self.journal_file) > 0
+
+    def replay(self):
+        """Read the journal of an interrupted run.
+
+        A truncated last record, left by a crash in the middle of a write, is ignored.
+
+        Returns:
+            The poems of the PRs the journal marks as completed, in the order they were found.
+        """
+        if not os.path.exists(self.journal_file):
+            return []
+
+        poems_by_pr = {}
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring unreadable record on line {line_number} of {self.journal_file}")
+                    continue
+                pr_key = self._pr_key(record["repository"], record["pr_number"])
+                if record["type"] == POEM:
+                    poems_by_pr.setdefault(pr_key, []).append(record["poem"])
+                elif record["type"] == PR_DONE:
+                    self.completed_prs.add(pr_key)
+
+        return [poem for pr_key, poems in poems_by_pr.items() if pr_key in self.completed_prs for poem in poems]
+
+    def is_pr_done(self, repo_key, pr_number):
+        """Check whether the journal marks a PR as completed."""
+        return self._pr_key(repo_key, pr_number) in self.completed_prs
+
+    def _append(self, record):
+        """Append a record and wait until it is on disk."""
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.journal_file, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def append_poem(self, repo_key, pr_number, entry):
+        """Record a poem found in a PR.
+
+        Args:
+            repo_key: Repository in "owner/repo" form.
+            pr_number: Pull request number
+            entry: The poem entry.
+        """
+        self._append({"type": POEM, "repository": repo_key, "pr_number": pr_number, "poem": entry})
+
+    def mark_pr_done(self, repo_key, pr_number):
+        """Record that every comment of a PR was processed.
+
+        Args:
+            repo_key: Repository in "owner/repo" form.
+            pr_number: Pull request number
+        """
+        self._append({"type": PR_DONE, "repository": repo_key, "pr_number": pr_number})
+        with self._lock:
+            self.completed_prs.add(self._pr_key(repo_key, pr_number))
+
+    def clear(self):
+        """Remove the journal, e.g. once its poems were saved to the collection."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self.completed_prs.clear()
@@ -0,0 +1,123 @@
+"""
+Poem scorer module for the Gemini Code Assist PR Poetry collection script.
+This estimates locally how likely a comment is to contain a poem, to gate LLM calls.
+"""
+
+import re
+import logging
+import statistics
+import threading
+from src.config import Config
+
+logger = logging.getLogger("gemini-poetry")
+
+# Lines that read like markup rather than verse
+LIST_ITEM = re.compile(r"^([-+]\s|\*\s|\d+[.)]\s|#|\||<)")
+MARKED_LINE = re.compile(r"^(>\s*\S|\*[^*\s].*\*$|_[^_\s].*_$)")
+URL = re.compile(r"https?://")
+
+def _is_verse_line(stripped):
+    """Check whether a stripped line could be a line of a short poem."""
+    text = stripped.lstrip("> ").strip()
+    return (Config.POEM_MIN_LINE_LENGTH <= len(text) <= Config.POEM_MAX_LINE_LENGTH
+            and not LIST_ITEM.match(text)
+            and not URL.search(text))
+
+def score_poem_likelihood(comment_body):
+    """Estimate how likely a comment is to contain a poem.
+
+    The score looks for the longest run of short lines outside code fences and
+    rewards runs that form a stanza of their own (blank lines around them),
+    lines of similar length, and blockquote or italic markers. The result is
+    reduced by up to half for comments made mostly of code fences.
+
+    Args:
+        comment_body: The comment text.
+
+    Returns:
+        A (score, features) tuple, with a score between 0 and 1 and the
+        features it was computed from.
+    """
+    lines = (comment_body or "").splitlines()
+    code_lines = 0
+    in_code = False
+    best_run = []
+    best_bounded = False
+    run = []
+    run_start_bounded = True
+
+    def close_run(bounded_after):
+        nonlocal best_run, best_bounded
+        if len(run) > len(best_run):
+            best_run, best_bounded = list(run), run_start_bounded and bounded_after
+
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            close_run(False)
+            run, run_start_bounded = [], False
+            in_code = not in_code
+            code_lines += 1
+            continue
+        if in_code:
+            code_lines += 1
+            continue
+        if stripped in ("", ">"):
+            close_run(True)
+            run, run_start_bounded = [], True
+        elif _is_verse_line(stripped):
+            run.append(stripped)
+        else:
+            close_run(False)
+            run, run_start_bounded = [], False
+    close_run(True)
+
+    lengths = [len(line.lstrip("> ").strip()) for line in best_run]
+    cv = statistics.pstdev(lengths) / statistics.mean(lengths) if len(lengths) > 1 else 1.0
+    features = {
+        "run_length": len(best_run),
+        "stanza": best_bounded,
+        "length_cv": round(cv, 3),
+        "marked_ratio": sum(1 for line in best_run if MARKED_LINE.match(line)) / len(best_run) if best_run else 0.0,
+        "code_ratio": code_lines / len(lines) if lines else 0.0,
+    }
+
+    if features["run_length"] < 2:
+        return 0.0, features
+    score = (0.4 * min(features["run_length"], 4) / 4
+             + (0.2 if features["stanza"] else 0.0)
+             + 0.2 * features["marked_ratio"]
+             + 0.2 * (1 - min(cv, 1.0)))
+    return round(score * (1 - 0.5 * features["code_ratio"]), 3), features
+
+class PoemScorer:
+    """Gate sending comments to the LLM on their poem likelihood score.
+
+    Every decision is logged with the score and its features, so the threshold
+    can be tuned from the logs, and counted in `passed` and `skipped`.
+    """
+
+    def __init__(self, threshold=None):
+        """Initialize the gate.
+
+        Args:
+            threshold: Minimum score of the comments sent to the LLM. 0 sends every comment.
+        """
+        self.threshold = Config.POEM_SCORE_THRESHOLD if threshold is None else threshold
+        self.passed = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def should_extract(self, comment_body):
+        """Check whether a comment scores high enough to be sent to the LLM."""
+        if self.threshold <= 0:
+            return True
+        score, features = score_poem_likelihood(comment_body)
+        passed = score >= self.threshold
+        with self._lock:
+            if passed:
+                self.passed += 1
+            else:
+                self.skipped += 1
+        logger.info(f"Poem gate {'passed' if passed else 'skipped'} comment: score {score:.2f} (threshold {self.threshold:.2f}), {features}")
+        return passed
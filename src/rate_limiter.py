@@ -0,0 +1,176 @@
+"""
+Rate limiting module for the Gemini Code Assist PR Poetry collection script.
+This schedules GitHub API requests from the rate-limit headers GitHub returns.
+"""
+
+import time
+import logging
+import threading
+from src.config import Config
+
+logger = logging.getLogger("gemini-poetry")
+
+# HTTP statuses GitHub uses when a primary or secondary rate limit is exceeded
+RATE_LIMIT_STATUSES = (403, 429)
+
+def get_resource_for_url(url):
+    """Get the GitHub rate-limit resource a request URL is counted against."""
+    if "/search/" in url:
+        return "search"
+    if url.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+def _int_header(headers, name):
+    """Read an integer response header, returning None if missing or malformed."""
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+class _Bucket:
+    """Token bucket for a single rate-limit resource."""
+
+    def __init__(self, rate, now):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = now
+        self.blocked_until = 0.0
+
+    def reserve(self, now):
+        """Take a token, returning how long to wait first if none is available."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def block(self, until):
+        """Hold every request until the given monotonic time."""
+        self.blocked_until = max(self.blocked_until, until)
+
+class RateLimiter:
+    """Token-bucket scheduler for GitHub API requests.
+
+    Requests are paced per rate-limit resource ("core", "search", "graphql")
+    at up to Config.GITHUB_MAX_REQUESTS_PER_SECOND, which keeps clear of
+    GitHub's secondary limits. The `X-RateLimit-Remaining` and
+    `X-RateLimit-Reset` headers of every response keep the bucket in sync with
+    the primary limit: once the remaining quota drops to the reserve, requests
+    wait for the reset instead of failing. A `Retry-After` header pauses the
+    resource for the requested time.
+
+    Quotas belong to tokens, so when several tokens are in use each one gets
+    its own buckets, identified by the token's index in the TokenPool.
+    """
+
+    def __init__(self, max_rates=None, reserve=None, clock=time.monotonic, wall_clock=time.time, sleep=time.sleep):
+        """Initialize the rate limiter.
+
+        Args:
+            max_rates: Maximum requests per second keyed by resource.
+            reserve: Remaining quota kept in hand for requests already in flight.
+            clock: Monotonic clock used for scheduling.
+            wall_clock: Wall clock used to interpret `X-RateLimit-Reset`.
+            sleep: Function used to wait.
+        """
+        self.max_rates = max_rates or Config.GITHUB_MAX_REQUESTS_PER_SECOND
+        self.reserve = Config.GITHUB_RATE_LIMIT_RESERVE if reserve is None else reserve
+        self._quotas = {}
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def _bucket(self, resource, token_id):
+        """Get the bucket of a token's resource, creating it on first use."""
+        key = (token_id, resource)
+        if key not in self._buckets:
+            rate = self.max_rates.get(resource, self.max_rates["core"])
+            self._buckets[key] = _Bucket(rate, self._clock())
+        return self._buckets[key]
+
+    def get_remaining(self, resource="core", token_id=0):
+        """Get the last known remaining quota of a token.
+
+        Returns:
+            The remaining number of requests, or None if unknown or the quota has since reset.
+        """
+        with self._lock:
+            remaining, reset = self._quotas.get((token_id, resource), (None, None))
+        if reset is not None and reset <= self._wall_clock():
+            return None
+        return remaining
+
+    def get_wait_time(self, resource="core", token_id=0):
+        """Get how many seconds a token is paused for a resource."""
+        with self._lock:
+            bucket = self._buckets.get((token_id, resource))
+            if bucket is None:
+                return 0
+            return max(0, bucket.blocked_until - self._clock())
+
+    def acquire(self, resource="core", token_id=0):
+        """Block until a request against the given resource may be sent with a token."""
+        while True:
+            with self._lock:
+                delay = self._bucket(resource, token_id).reserve(self._clock())
+            if delay <= 0:
+                return
+            self._sleep(delay)
+
+    def update(self, resource, response, attempt=0, token_id=0):
+        """Update the schedule from the headers of a GitHub response.
+
+        Args:
+            resource: The resource the request was counted against.
+            response: The response received.
+            attempt: How many times this request was already retried.
+            token_id: Index of the token the request was sent with.
+
+        Returns:
+            The number of seconds to wait before retrying if the response was
+            rejected by a rate limit, otherwise None.
+        """
+        headers = response.headers
+        if isinstance(headers.get("X-RateLimit-Resource"), str):
+            resource = headers["X-RateLimit-Resource"]
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        reset = _int_header(headers, "X-RateLimit-Reset")
+        limit = _int_header(headers, "X-RateLimit-Limit")
+        retry_after = _int_header(headers, "Retry-After")
+
+        rate_limited = response.status_code in RATE_LIMIT_STATUSES and (
+            retry_after is not None or remaining == 0 or "rate limit" in response.text.lower()
+        )
+
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(resource, token_id)
+            if remaining is not None:
+                self._quotas[(token_id, resource)] = (remaining, reset)
+
+            if retry_after is not None:
+                bucket.block(now + retry_after)
+            elif remaining is not None and reset is not None:
+                reserve = min(self.reserve, limit // 10) if limit else self.reserve
+                if remaining <= reserve:
+                    wait = max(0, reset - self._wall_clock()) + 1
+                    logger.warning(f"GitHub {resource} quota down to {remaining}; pausing {wait:.0f}s until reset")
+                    bucket.block(now + wait)
+
+            if not rate_limited:
+                return None
+
+            if bucket.blocked_until <= now:
+                # Secondary limit without guidance: back off exponentially from one minute
+                bucket.block(now + 60 * (2 ** attempt))
+            return bucket.blocked_until - now
@@ -0,0 +1,120 @@
+"""
+Response cache module for the Gemini Code Assist PR Poetry collection script.
+This provides a persistent, size-bounded key/value store on disk.
+"""
+
+import os
+import json
+import glob
+import hashlib
+import logging
+import tempfile
+import threading
+
+logger = logging.getLogger("gemini-poetry")
+
+class ResponseCache:
+    """Size-bounded on-disk cache of JSON-serializable entries.
+
+    Each entry is stored in its own file named after the SHA-256 of its key.
+    Reading an entry refreshes its modification time, so when the cache grows
+    past `max_size_bytes` the least recently used entries are evicted first.
+    """
+
+    def __init__(self, cache_dir, max_size_bytes):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache files. Created if missing.
+            max_size_bytes: Total size the cache files may occupy on disk.
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._size_bytes = sum(os.path.getsize(path) for path in self._entry_files())
+
+    def _entry_files(self):
+        """List the entry files currently in the cache directory."""
+        return glob.glob(os.path.join(self.cache_dir, "*.json"))
+
+    def _path_for(self, key):
+        """Get the file path storing the entry for a key."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, key):
+        """Get the entry stored for a key.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The stored entry, or None if the key is not cached.
+        """
+        path = self._path_for(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return entry
+
+    def set(self, key, entry):
+        """Store an entry for a key, evicting old entries if the cache is full.
+
+        Args:
+            key: The cache key.
+            entry: A JSON-serializable value.
+        """
+        path = self._path_for(key)
+        data = json.dumps(entry).encode("utf-8")
+
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not write cache entry {path}: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+
+            self._size_bytes += len(data) - old_size
+            if self._size_bytes > self.max_size_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its size limit."""
+        entries = []
+        for path in self._entry_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        self._size_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size_bytes <= self.max_size_bytes:
+                break
+            try:
+                os.remove(path)
+                self._size_bytes -= size
+            except OSError:
+                continue
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            for path in self._entry_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+            self._size_bytes = 0
@@ -0,0 +1,55 @@
+"""
+Token pool module for the Gemini Code Assist PR Poetry collection script.
+This spreads GitHub API requests over several tokens to combine their quotas.
+"""
+
+import threading
+
+class TokenPool:
+    """Pool of GitHub tokens.
+
+    Each request is routed to the token with the most rate-limit headroom, as
+    tracked by the RateLimiter from the response headers. Tokens paused by the
+    limiter (exhausted quota, Retry-After) are skipped while another token is
+    available, so the crawl fails over instead of waiting for a reset.
+    """
+
+    def __init__(self, tokens):
+        """Initialize the pool.
+
+        Args:
+            tokens: The GitHub tokens to use. Duplicates and empty values are dropped.
+        """
+        self.tokens = list(dict.fromkeys(token for token in tokens if token))
+        if not self.tokens:
+            raise ValueError("TokenPool needs at least one GitHub token")
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Get the number of tokens in the pool."""
+        return len(self.tokens)
+
+    def select(self, rate_limiter, resource="core"):
+        """Pick the token to send the next request with.
+
+        Args:
+            rate_limiter: The RateLimiter tracking each token's quota.
+            resource: The rate-limit resource the request counts against.
+
+        Returns:
+            A (token_id, token) tuple. Tokens that are not paused win over paused
+            ones, then the most remaining quota wins. A token whose quota is not
+            known yet counts as fresh.
+        """
+        with self._lock:
+            candidates = []
+            for token_id in range(len(self.tokens)):
+                remaining = rate_limiter.get_remaining(resource, token_id)
+                headroom = float("inf") if remaining is None else remaining
+                candidates.append((rate_limiter.get_wait_time(resource, token_id), -headroom, token_id))
+            token_id = min(candidates)[2]
+            return token_id, self.tokens[token_id]
+
+    def get_headers(self, token):
+        """Get the authorization header for a token."""
+        return {"Authorization": f"token {token}"}
@@ -0,0 +1,291 @@
+"""
+Work queue module for the Gemini Code Assist PR Poetry collection script.
+This shares crawl tasks between processes through a SQLite database with leases.
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import closing, contextmanager
+from src.config import Config
+
+logger = logging.getLogger("gemini-poetry")
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT
+)
+"""
+
+# Key/value flags shared by the coordinator and the workers
+META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+)
+"""
+
+ENQUEUEING_DONE = "enqueueing_done"
+
+class WorkQueue:
+    """Task queue stored in a SQLite database shared by every worker.
+
+    Workers lease one task at a time. A lease expires after `lease_seconds`,
+    after which the task can be leased again, so tasks held by a worker that
+    died are picked up by another one. Tasks that were leased `max_attempts`
+    times without completing are marked failed. Workers keep a lease alive
+    while they work on a task with `heartbeat`.
+
+    The coordinator calls `finish_enqueueing` once every task is in the
+    queue, so workers started before it can tell an empty queue from a
+    finished one.
+
+    Every operation runs in its own short transaction on a fresh connection,
+    so the queue can be used from several threads and processes, including
+    processes on other hosts sharing the database file. Leases are taken under
+    `BEGIN IMMEDIATE`, so two workers never lease the same task.
+    """
+
+    def __init__(self, db_path, lease_seconds=None, max_attempts=None, clock=time.time):
+        """Initialize the queue, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file.
+            lease_seconds: How long a leased task stays with its worker.
+            max_attempts: How many times a task may be leased before it fails.
+            clock: Wall clock used for lease deadlines.
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds or Config.QUEUE_LEASE_SECONDS
+        self.max_attempts = max_attempts or Config.QUEUE_MAX_ATTEMPTS
+        self._clock = clock
+        with self._transaction() as connection:
+            connection.execute(SCHEMA)
+            connection.execute(META_SCHEMA)
+
+    def _connect(self):
+        """Open a connection to the database."""
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _transaction(self, immediate=False):
+        """Open a connection running a single transaction."""
+        return _Transaction(self._connect(), immediate)
+
+    def reset(self):
+        """Remove every task, e.g. before a coordinator enqueues a new crawl."""
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM tasks")
+            connection.execute("DELETE FROM meta WHERE key = ?", (ENQUEUEING_DONE,))
+
+    def finish_enqueueing(self):
+        """Record that every task of the crawl was enqueued."""
+        with self._transaction() as connection:
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (ENQUEUEING_DONE, "1"))
+
+    def is_enqueueing_done(self):
+        """Check whether the coordinator enqueued every task of the crawl."""
+        with self._transaction() as connection:
+            row = connection.execute("SELECT value FROM meta WHERE key = ?", (ENQUEUEING_DONE,)).fetchone()
+        return row is not None
+
+    def enqueue(self, owner, repo, payload):
+        """Add a task.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            payload: JSON-serializable description of the work.
+
+        Returns:
+            The id of the new task.
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "INSERT INTO tasks (owner, repo, payload) VALUES (?, ?, ?)",
+                (owner, repo, json.dumps(payload))
+            )
+            return cursor.lastrowid
+
+    def lease(self, worker_id):
+        """Lease the oldest available task.
+
+        Tasks are available when pending or when their lease expired. Expired
+        tasks that already used up their attempts are marked failed instead.
+
+        Args:
+            worker_id: Identifier of the leasing worker.
+
+        Returns:
+            A dictionary with the task `id`, `owner`, `repo`, `payload` and
+            `attempts`, or None if no task is available.
+        """
+        now = self._clock()
+        with self._transaction(immediate=True) as connection:
+            connection.execute(
+                "UPDATE tasks SET status = ?, error = 'lease expired' WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, LEASED, now, self.max_attempts)
+            )
+            row = connection.execute(
+                "SELECT * FROM tasks WHERE status = ? OR (status = ? AND lease_expires < ?) ORDER BY id LIMIT 1",
+                (PENDING, LEASED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            if row["status"] == LEASED:
+                logger.warning(f"Re-leasing task {row['id']} for {row['owner']}/{row['repo']}: lease of {row['worker']} expired")
+            connection.execute(
+                "UPDATE tasks SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                (LEASED, worker_id, now + self.lease_seconds, row["id"])
+            )
+        return {
+            "id": row["id"],
+            "owner": row["owner"],
+            "repo": row["repo"],
+            "payload": json.loads(row["payload"]),
+            "attempts": row["attempts"] + 1,
+        }
+
+    def renew(self, task_id, worker_id):
+        """Extend the lease on a task by `lease_seconds` from now.
+
+        Args:
+            task_id: The task id.
+            worker_id: The worker holding the lease.
+
+        Returns:
+            True if the lease was renewed, False if it was lost to another worker.
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE id = ? AND worker = ? AND status = ?",
+                (self._clock() + self.lease_seconds, task_id, worker_id, LEASED)
+            )
+            return cursor.rowcount == 1
+
+    @contextmanager
+    def heartbeat(self, task_id, worker_id, interval=None):
+        """Renew the lease on a task in a background thread while the block runs.
+
+        A worker that dies stops renewing, so its task is still re-leased once
+        the lease expires; a long task, e.g. one waiting out LLM rate limits,
+        keeps its lease.
+
+        Args:
+            task_id: The task id.
+            worker_id: The worker holding the lease.
+            interval: Seconds between renewals. Defaults to a third of `lease_seconds`.
+        """
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(interval or self.lease_seconds / 3):
+                if not self.renew(task_id, worker_id):
+                    logger.warning(f"Lease on task {task_id} was lost; stopping its heartbeat")
+                    return
+
+        thread = threading.Thread(target=beat, name=f"lease-heartbeat-{task_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, task_id, worker_id, result):
+        """Store the result of a leased task and mark it done.
+
+        Args:
+            task_id: The task id.
+            worker_id: The worker holding the lease.
+            result: JSON-serializable result of the task.
+
+        Returns:
+            True if the result was stored, False if the lease was lost to another worker.
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE tasks SET status = ?, result = ?, lease_expires = NULL WHERE id = ? AND worker = ? AND status = ?",
+                (DONE, json.dumps(result), task_id, worker_id, LEASED)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, task_id, worker_id, error):
+        """Give a leased task back after an error.
+
+        The task is queued again unless it used up its attempts, in which case it fails.
+
+        Args:
+            task_id: The task id.
+            worker_id: The worker holding the lease.
+            error: Description of the error.
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, error = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (self.max_attempts, FAILED, PENDING, str(error), task_id, worker_id, LEASED)
+            )
+
+    def counts(self):
+        """Count the tasks by status."""
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        with self._transaction() as connection:
+            for status, count in connection.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+                counts[status] = count
+        return counts
+
+    def is_finished(self):
+        """Check whether every task is done or failed."""
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[LEASED] == 0
+
+    def tasks(self):
+        """List every task in enqueue order, with its status and decoded result."""
+        with self._transaction() as connection:
+            rows = connection.execute("SELECT * FROM tasks ORDER BY id").fetchall()
+        return [{
+            "id": row["id"],
+            "owner": row["owner"],
+            "repo": row["repo"],
+            "payload": json.loads(row["payload"]),
+            "status": row["status"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+        } for row in rows]
+
+class _Transaction:
+    """Context manager running one transaction on a connection and closing it afterwards."""
+
+    def __init__(self, connection, immediate):
+        self.connection = connection
+        self.immediate = immediate
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE" if self.immediate else "BEGIN")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, traceback):
+        with closing(self.connection):
+            if exc_type is None:
+                self.connection.execute("COMMIT")
+            else:
+                self.connection.execute("ROLLBACK")
+        return False
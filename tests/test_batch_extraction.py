@@ -0,0 +1,135 @@
+import unittest
+import os
+import sys
+import json
+import asyncio
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.batch_extraction import build_batch_prompt, parse_batch_response, BatchExtractor
+
+class FakeClient:
+    """Client answering batch prompts with a scripted JSON answer and single prompts with their body."""
+
+    model_name = "fake/model"
+
+    def __init__(self, batch_answer):
+        self.batch_answer = batch_answer
+        self.batch_prompts = []
+        self.single_prompts = []
+
+    async def acomplete(self, prompt):
+        self.batch_prompts.append(prompt)
+        if isinstance(self.batch_answer, Exception):
+            raise self.batch_answer
+        return self.batch_answer
+
+    async def aextract_poem(self, prompt):
+        self.single_prompts.append(prompt)
+        return "single answer"
+
+class TestBatchParsing(unittest.TestCase):
+
+    def test_prompt_lists_every_comment_with_its_id(self):
+        """Every comment body follows its id header."""
+        prompt = build_batch_prompt({"c1": "first body", "c2": "second body"})
+        self.assertIn("### COMMENT c1\nfirst body", prompt)
+        self.assertIn("### COMMENT c2\nsecond body", prompt)
+        self.assertIn('{"c1": ["First poem line"', prompt)
+
+    def test_parse_valid_answer(self):
+        """Poem lines and NO_POEM are split per comment; invalid and missing ids are left out."""
+        answer = "```json\n" + json.dumps({"c1": ["Line one", "Line two"], "c2": "NO_POEM", "c3": 42}) + "\n```"
+        self.assertEqual(
+            parse_batch_response(answer, ["c1", "c2", "c3", "c4"]),
+            {"c1": "Line one\nLine two", "c2": "NO_POEM"}
+        )
+
+    def test_parse_invalid_answer(self):
+        """Answers that are not a JSON object are rejected."""
+        for answer in (None, "Here are the poems!", "[1, 2]"):
+            with self.assertRaises(ValueError):
+                parse_batch_response(answer, ["c1"])
+
+class TestBatchExtractor(unittest.TestCase):
+
+    def extract_all(self, client, bodies, batch_size):
+        """Extract every body concurrently through a BatchExtractor."""
+        async def run():
+            extractor = BatchExtractor(client, asyncio.Semaphore(2), batch_size, wait_seconds=0.01)
+            results = await asyncio.gather(*(extractor.extract(body) for body in bodies))
+            return extractor, results
+        return asyncio.run(run())
+
+    def test_comments_share_one_prompt(self):
+        """Waiting comments are packed into one prompt and answered in order."""
+        client = FakeClient(json.dumps({"c1": ["Poem one"], "c2": "NO_POEM", "c3": ["Poem three"]}))
+
+        extractor, results = self.extract_all(client, ["one", "two", "three"], batch_size=5)
+
+        self.assertEqual(results, ["Poem one", "NO_POEM", "Poem three"])
+        self.assertEqual((len(client.batch_prompts), extractor.batches, extractor.fallbacks), (1, 1, 0))
+        self.assertEqual(client.single_prompts, [])
+
+    def test_missing_ids_fall_back_to_single_prompts(self):
+        """Comments the answer does not cover are extracted one by one."""
+        client = FakeClient(json.dumps({"c1": ["Poem one"]}))
+
+        extractor, results = self.extract_all(client, ["one", "two"], batch_size=2)
+
+        self.assertEqual(results, ["Poem one", "single answer"])
+        self.assertEqual(extractor.fallbacks, 1)
+        self.assertIn("two", client.single_prompts[0])
+
+    def test_failed_batch_falls_back(self):
+        """Every comment of a failed batch is extracted with its own prompt."""
+        client = FakeClient(RuntimeError("boom"))
+
+        extractor, results = self.extract_all(client, ["one", "two", "three"], batch_size=2)
+
+        self.assertEqual(results, ["single answer"] * 3)
+        self.assertEqual(len(client.single_prompts), 3)
+        self.assertEqual(extractor.batches, 0)
+
+    def test_rate_limited_batch_is_not_fanned_out(self):
+        """A 429 records the cooldown once and is raised to every comment, with no single prompts."""
+        client = FakeClient(Exception("429 Too Many Requests: rate limit exceeded"))
+        handled = []
+
+        class RecordingHandler:
+            def handle_litellm_error(self, error, model_name):
+                handled.append(model_name)
+                return True, 30
+
+        async def run():
+            extractor = BatchExtractor(client, asyncio.Semaphore(2), 3, wait_seconds=0.01, error_handler=RecordingHandler())
+            results = await asyncio.gather(*(extractor.extract(body) for body in ["one", "two", "three"]), return_exceptions=True)
+            return extractor, results
+
+        extractor, results = asyncio.run(run())
+
+        self.assertEqual(len(client.batch_prompts), 1)
+        self.assertEqual(client.single_prompts, [])
+        self.assertEqual(handled, ["fake/model"])
+        self.assertTrue(all("429" in str(result) for result in results))
+        self.assertEqual(extractor.fallbacks, 0)
+
+    def test_ready_check_runs_before_every_call(self):
+        """The ready check is awaited with the model name before each batch and fallback call."""
+        client = FakeClient(json.dumps({"c1": ["Poem one"]}))
+        checked = []
+
+        async def ready(model_name):
+            checked.append(model_name)
+
+        async def run():
+            extractor = BatchExtractor(client, asyncio.Semaphore(2), 2, wait_seconds=0.01, ready=ready)
+            return await asyncio.gather(extractor.extract("one"), extractor.extract("two"))
+
+        asyncio.run(run())
+
+        self.assertEqual(checked, ["fake/model", "fake/model"])
+
+if __name__ == '__main__':
+    unittest.main()
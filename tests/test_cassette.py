@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch, MagicMock
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+from src.cassette import Cassette, CassetteMissError, RECORD, REPLAY
+from src.github_client import GitHubClient
+from src.llm_client_template import LiteLLMClient
+
+def make_response(status_code=200, headers=None, body=b"[]"):
+    """Build a requests.Response with the given status and headers."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://api.github.com/repos/o/r/pulls?per_page=100"
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+class TestCassette(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary cassette directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, "cassette")
+
+    def tearDown(self):
+        """Remove the temporary cassette directory."""
+        self.temp_dir.cleanup()
+        patch.stopall()
+
+    def test_replay_needs_a_recording(self):
+        """Replaying a directory that was never recorded fails early."""
+        with self.assertRaises(ValueError):
+            Cassette(self.directory, REPLAY)
+
+    def test_github_responses_round_trip(self):
+        """Recorded GitHub responses are replayed without the network or the rate limiter."""
+        recorder = GitHubClient(cassette=Cassette(self.directory, RECORD))
+        page = make_response(headers={"Link": '<https://api.github.com/next>; rel="next"', "Content-Encoding": "gzip"}, body=b'[{"number": 1}]')
+        with patch.object(recorder.session, 'get', return_value=page):
+            recorder.get("https://api.github.com/repos/o/r/pulls", params={"per_page": 100})
+        recorder.cassette.save()
+        recorder.close()
+
+        rate_limiter = MagicMock()
+        player = GitHubClient(cassette=Cassette(self.directory, REPLAY), rate_limiter=rate_limiter)
+        with patch.object(player.session, 'get') as mock_get:
+            response = player.get("https://api.github.com/repos/o/r/pulls", params={"per_page": 100})
+            with self.assertRaises(CassetteMissError):
+                player.get("https://api.github.com/repos/o/r/pulls", params={"per_page": 30})
+
+        mock_get.assert_not_called()
+        rate_limiter.acquire.assert_not_called()
+        self.assertEqual(response.json(), [{"number": 1}])
+        self.assertEqual(response.links["next"]["url"], "https://api.github.com/next")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual((player.cassette.replayed, player.cassette.misses), (1, 1))
+        player.close()
+
+    def test_post_bodies_are_part_of_the_key(self):
+        """GraphQL queries with different variables are recorded separately."""
+        cassette = Cassette(self.directory, RECORD)
+        first = Cassette.http_key("POST", "https://api.github.com/graphql", json_body={"variables": {"cursor": None}})
+        second = Cassette.http_key("POST", "https://api.github.com/graphql", json_body={"variables": {"cursor": "abc"}})
+        self.assertNotEqual(first, second)
+        cassette.record(first, {"body": "1"})
+        self.assertEqual(cassette.replay(first), {"body": "1"})
+
+    @patch.dict(os.environ, {"GITHUB_TOKEN": "fake_github_token"})
+    def test_llm_completions_round_trip(self):
+        """Recorded LLM completions are replayed without calling LiteLLM."""
+        completion = MagicMock()
+        completion.choices = [MagicMock()]
+        completion.choices[0].message.content = "Roses are red"
+        mock_completion = patch('litellm.completion', return_value=completion).start()
+
+        cassette = Cassette(self.directory, RECORD)
+        patch.object(LiteLLMClient, 'cassette', cassette).start()
+        self.assertEqual(LiteLLMClient("test/model").extract_poem("prompt"), "Roses are red")
+        cassette.save()
+
+        patch.object(LiteLLMClient, 'cassette', Cassette(self.directory, REPLAY)).start()
+        mock_completion.reset_mock()
+        self.assertEqual(LiteLLMClient("test/model").extract_poem("prompt"), "Roses are red")
+        self.assertEqual(LiteLLMClient("other/model").extract_poem("prompt"), "NO_POEM")
+        mock_completion.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.comment_index import CommentIndex, POEM, NO_POEM, ERROR
+
+def make_comment(comment_id, updated_at="2025-05-01T00:00:00Z"):
+    """Build a comment in the REST API shape."""
+    return {"id": comment_id, "updated_at": updated_at, "body": "..."}
+
+class TestCommentIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Point the index at a temporary file."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_file = os.path.join(self.temp_dir.name, "comment-index.json")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_unchanged_comments_are_processed(self):
+        """Comments with a poem or without one are skipped until they are edited."""
+        index = CommentIndex(self.index_file)
+        index.record("comment", make_comment(1), POEM)
+        index.record("review_comment", make_comment(2), NO_POEM)
+
+        self.assertTrue(index.is_processed("comment", make_comment(1)))
+        self.assertTrue(index.is_processed("review_comment", make_comment(2)))
+        self.assertFalse(index.is_processed("comment", make_comment(1, "2025-05-02T00:00:00Z")))
+        self.assertFalse(index.is_processed("comment", make_comment(2)))
+
+    def test_errors_are_retried(self):
+        """Comments whose extraction failed are not considered processed."""
+        index = CommentIndex(self.index_file)
+        index.record("comment", make_comment(1), ERROR)
+        self.assertFalse(index.is_processed("comment", make_comment(1)))
+
+    def test_needs_retry(self):
+        """Only comments the index knows as failed or edited since need a retry."""
+        index = CommentIndex(self.index_file)
+        index.record("comment", make_comment(1), ERROR)
+        index.record("comment", make_comment(2), POEM)
+
+        self.assertTrue(index.needs_retry("comment", make_comment(1)))
+        self.assertFalse(index.needs_retry("comment", make_comment(2)))
+        self.assertTrue(index.needs_retry("comment", make_comment(2, "2025-05-02T00:00:00Z")))
+        self.assertFalse(index.needs_retry("comment", make_comment(3)))
+
+    def test_save_and_reload(self):
+        """Recorded comments are loaded by the next run; an untouched index is not written."""
+        index = CommentIndex(self.index_file)
+        index.save()
+        self.assertFalse(os.path.exists(self.index_file))
+
+        index.record("comment", make_comment(1), POEM)
+        index.save()
+        self.assertTrue(CommentIndex(self.index_file).is_processed("comment", make_comment(1)))
+
+    def test_invalid_index_file(self):
+        """An unreadable index file is ignored."""
+        with open(self.index_file, 'w', encoding='utf-8') as f:
+            f.write("{not json")
+        self.assertFalse(CommentIndex(self.index_file).is_processed("comment", make_comment(1)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.crawl_state import CrawlState
+
+class TestCrawlState(unittest.TestCase):
+
+    def setUp(self):
+        """Point the crawl state at a temporary file."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.temp_dir.name, "crawl-state.json")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_empty_on_first_run(self):
+        """A missing state file yields empty watermarks and is not written."""
+        state = CrawlState(self.state_file)
+        self.assertEqual(state.get_watermark("owner/repo"), {})
+        state.save()
+        self.assertFalse(os.path.exists(self.state_file))
+
+    def test_watermarks_only_move_forward(self):
+        """Older values never replace a newer watermark."""
+        state = CrawlState(self.state_file)
+        state.advance_watermark("owner/repo", pr_updated_at="2025-05-02T00:00:00Z", issue_comment_id=20)
+        state.advance_watermark("owner/repo", pr_updated_at="2025-05-01T00:00:00Z", issue_comment_id=10, review_comment_id=5)
+
+        self.assertEqual(state.get_watermark("owner/repo"), {
+            "pr_updated_at": "2025-05-02T00:00:00Z",
+            "issue_comment_id": 20,
+            "review_comment_id": 5,
+        })
+
+    def test_save_and_reload(self):
+        """Saved watermarks are loaded by the next run."""
+        state = CrawlState(self.state_file)
+        state.advance_watermark("owner/repo", pr_updated_at="2025-05-02T00:00:00Z")
+        state.save()
+
+        reloaded = CrawlState(self.state_file)
+        self.assertEqual(reloaded.get_watermark("owner/repo"), {"pr_updated_at": "2025-05-02T00:00:00Z"})
+
+    def test_invalid_state_file(self):
+        """An unreadable state file is ignored."""
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            f.write("{not json")
+        self.assertEqual(CrawlState(self.state_file).get_watermark("owner/repo"), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import Config
+from src.error_handler import ErrorHandler
+
+class TestRateLimitCooldowns(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = ErrorHandler(Config.get_initial_stats())
+
+    @patch('src.error_handler.time.sleep')
+    @patch('src.error_handler.time.monotonic', return_value=100.0)
+    def test_rate_limit_sets_deadline_without_sleeping(self, mock_monotonic, mock_sleep):
+        """A rate limit marks the model unavailable for its backoff instead of sleeping."""
+        rate_limited, wait_time = self.handler.handle_litellm_error(Exception("429: please wait 3 seconds"), "some/model")
+
+        self.assertTrue(rate_limited)
+        self.assertEqual(wait_time, 3)
+        mock_sleep.assert_not_called()
+        self.assertEqual(self.handler.cooldown_remaining("some/model"), 3)
+        self.assertEqual(self.handler.cooldown_remaining("other/model"), 0)
+
+        mock_monotonic.return_value = 102.0
+        self.assertEqual(self.handler.cooldown_remaining("some/model"), 1)
+        mock_monotonic.return_value = 104.0
+        self.assertEqual(self.handler.cooldown_remaining("some/model"), 0)
+
+    @patch('src.error_handler.time.monotonic', return_value=100.0)
+    def test_backoff_follows_consecutive_rate_limits(self, mock_monotonic):
+        """The backoff doubles for rate limits hit in a row, ignores calls failing into a running cooldown and resets on success."""
+        error = Exception("429 rate limit exceeded")
+        for _ in range(10):
+            self.handler.handle_litellm_error(error, "some/model")
+        self.assertEqual(self.handler.cooldown_remaining("some/model"), 5)
+
+        mock_monotonic.return_value = 105.0
+        self.assertEqual(self.handler.handle_litellm_error(error, "some/model"), (True, 10))
+
+        self.handler.record_llm_success("some/model")
+        mock_monotonic.return_value = 200.0
+        self.assertEqual(self.handler.handle_litellm_error(error, "some/model"), (True, 5))
+
+    def test_other_errors_leave_the_model_available(self):
+        """Errors that are not rate limits set no cooldown."""
+        self.assertEqual(self.handler.handle_litellm_error(Exception("connection refused"), "some/model"), (False, 0))
+        self.assertEqual(self.handler.cooldown_remaining("some/model"), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Adjust sys.path to include the project root and utils directories
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+from fake_github_server import start_server, BOT_LOGIN
+from src.github_client import GitHubClient
+from src.rate_limiter import RateLimiter
+from src.response_cache import ResponseCache
+
+class TestFakeGitHubServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Start a small fake GitHub server."""
+        cls.server = start_server(repos=2, prs=120, comments=3, bot_ratio=0.5, rate_limit=1000)
+        cls.base = cls.server.url
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the fake GitHub server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Create a client that does not pace requests."""
+        self.client = GitHubClient(rate_limiter=RateLimiter(max_rates={"core": 1000.0, "search": 1000.0}))
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_pull_requests_paginate(self):
+        """PR listings follow Link headers across pages, newest first."""
+        prs = list(self.client.paginate(f"{self.base}/repos/synthetic/repo-0/pulls", params={"state": "all", "per_page": 50}))
+        self.assertEqual([pr["number"] for pr in prs], list(range(120, 0, -1)))
+
+    def test_search_finds_bot_pull_requests(self):
+        """Issue search returns the PRs the bot commented on, and only those."""
+        items = list(self.client.paginate(f"{self.base}/search/issues", params={"q": f"repo:synthetic/repo-1 type:pr commenter:{BOT_LOGIN}"}))
+        self.assertTrue(items)
+        for item in items[:5]:
+            comments = self.client.get(f"{self.base}/repos/synthetic/repo-1/issues/{item['number']}/comments").json()
+            self.assertEqual(comments[0]["user"]["login"], BOT_LOGIN)
+        repos = self.client.get(f"{self.base}/search/repositories", params={"q": "gemini"}).json()
+        self.assertEqual([repo["full_name"] for repo in repos["items"]], ["synthetic/repo-0", "synthetic/repo-1"])
+
+    def test_comment_ids_grow_with_time(self):
+        """Comment ids increase with their timestamps across the whole repository."""
+        comments = list(self.client.paginate(f"{self.base}/repos/synthetic/repo-0/issues/comments", params={"per_page": 100}))
+        self.assertEqual(len(comments), len({comment["id"] for comment in comments}))
+        self.assertEqual(sorted(comments, key=lambda c: c["id"]), sorted(comments, key=lambda c: c["updated_at"]))
+
+    def test_etag_and_rate_limit_headers(self):
+        """Responses carry rate-limit headers, and revalidated responses are served from cache."""
+        import tempfile
+        url = f"{self.base}/repos/synthetic/repo-0/pulls/1/reviews"
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.client.cache = ResponseCache(cache_dir, 1024 * 1024)
+            first = self.client.get(url)
+            second = self.client.get(url)
+        self.assertEqual(first.headers["X-RateLimit-Resource"], "core")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(self.client.cache_hits, 1)
+
+    def test_quota_exhaustion(self):
+        """Requests beyond the quota are rejected with a rate-limit 403."""
+        headers = {"Authorization": "token exhausted"}
+        with patch.object(self.server.rate_limits, 'limits', {"core": 1, "search": 1}):
+            self.assertEqual(self.client.session.get(f"{self.base}/repos/synthetic/repo-0/pulls", headers=headers).status_code, 200)
+            response = self.client.session.get(f"{self.base}/repos/synthetic/repo-0/pulls", headers=headers)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.headers["X-RateLimit-Remaining"], "0")
+
+if __name__ == '__main__':
+    unittest.main()
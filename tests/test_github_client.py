@@ -0,0 +1,146 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch, MagicMock
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+from src.github_client import GitHubClient
+from src.response_cache import ResponseCache
+from src.config import Config
+
+def make_response(status_code, body=b"", headers=None):
+    """Build a requests.Response with the given status, body and headers."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers.update(headers or {})
+    response.url = "https://api.github.com/repos/o/r/pulls?page=1"
+    return response
+
+class TestGitHubClient(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a client with a fake token."""
+        self.client = GitHubClient(token="fake_github_token", pool_size=4, timeout=7)
+
+    def tearDown(self):
+        """Close the client session."""
+        self.client.close()
+
+    def test_session_headers(self):
+        """The session negotiates compression and authenticates with the given token."""
+        headers = self.client.session.headers
+        self.assertEqual(headers["Authorization"], "token fake_github_token")
+        self.assertEqual(headers["Accept"], "application/vnd.github.v3+json")
+        self.assertIn("gzip", headers["Accept-Encoding"])
+
+    def test_pool_size(self):
+        """The HTTPS adapter is sized to the configured pool."""
+        adapter = self.client.session.get_adapter("https://api.github.com")
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+        self.client.set_pool_size(12)
+        adapter = self.client.session.get_adapter("https://api.github.com")
+        self.assertEqual(adapter._pool_maxsize, 12)
+        self.assertEqual(self.client.pool_size, 12)
+
+    def test_get_uses_default_timeout(self):
+        """Requests go through the pooled session with the client timeout."""
+        with patch.object(self.client.session, 'get', return_value=MagicMock(status_code=200)) as mock_get:
+            self.client.get(f"{Config.GITHUB_API_URL}/rate_limit")
+            mock_get.assert_called_once_with(
+                f"{Config.GITHUB_API_URL}/rate_limit", params=None, headers=None, timeout=7
+            )
+
+    def test_get_timeout_override(self):
+        """A per-request timeout overrides the client default."""
+        with patch.object(self.client.session, 'get', return_value=MagicMock(status_code=200)) as mock_get:
+            self.client.get("https://api.github.com/rate_limit", timeout=2)
+            self.assertEqual(mock_get.call_args.kwargs["timeout"], 2)
+
+class TestGitHubClientPaginate(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a client with a fake token."""
+        self.client = GitHubClient(token="fake_github_token")
+
+    def tearDown(self):
+        """Close the client session."""
+        self.client.close()
+
+    def test_follows_link_header_lazily(self):
+        """Pages are fetched only as items are consumed, following the next link."""
+        first = make_response(200, b'[1, 2]', {"Link": '<https://api.github.com/items?page=2>; rel="next"'})
+        second = make_response(200, b'[3]')
+        with patch.object(self.client.session, 'get', side_effect=[first, second]) as mock_get:
+            items = self.client.paginate("https://api.github.com/items", params={"per_page": 2})
+            self.assertEqual(next(items), 1)
+            self.assertEqual(mock_get.call_count, 1)
+            self.assertEqual(list(items), [2, 3])
+
+        self.assertEqual(mock_get.call_args_list[1].args[0], "https://api.github.com/items?page=2")
+        self.assertIsNone(mock_get.call_args_list[1].kwargs["params"])
+
+    def test_search_items(self):
+        """Search responses yield the entries of `items`."""
+        with patch.object(self.client.session, 'get', return_value=make_response(200, b'{"total_count": 1, "items": [{"number": 7}]}')):
+            self.assertEqual(list(self.client.paginate("https://api.github.com/search/issues")), [{"number": 7}])
+
+    def test_error_page_raises(self):
+        """A failed page raises an HTTPError."""
+        with patch.object(self.client.session, 'get', return_value=make_response(404, b'{}')):
+            with self.assertRaises(requests.HTTPError):
+                list(self.client.paginate("https://api.github.com/items"))
+
+class TestGitHubClientCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a client backed by a temporary response cache."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.client = GitHubClient(token="fake_github_token", cache=ResponseCache(self.temp_dir.name, 1024 * 1024))
+        self.url = "https://api.github.com/repos/o/r/pulls"
+
+    def tearDown(self):
+        """Close the client and remove the cache directory."""
+        self.client.close()
+        self.temp_dir.cleanup()
+
+    def test_not_modified_served_from_cache(self):
+        """A 304 answer to a conditional request returns the cached body."""
+        first = make_response(200, b'[{"number": 1}]', {"ETag": '"v1"', "Link": '<https://api.github.com/next>; rel="next"'})
+        second = make_response(304, headers={"ETag": '"v1"'})
+        with patch.object(self.client.session, 'get', side_effect=[first, second]) as mock_get:
+            self.client.get(self.url, params={"page": 1})
+            response = self.client.get(self.url, params={"page": 1})
+
+        self.assertEqual(mock_get.call_args_list[0].kwargs["headers"], {})
+        self.assertEqual(mock_get.call_args_list[1].kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{"number": 1}])
+        self.assertEqual(response.links["next"]["url"], "https://api.github.com/next")
+        self.assertEqual(self.client.cache_hits, 1)
+
+    def test_changed_response_replaces_cache_entry(self):
+        """A fresh 200 answer is returned as-is and updates the stored validators."""
+        first = make_response(200, b'[]', {"ETag": '"v1"'})
+        second = make_response(200, b'[{"number": 2}]', {"ETag": '"v2"'})
+        with patch.object(self.client.session, 'get', side_effect=[first, second]):
+            self.client.get(self.url)
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.json(), [{"number": 2}])
+        self.assertEqual(self.client.cache.get(self.url)["etag"], '"v2"')
+        self.assertEqual(self.client.cache_hits, 0)
+
+    def test_errors_are_not_cached(self):
+        """Error responses are never stored."""
+        with patch.object(self.client.session, 'get', return_value=make_response(404, b'{}', {"ETag": '"x"'})):
+            self.client.get(self.url)
+        self.assertIsNone(self.client.cache.get(self.url))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.github_graphql import list_pull_requests_with_comments
+
+def comment_node(database_id, login, typename="User", body="text"):
+    """Build a GraphQL comment node."""
+    return {
+        "databaseId": database_id,
+        "body": body,
+        "url": f"https://github.com/o/r/pull/1#issuecomment-{database_id}",
+        "updatedAt": "2025-05-01T00:00:00Z",
+        "author": {"login": login, "__typename": typename},
+    }
+
+def pr_node(number, updated_at):
+    """Build a GraphQL pull request node with one Gemini comment and review."""
+    return {
+        "number": number,
+        "updatedAt": updated_at,
+        "comments": {
+            "pageInfo": {"hasNextPage": False},
+            "nodes": [comment_node(number * 10, "gemini-code-assist", "Bot", body=f"poem {number}")],
+        },
+        "reviews": {
+            "pageInfo": {"hasNextPage": False},
+            "nodes": [{
+                "databaseId": number * 100,
+                "author": {"login": "gemini-code-assist", "__typename": "Bot"},
+                "comments": {"pageInfo": {"hasNextPage": False}, "nodes": [comment_node(number * 100 + 1, "octocat")]},
+            }],
+        },
+    }
+
+def graphql_response(nodes, has_next_page=False, end_cursor=None):
+    """Build a successful GraphQL response for a page of PRs."""
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"data": {"repository": {"pullRequests": {
+        "pageInfo": {"hasNextPage": has_next_page, "endCursor": end_cursor},
+        "nodes": nodes,
+    }}}}
+    return response
+
+class TestListPullRequestsWithComments(unittest.TestCase):
+
+    def test_converts_to_rest_shape(self):
+        """Comments and reviews come back in the REST dictionary shape, with bot logins suffixed."""
+        client = MagicMock()
+        client.post.return_value = graphql_response([pr_node(1, "2025-05-01T00:00:00Z")])
+
+        prs, complete = list_pull_requests_with_comments(client, "o", "r")
+
+        self.assertTrue(complete)
+        self.assertEqual(prs[0]["number"], 1)
+        self.assertEqual(prs[0]["comments"][0], {
+            "id": 10,
+            "body": "poem 1",
+            "html_url": "https://github.com/o/r/pull/1#issuecomment-10",
+            "updated_at": "2025-05-01T00:00:00Z",
+            "user": {"login": "gemini-code-assist[bot]"},
+        })
+        self.assertEqual(prs[0]["reviews"][0]["user"]["login"], "gemini-code-assist[bot]")
+        self.assertEqual(prs[0]["reviews"][0]["comments"][0]["user"]["login"], "octocat")
+
+    def test_truncated_connections_are_flagged(self):
+        """PRs with more comments, reviews or review comments than one page are marked truncated."""
+        nodes = [pr_node(n, "2025-05-01T00:00:00Z") for n in (3, 2, 1)]
+        nodes[0]["comments"]["pageInfo"]["hasNextPage"] = True
+        nodes[1]["reviews"]["nodes"][0]["comments"]["pageInfo"]["hasNextPage"] = True
+        client = MagicMock()
+        client.post.return_value = graphql_response(nodes)
+
+        prs, complete = list_pull_requests_with_comments(client, "o", "r")
+
+        self.assertTrue(complete)
+        self.assertEqual([pr["truncated"] for pr in prs], [True, True, False])
+
+    def test_follows_cursor_and_stops_at_watermark(self):
+        """Pages are followed by cursor until a PR older than the watermark appears."""
+        client = MagicMock()
+        client.post.side_effect = [
+            graphql_response([pr_node(3, "2025-05-03T00:00:00Z")], has_next_page=True, end_cursor="c1"),
+            graphql_response([pr_node(2, "2025-05-02T00:00:00Z"), pr_node(1, "2025-05-01T00:00:00Z")], has_next_page=True, end_cursor="c2"),
+        ]
+
+        prs, complete = list_pull_requests_with_comments(client, "o", "r", updated_after="2025-05-01T12:00:00Z")
+
+        self.assertTrue(complete)
+        self.assertEqual([pr["number"] for pr in prs], [3, 2])
+        second_variables = client.post.call_args_list[1].kwargs["json"]["variables"]
+        self.assertEqual(second_variables["cursor"], "c1")
+        self.assertEqual(second_variables["orderField"], "UPDATED_AT")
+
+    def test_max_prs_marks_incomplete(self):
+        """Stopping at max_prs with more PRs left reports an incomplete listing."""
+        client = MagicMock()
+        client.post.return_value = graphql_response([pr_node(3, "2025-05-03T00:00:00Z"), pr_node(2, "2025-05-02T00:00:00Z")], has_next_page=True, end_cursor="c1")
+
+        prs, complete = list_pull_requests_with_comments(client, "o", "r", max_prs=1)
+
+        self.assertFalse(complete)
+        self.assertEqual([pr["number"] for pr in prs], [3])
+        self.assertEqual(client.post.call_args.kwargs["json"]["variables"]["pageSize"], 2)
+
+    def test_graphql_errors(self):
+        """GraphQL errors stop listing and report an incomplete listing."""
+        client = MagicMock()
+        client.post.return_value = MagicMock(status_code=200, json=MagicMock(return_value={"errors": [{"message": "boom"}]}))
+
+        prs, complete = list_pull_requests_with_comments(client, "o", "r")
+
+        self.assertEqual(prs, [])
+        self.assertFalse(complete)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ from unittest.mock import patch, MagicMock
 # Adjust sys.path to include the src directory
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.llm_client_template import LiteLLMClient
+from src.llm_client_template import LiteLLMClient, get_client_for_model, list_available_clients
 from src.config import Config # Needed for DEFAULT_MODEL if used by LiteLLMClient directly
 
 # Mock litellm.completion response structure
@@ -114,5 +114,84 @@ class TestLiteLLMClient(unittest.TestCase):
         actual_response = self.client.extract_poem(prompt)
         self.assertEqual(actual_response, "NO_POEM")
 
+    def test_cached_completion_skips_request(self):
+        """A prompt already answered by the same model is served from the response cache."""
+        import tempfile
+        from src.response_cache import ResponseCache
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            patch.object(LiteLLMClient, 'response_cache', ResponseCache(cache_dir, 1024 * 1024)).start()
+            patch.object(LiteLLMClient, 'cache_hits', 0).start()
+            patch.object(LiteLLMClient, 'cache_misses', 0).start()
+            self.mock_litellm_completion.return_value = MockLiteLLMResponse(content="A cached poem")
+
+            first = self.client.extract_poem("Extract a poem.")
+            second = LiteLLMClient(model_name="test_model/test_variant").extract_poem("Extract a poem.")
+            LiteLLMClient(model_name="other/model").extract_poem("Extract a poem.")
+
+            self.assertEqual((first, second), ("A cached poem", "A cached poem"))
+            self.assertEqual(self.mock_litellm_completion.call_count, 2)
+            self.assertEqual((LiteLLMClient.cache_hits, LiteLLMClient.cache_misses), (1, 2))
+
+    def test_failed_completion_is_not_cached(self):
+        """Errors are not cached, so the next call asks the model again."""
+        import tempfile
+        from src.response_cache import ResponseCache
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            patch.object(LiteLLMClient, 'response_cache', ResponseCache(cache_dir, 1024 * 1024)).start()
+            self.mock_litellm_completion.side_effect = [Exception("Simulated API Error"), MockLiteLLMResponse(content="A poem")]
+
+            self.assertEqual(self.client.extract_poem("Extract a poem."), "NO_POEM")
+            self.assertIsInstance(self.client.last_error, Exception)
+            self.assertEqual(self.client.extract_poem("Extract a poem."), "A poem")
+            self.assertIsNone(self.client.last_error)
+
+    def test_aextract_poem(self):
+        """The async extraction awaits litellm.acompletion and raises its errors."""
+        import asyncio
+
+        with patch('litellm.acompletion', return_value=MockLiteLLMResponse(content=" An async poem ")) as mock_acompletion:
+            self.assertEqual(asyncio.run(self.client.aextract_poem("Extract a poem.")), "An async poem")
+        self.assertEqual(mock_acompletion.call_args.kwargs["model"], "test_model/test_variant")
+
+        with patch('litellm.acompletion', side_effect=Exception("Simulated API Error")):
+            with self.assertRaises(Exception):
+                asyncio.run(self.client.aextract_poem("Extract a poem."))
+
+class TestClientRegistry(unittest.TestCase):
+
+    def setUp(self):
+        """Start from an empty registry."""
+        patch.dict(os.environ, {"GITHUB_TOKEN": "fake_github_token"}).start()
+        patch.dict('src.llm_client_template._clients', clear=True).start()
+
+    def tearDown(self):
+        """Restore the registry."""
+        patch.stopall()
+
+    def test_one_client_per_model(self):
+        """Every call for a model gets the same client, from any thread."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(get_client_for_model, ["a/model"] * 16 + ["b/model"] * 16))
+
+        self.assertEqual(len({id(client) for client in clients}), 2)
+        self.assertEqual(clients[0].model_name, "a/model")
+        self.assertEqual(list_available_clients(), ["a/model", "b/model"])
+
+    def test_last_error_is_per_thread(self):
+        """A failure in one thread does not show up as the last error of another."""
+        import threading
+
+        client = get_client_for_model("a/model")
+        with patch('litellm.completion', side_effect=Exception("Simulated API Error")):
+            worker = threading.Thread(target=client.extract_poem, args=("Extract a poem.",))
+            worker.start()
+            worker.join()
+
+        self.assertIsNone(client.last_error)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+import asyncio
+import threading
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.loop_thread import LoopThread
+
+class TestLoopThread(unittest.TestCase):
+
+    def test_callers_in_several_threads_share_one_loop(self):
+        """Coroutines submitted from different threads all run on the same long-lived loop."""
+        loop_thread = LoopThread()
+        loops = []
+
+        async def running_loop():
+            await asyncio.sleep(0)
+            return asyncio.get_running_loop()
+
+        def worker():
+            loops.append(loop_thread.run(running_loop()))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        loops.append(loop_thread.run(running_loop()))
+
+        self.assertEqual(len(loops), 5)
+        self.assertEqual(len(set(map(id, loops))), 1)
+        self.assertIs(loops[0], loop_thread.loop)
+        self.assertFalse(loops[0].is_closed())
+
+    def test_errors_are_raised_in_the_caller(self):
+        """An exception of the coroutine is raised by run()."""
+        loop_thread = LoopThread()
+
+        async def failing():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            loop_thread.run(failing())
+
+    def test_run_from_the_loop_thread_is_refused(self):
+        """Waiting on the loop from its own thread would deadlock, so it raises instead."""
+        loop_thread = LoopThread()
+
+        async def nested():
+            return loop_thread.run(asyncio.sleep(0))
+
+        with self.assertRaises(RuntimeError):
+            loop_thread.run(nested())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.model_router import ModelRouter, CLOSED, OPEN, HALF_OPEN
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestModelRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.router = ModelRouter(["a", "b", "c"], window=4, failure_threshold=0.5, min_calls=2,
+                                  cooldown_seconds=30, clock=self.clock)
+
+    def test_unmeasured_models_first_then_fastest(self):
+        """Every model is tried once in order, then the lowest mean latency wins."""
+        self.assertEqual(self.router.choose(), "a")
+        self.router.record_success("a", 2.0)
+        self.assertEqual(self.router.choose(), "b")
+        self.router.record_success("b", 0.5)
+        self.assertEqual(self.router.choose(), "c")
+        self.router.record_success("c", 1.0)
+        self.assertEqual(self.router.choose(), "b")
+        self.assertEqual(self.router.choose(exclude={"b"}), "c")
+
+    def test_failures_open_the_circuit(self):
+        """A model failing too often is left out until its cooldown is over."""
+        self.router.record_success("a", 0.1)
+        self.router.record_success("b", 1.0)
+        self.router.record_success("c", 2.0)
+        self.router.record_failure("a", 0.1)
+        self.assertEqual(self.router.snapshot()["a"]["state"], OPEN)
+        self.assertEqual(self.router.choose(), "b")
+        self.assertIsNone(self.router.choose(exclude={"b", "c"}))
+
+    def test_half_open_trial(self):
+        """After the cooldown a single trial call is let through; its outcome closes or reopens the circuit."""
+        self.router.record_failure("a", 0.1)
+        self.router.record_failure("a", 0.1)
+        self.clock.now = 31
+        self.assertEqual(self.router.choose(exclude={"b", "c"}), "a")
+        self.assertEqual(self.router.snapshot()["a"]["state"], HALF_OPEN)
+        self.assertIsNone(self.router.choose(exclude={"b", "c"}))
+
+        self.router.record_failure("a", 0.1)
+        self.assertEqual(self.router.snapshot()["a"]["state"], OPEN)
+        self.clock.now = 62
+        self.assertEqual(self.router.choose(exclude={"b", "c"}), "a")
+        self.router.record_success("a", 0.2)
+        snapshot = self.router.snapshot()["a"]
+        self.assertEqual((snapshot["state"], snapshot["error_rate"]), (CLOSED, 0.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.poem_journal import PoemJournal
+
+def make_poem(pr_number):
+    """Build a poem entry for a PR."""
+    return {"poem": ["line"], "link": f"https://github.com/o/r/pull/{pr_number}#issuecomment-1", "pr_number": pr_number}
+
+class TestPoemJournal(unittest.TestCase):
+
+    def setUp(self):
+        """Point the journal at a temporary file."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal_file = os.path.join(self.temp_dir.name, "poem-journal.jsonl")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_replay_keeps_completed_prs(self):
+        """Poems of completed PRs are replayed; a PR without its marker is processed again."""
+        journal = PoemJournal(self.journal_file)
+        journal.append_poem("o/r", 2, make_poem(2))
+        journal.mark_pr_done("o/r", 2)
+        journal.mark_pr_done("o/r", 1)
+        journal.append_poem("o/r", 3, make_poem(3))
+
+        resumed = PoemJournal(self.journal_file)
+        self.assertEqual(resumed.replay(), [make_poem(2)])
+        self.assertTrue(resumed.is_pr_done("o/r", 1))
+        self.assertTrue(resumed.is_pr_done("o/r", 2))
+        self.assertFalse(resumed.is_pr_done("o/r", 3))
+        self.assertFalse(resumed.is_pr_done("o/other", 2))
+
+    def test_truncated_record_is_ignored(self):
+        """A record cut short by a crash does not stop the replay."""
+        journal = PoemJournal(self.journal_file)
+        journal.append_poem("o/r", 1, make_poem(1))
+        journal.mark_pr_done("o/r", 1)
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"type": "poem", "repos')
+
+        self.assertEqual(PoemJournal(self.journal_file).replay(), [make_poem(1)])
+
+    def test_clear(self):
+        """Clearing removes the journal file."""
+        journal = PoemJournal(self.journal_file)
+        self.assertFalse(journal.exists())
+        self.assertEqual(journal.replay(), [])
+        journal.mark_pr_done("o/r", 1)
+        self.assertTrue(journal.exists())
+
+        journal.clear()
+        self.assertFalse(journal.exists())
+        self.assertFalse(journal.is_pr_done("o/r", 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.poem_scorer import score_poem_likelihood, PoemScorer
+
+SUMMARY_WITH_QUOTED_POEM = """## Summary of Changes
+
+Hello! I'm Gemini Code Assist. This pull request tidies up the module, removes dead code paths and adds tests.
+
+* **Parser**: handles nested blocks.
+* **Tests**: new cases for the parser.
+
+> Code flows, structure grows,
+> YAML defines the tools it knows.
+> Refactor's art,
+> a fresh new start,
+"""
+
+SUMMARY_WITH_PLAIN_POEM = """This PR adds a gitignore file, which keeps generated files out of the repository.
+
+A git ignore file,
+Keeps secrets safe and sound,
+Snapshots hidden now.
+"""
+
+SUMMARY_WITH_ITALIC_POEM = """Long summary line explaining what this pull request changes and why it matters.
+
+*Old features fade,*
+*Like leaves in autumn's breeze,*
+*Code base grows lean.*"""
+
+REVIEW_COMMENT = """![medium](https://www.gstatic.com/codereviewagent/medium-priority.svg)
+
+The function `load_config` reads the file on every call, which is wasteful when it is called in a loop. Consider caching the parsed configuration.
+
+```suggestion
+@functools.lru_cache
+def load_config(path):
+    with open(path) as f:
+        return json.load(f)
+```"""
+
+class TestPoemScorer(unittest.TestCase):
+
+    def test_poems_score_high(self):
+        """Quoted, italic and plain stanzas of short lines score above the default threshold."""
+        for body in (SUMMARY_WITH_QUOTED_POEM, SUMMARY_WITH_PLAIN_POEM, SUMMARY_WITH_ITALIC_POEM):
+            score, features = score_poem_likelihood(body)
+            self.assertGreaterEqual(score, 0.5, features)
+            self.assertTrue(features["stanza"])
+
+        _, features = score_poem_likelihood(SUMMARY_WITH_QUOTED_POEM)
+        self.assertEqual((features["run_length"], features["marked_ratio"]), (4, 1.0))
+
+    def test_review_comments_score_low(self):
+        """Prose and code review comments without short-line runs score zero."""
+        score, features = score_poem_likelihood(REVIEW_COMMENT)
+        self.assertEqual(score, 0.0)
+        self.assertGreater(features["code_ratio"], 0.5)
+        self.assertEqual(score_poem_likelihood("Consider renaming this.\n\nIt shadows a builtin.")[0], 0.0)
+        self.assertEqual(score_poem_likelihood("")[0], 0.0)
+
+    def test_code_lines_are_not_verse(self):
+        """Short lines inside code fences do not count as a poem."""
+        body = "Please apply:\n\n```python\nx = compute(a)\ny = compute(b)\nreturn x + y\n```"
+        self.assertEqual(score_poem_likelihood(body)[0], 0.0)
+
+    def test_gate_counts_decisions(self):
+        """The gate passes comments at or above its threshold and counts every decision."""
+        scorer = PoemScorer(threshold=0.3)
+        self.assertTrue(scorer.should_extract(SUMMARY_WITH_PLAIN_POEM))
+        self.assertFalse(scorer.should_extract(REVIEW_COMMENT))
+        self.assertEqual((scorer.passed, scorer.skipped), (1, 1))
+
+        self.assertTrue(PoemScorer(threshold=0).should_extract(REVIEW_COMMENT))
+
+if __name__ == '__main__':
+    unittest.main()
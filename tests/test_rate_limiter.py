@@ -0,0 +1,114 @@
+import unittest
+import os
+import sys
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+from src.rate_limiter import RateLimiter, get_resource_for_url
+
+class FakeClock:
+    """Clock whose sleep advances time instantly."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def wall(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+def make_response(status_code=200, headers=None, body=b"[]"):
+    """Build a requests.Response with the given status and headers."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a limiter driven by a fake clock."""
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(
+            max_rates={"core": 2.0, "search": 0.5},
+            reserve=5,
+            clock=self.clock.monotonic,
+            wall_clock=self.clock.wall,
+            sleep=self.clock.sleep
+        )
+
+    def test_resource_for_url(self):
+        """Search and GraphQL URLs are counted against their own resources."""
+        self.assertEqual(get_resource_for_url("https://api.github.com/search/issues?q=x"), "search")
+        self.assertEqual(get_resource_for_url("https://api.github.com/graphql"), "graphql")
+        self.assertEqual(get_resource_for_url("https://api.github.com/repos/o/r/pulls"), "core")
+
+    def test_paces_at_max_rate(self):
+        """Requests beyond the burst are spaced at the configured rate."""
+        for _ in range(4):
+            self.limiter.acquire("core")
+        self.assertAlmostEqual(sum(self.clock.slept), 1.0)
+
+    def test_waits_for_reset_when_quota_low(self):
+        """Once the remaining quota reaches the reserve, requests wait for the reset."""
+        response = make_response(headers={
+            "X-RateLimit-Remaining": "3",
+            "X-RateLimit-Reset": str(int(self.clock.now) + 120),
+            "X-RateLimit-Limit": "5000",
+        })
+        self.assertIsNone(self.limiter.update("core", response))
+        self.assertEqual(self.limiter.get_remaining("core"), 3)
+        self.assertAlmostEqual(self.limiter.get_wait_time("core"), 121)
+
+        self.limiter.acquire("core")
+        self.assertAlmostEqual(sum(self.clock.slept), 121)
+
+    def test_retry_after(self):
+        """A secondary limit with Retry-After is retried after the requested delay."""
+        response = make_response(403, {"Retry-After": "30"}, b'{"message": "You have exceeded a secondary rate limit"}')
+        self.assertEqual(self.limiter.update("core", response), 30)
+
+    def test_secondary_limit_without_headers_backs_off(self):
+        """A secondary limit without guidance backs off exponentially."""
+        response = make_response(403, body=b'{"message": "You have exceeded a secondary rate limit"}')
+        self.assertEqual(self.limiter.update("core", response, attempt=1), 120)
+
+    def test_forbidden_is_not_retried(self):
+        """A 403 unrelated to rate limits is returned to the caller."""
+        response = make_response(403, {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "0"}, b'{"message": "Resource not accessible"}')
+        self.assertIsNone(self.limiter.update("core", response))
+
+    def test_resource_header_overrides_url(self):
+        """The X-RateLimit-Resource header decides which bucket is updated."""
+        response = make_response(headers={"X-RateLimit-Resource": "search", "X-RateLimit-Remaining": "20"})
+        self.limiter.update("core", response)
+        self.assertEqual(self.limiter.get_remaining("search"), 20)
+        self.assertIsNone(self.limiter.get_remaining("core"))
+
+    def test_tokens_are_tracked_separately(self):
+        """An exhausted token does not pause requests made with another token."""
+        response = make_response(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(self.clock.now) + 600)})
+        self.assertAlmostEqual(self.limiter.update("core", response, token_id=0), 601)
+
+        self.assertEqual(self.limiter.get_wait_time("core", token_id=1), 0)
+        self.limiter.acquire("core", token_id=1)
+        self.assertEqual(self.clock.slept, [])
+
+    def test_quota_forgotten_after_reset(self):
+        """A remaining quota whose reset time has passed is no longer reported."""
+        response = make_response(headers={"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": str(int(self.clock.now) + 10)})
+        self.limiter.update("core", response)
+        self.clock.now += 20
+        self.assertIsNone(self.limiter.get_remaining("core"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.response_cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary cache directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.temp_dir.name, max_size_bytes=1024)
+
+    def tearDown(self):
+        """Remove the temporary cache directory."""
+        self.temp_dir.cleanup()
+
+    def test_set_and_get(self):
+        """Stored entries can be read back, unknown keys miss."""
+        self.cache.set("https://api.github.com/a", {"etag": "\"abc\"", "body": "[]"})
+        self.assertEqual(self.cache.get("https://api.github.com/a"), {"etag": "\"abc\"", "body": "[]"})
+        self.assertIsNone(self.cache.get("https://api.github.com/b"))
+
+    def test_persists_across_instances(self):
+        """Entries survive reopening the cache directory."""
+        self.cache.set("key", {"body": "value"})
+        reopened = ResponseCache(self.temp_dir.name, max_size_bytes=1024)
+        self.assertEqual(reopened.get("key"), {"body": "value"})
+
+    def test_evicts_least_recently_used(self):
+        """Entries that were not read recently are evicted first when the cache is full."""
+        body = "x" * 300
+        self.cache.set("first", {"body": body})
+        self.cache.set("second", {"body": body})
+        # Make "first" the most recently used entry
+        old = time.time() - 60
+        os.utime(self.cache._path_for("second"), (old, old))
+        self.cache.get("first")
+
+        self.cache.set("third", {"body": body})
+        self.cache.set("fourth", {"body": body})
+
+        self.assertIsNone(self.cache.get("second"))
+        self.assertIsNotNone(self.cache.get("fourth"))
+        total = sum(os.path.getsize(path) for path in self.cache._entry_files())
+        self.assertLessEqual(total, 1024)
+
+    def test_clear(self):
+        """Clearing removes every entry."""
+        self.cache.set("key", {"body": "value"})
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("key"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,12 +31,22 @@ class TestGetNewFlowersScript(unittest.TestCase):
         patch('get_new_flowers.save_poems_to_json').start()
         patch('get_new_flowers.write_log_summary').start()
         patch('get_new_flowers.search_public_repos', return_value=[]).start() # if --search is not used, this might not be strictly needed
+        # main() installs the LLM response cache on the client class; restore it afterwards
+        patch.object(get_new_flowers.LiteLLMClient, 'response_cache', None).start()
+        patch.object(get_new_flowers.github_client, 'cache', None).start()
+        # Keep the run's state, index, journal and caches away from the real ones in the cwd
+        import tempfile
+        self.temp_dir = tempfile.TemporaryDirectory()
+        for name, file_name in (("CRAWL_STATE_FILE", "crawl-state.json"), ("COMMENT_INDEX_FILE", "comment-index.json"),
+                                ("POEM_JOURNAL_FILE", "poem-journal.jsonl"), ("HTTP_CACHE_DIR", "github"), ("LLM_CACHE_DIR", "llm")):
+            patch.object(Config, name, os.path.join(self.temp_dir.name, file_name)).start()
 
     def tearDown(self):
         """Clean up after each test."""
         sys.argv = self.original_argv
         self.env_patcher.stop()
         patch.stopall()
+        self.temp_dir.cleanup()
 
     def test_main_with_model_arg(self):
         """Test if main uses the model from --model argument."""
@@ -69,20 +79,772 @@ class TestGetNewFlowersScript(unittest.TestCase):
         self.assertEqual(args[1], 'testrepo')
         self.assertEqual(args[2], Config.DEFAULT_MODEL) # Key assertion: model_name_to_use is default
 
-    @patch('get_new_flowers.LiteLLMClient') # Mock the LiteLLMClient constructor
-    def test_extract_poem_uses_correct_model(self, MockLiteLLMClient):
-        """Test that extract_poem_from_comment instantiates LiteLLMClient with the correct model."""
+    def test_route_models_with_model_arg_keeps_the_default_model(self):
+        """--route-models --model X routes over X, the default model and the custom models, without duplicates."""
+        patch.object(get_new_flowers, 'model_router', None).start()
+        patch('get_new_flowers.load_custom_llm_models', return_value=["custom/one", "myprovider/mycoolmodel", Config.DEFAULT_MODEL]).start()
+        sys.argv = ['get_new_flowers.py', '--owner', 'testowner', '--repo', 'testrepo', '--route-models', '--model', 'myprovider/mycoolmodel']
+
+        get_new_flowers.main()
+
+        self.assertEqual(get_new_flowers.model_router.models, ["myprovider/mycoolmodel", Config.DEFAULT_MODEL, "custom/one"])
+
+    @patch('get_new_flowers.get_client_for_model') # Mock the shared client registry
+    def test_extract_poem_uses_correct_model(self, mock_get_client):
+        """Test that extract_poem_from_comment asks the client registry for the correct model."""
         # This test is more focused on extract_poem_from_comment, but useful to ensure model propagation
-        mock_instance = MockLiteLLMClient.return_value
+        mock_instance = mock_get_client.return_value
         mock_instance.extract_poem.return_value = "A mock poem"
+        # Send the one-line test comment to the LLM regardless of its poem score
+        patch.object(get_new_flowers.poem_scorer, 'threshold', 0).start()
 
         test_model = "test/model"
         # Need to call extract_poem_from_comment directly or via a path that sets model_name_to_use
         # For simplicity, calling it directly here. In an integration test, this would be via main.
         get_new_flowers.extract_poem_from_comment("Some comment body", model_name_to_use=test_model)
 
-        MockLiteLLMClient.assert_called_once_with(model_name=test_model)
+        mock_get_client.assert_called_once_with(test_model)
         mock_instance.extract_poem.assert_called_once()
 
+class TestFetchGeminiComments(unittest.TestCase):
+
+    def setUp(self):
+        """Mock the per-PR GitHub fetchers."""
+        def comments_for_pr(owner, repo, pr_number, failures=None):
+            return [
+                {"id": pr_number * 10, "user": {"login": "someone"}, "body": "LGTM"},
+                {"id": pr_number * 10 + 1, "user": {"login": "gemini-code-assist[bot]"}, "body": f"poem {pr_number}"},
+            ]
+
+        def reviews_for_pr(owner, repo, pr_number, failures=None):
+            return [{"id": pr_number * 100, "user": {"login": "gemini-code-assist[bot]"}}]
+
+        def comments_from_review(owner, repo, pr_number, review_id, failures=None):
+            return [{"id": review_id + 1, "user": {"login": "gemini-code-assist[bot]"}, "body": f"review {pr_number}"}]
+
+        patch('get_new_flowers.get_comments_for_pr', side_effect=comments_for_pr).start()
+        patch('get_new_flowers.get_reviews_for_pr', side_effect=reviews_for_pr).start()
+        self.mock_review_comments = patch('get_new_flowers.get_comments_from_review', side_effect=comments_from_review).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_results_follow_pr_order(self):
+        """Results are aligned with the requested PR numbers and only contain Gemini comments."""
+        pr_numbers = [5, 3, 9, 1]
+        results = get_new_flowers.fetch_gemini_comments("owner", "repo", pr_numbers, concurrency=4)
+
+        self.assertEqual(len(results), len(pr_numbers))
+        for pr_number, gemini_comments in zip(pr_numbers, results):
+            self.assertEqual(
+                [(comment["body"], comment_type) for comment, comment_type in gemini_comments],
+                [(f"poem {pr_number}", "comment"), (f"review {pr_number}", "review_comment")]
+            )
+        self.assertEqual(self.mock_review_comments.call_count, len(pr_numbers))
+
+    def test_failed_fetches_are_reported_per_pr(self):
+        """PRs with a failed request are reported so the caller can hold the watermark back."""
+        def reviews_for_pr(owner, repo, pr_number, failures=None):
+            if pr_number == 3:
+                failures.append("fetching reviews")
+            return []
+
+        patch('get_new_flowers.get_reviews_for_pr', side_effect=reviews_for_pr).start()
+        failed_prs = []
+
+        results = get_new_flowers.fetch_gemini_comments("owner", "repo", [5, 3, 1], failed_prs=failed_prs)
+
+        self.assertEqual(failed_prs, [3])
+        self.assertEqual(len(results), 3)
+
+    def test_no_prs(self):
+        """An empty PR list does not start the fetch engine."""
+        self.assertEqual(get_new_flowers.fetch_gemini_comments("owner", "repo", []), [])
+
+def make_page(items, next_url=None, status_code=200):
+    """Build a list endpoint response, optionally linking to a next page."""
+    response = get_new_flowers.requests.Response()
+    response.status_code = status_code
+    response._content = get_new_flowers.json.dumps(items).encode("utf-8")
+    if next_url:
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
+
+class TestIncrementalListing(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_listing_stops_at_watermark(self):
+        """PRs are listed by update time and listing stops once the watermark is passed."""
+        page = [
+            {"number": 3, "updated_at": "2025-05-03T00:00:00Z"},
+            {"number": 2, "updated_at": "2025-05-02T00:00:00Z"},
+            {"number": 1, "updated_at": "2025-05-01T00:00:00Z"},
+        ]
+        mock_get = patch('get_new_flowers.github_client.get', return_value=make_page(page, "https://api.github.com/next")).start()
+
+        prs, complete = get_new_flowers._list_pull_requests("owner", "repo", updated_after="2025-05-02T00:00:00Z")
+
+        self.assertEqual([pr["number"] for pr in prs], [3])
+        self.assertTrue(complete)
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args.kwargs["params"]["sort"], "updated")
+        self.assertEqual(mock_get.call_args.kwargs["params"]["direction"], "desc")
+
+    def test_listing_error_is_incomplete(self):
+        """A failed page marks the listing as incomplete."""
+        patch('get_new_flowers.github_client.get', return_value=make_page({}, status_code=500)).start()
+        prs, complete = get_new_flowers._list_pull_requests("owner", "repo")
+        self.assertEqual(prs, [])
+        self.assertFalse(complete)
+
+    def test_listing_stops_at_max_prs(self):
+        """No further pages are requested once max_prs PRs were listed."""
+        pages = [
+            make_page([{"number": n} for n in (9, 8, 7)], "https://api.github.com/page2"),
+            make_page([{"number": n} for n in (6, 5, 4)], "https://api.github.com/page3"),
+            make_page([{"number": n} for n in (3, 2, 1)]),
+        ]
+        mock_get = patch('get_new_flowers.github_client.get', side_effect=pages).start()
+
+        prs, complete = get_new_flowers._list_pull_requests("owner", "repo", max_prs=4)
+
+        self.assertEqual([pr["number"] for pr in prs], [9, 8, 7, 6])
+        self.assertFalse(complete)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args_list[0].kwargs["params"]["per_page"], 5)
+
+    def test_listing_exactly_max_prs_is_complete(self):
+        """A repository with exactly max_prs PRs is listed completely."""
+        patch('get_new_flowers.github_client.get', return_value=make_page([{"number": 2}, {"number": 1}])).start()
+        prs, complete = get_new_flowers._list_pull_requests("owner", "repo", max_prs=2)
+        self.assertEqual([pr["number"] for pr in prs], [2, 1])
+        self.assertTrue(complete)
+
+class TestListEndpointPagination(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_comments_follow_link_header(self):
+        """Comments are fetched 100 per page, following Link headers to the last page."""
+        pages = [
+            make_page([{"id": n} for n in range(100)], "https://api.github.com/repos/o/r/issues/1/comments?page=2"),
+            make_page([{"id": 100}]),
+        ]
+        mock_get = patch('get_new_flowers.github_client.get', side_effect=pages).start()
+
+        comments = get_new_flowers.get_comments_for_pr("o", "r", 1)
+
+        self.assertEqual(len(comments), 101)
+        self.assertEqual(mock_get.call_args_list[0].kwargs["params"], {"per_page": 100})
+        self.assertEqual(mock_get.call_args_list[1].args[0], "https://api.github.com/repos/o/r/issues/1/comments?page=2")
+
+    def test_failed_page_keeps_earlier_items(self):
+        """A failing page is reported and the items of earlier pages are kept."""
+        pages = [
+            make_page([{"id": 1}], "https://api.github.com/repos/o/r/pulls/1/reviews?page=2"),
+            make_page({}, status_code=502),
+        ]
+        patch('get_new_flowers.github_client.get', side_effect=pages).start()
+        mock_error = patch('get_new_flowers.error_handler.handle_api_error').start()
+
+        failures = []
+        reviews = get_new_flowers.get_reviews_for_pr("o", "r", 1, failures=failures)
+
+        self.assertEqual(reviews, [{"id": 1}])
+        mock_error.assert_called_once()
+        self.assertEqual(len(failures), 1)
+
+class TestBotPullRequestDiscovery(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_search_query_and_watermark(self):
+        """Discovery searches for PRs the bot commented on, updated after the watermark."""
+        items = [
+            {"number": 8, "updated_at": "2025-05-03T00:00:00Z"},
+            {"number": 5, "updated_at": "2025-05-02T00:00:00Z"},
+        ]
+        mock_paginate = patch('get_new_flowers.github_client.paginate', return_value=iter(items)).start()
+
+        prs, complete = get_new_flowers.discover_bot_pull_requests("o", "r", updated_after="2025-05-02T00:00:00Z")
+
+        self.assertTrue(complete)
+        self.assertEqual(prs, [{"number": 8, "updated_at": "2025-05-03T00:00:00Z"}])
+        args, kwargs = mock_paginate.call_args
+        self.assertEqual(args[0], Config.SEARCH_ISSUES_URL)
+        self.assertEqual(
+            kwargs["params"]["q"],
+            "repo:o/r type:pr commenter:gemini-code-assist[bot] updated:>2025-05-02T00:00:00Z"
+        )
+
+    def test_search_failure_is_incomplete(self):
+        """A failed search page marks discovery as incomplete."""
+        def failing_pages(*args, **kwargs):
+            raise get_new_flowers.requests.HTTPError("403")
+            yield
+        patch('get_new_flowers.github_client.paginate', side_effect=failing_pages).start()
+
+        prs, complete = get_new_flowers.discover_bot_pull_requests("o", "r")
+        self.assertEqual(prs, [])
+        self.assertFalse(complete)
+
+class TestBulkCommentIngestion(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_groups_gemini_comments_by_pr(self):
+        """Repository-wide comments are grouped by PR, skipping plain issues."""
+        gemini = {"login": "gemini-code-assist[bot]"}
+        issue_comments = [
+            {"id": 12, "user": gemini, "body": "b", "updated_at": "2025-05-03T00:00:00Z",
+             "html_url": "https://github.com/o/r/pull/2#issuecomment-12", "issue_url": "https://api.github.com/repos/o/r/issues/2"},
+            {"id": 11, "user": {"login": "octocat"}, "body": "a", "updated_at": "2025-05-02T00:00:00Z",
+             "html_url": "https://github.com/o/r/pull/1#issuecomment-11", "issue_url": "https://api.github.com/repos/o/r/issues/1"},
+            {"id": 10, "user": gemini, "body": "issue", "updated_at": "2025-05-04T00:00:00Z",
+             "html_url": "https://github.com/o/r/issues/3#issuecomment-10", "issue_url": "https://api.github.com/repos/o/r/issues/3"},
+        ]
+        review_comments = [
+            {"id": 21, "user": gemini, "body": "c", "updated_at": "2025-05-01T00:00:00Z",
+             "html_url": "https://github.com/o/r/pull/2#discussion_r21", "pull_request_url": "https://api.github.com/repos/o/r/pulls/2"},
+        ]
+        mock_paginate = patch('get_new_flowers.github_client.paginate', side_effect=[iter(issue_comments), iter(review_comments)]).start()
+
+        prs, complete = get_new_flowers.fetch_gemini_comments_in_bulk("o", "r", since="2025-04-01T00:00:00Z")
+
+        self.assertTrue(complete)
+        self.assertEqual([pr["number"] for pr in prs], [2, 1])
+        self.assertEqual(
+            [(comment["id"], comment_type) for comment, comment_type in prs[0]["gemini_comments"]],
+            [(12, "comment"), (21, "review_comment")]
+        )
+        self.assertEqual(prs[0]["updated_at"], "2025-05-03T00:00:00Z")
+        self.assertEqual(prs[1]["gemini_comments"], [])
+        self.assertEqual(mock_paginate.call_args_list[0].kwargs["params"]["since"], "2025-04-01T00:00:00Z")
+
+class TestParallelRepositoryCrawl(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_poems_merge_in_repository_order(self):
+        """Poems are merged in search order even when a later repository finishes first."""
+        import time
+
+        def collect(owner, repo, model_name_to_use, max_prs, **kwargs):
+            if repo == "slow":
+                time.sleep(0.2)
+            return [{"repository": f"{owner}/{repo}", "n": n} for n in range(2)]
+
+        mock_collect = patch('get_new_flowers.collect_poems_from_repo', side_effect=collect).start()
+        repos = [("o", "slow"), ("o", "fast"), ("o", "other")]
+
+        poems = get_new_flowers.collect_poems_from_repos(repos, "some/model", 10, repo_workers=3, concurrency=2)
+
+        self.assertEqual(
+            [(poem["repository"], poem["n"]) for poem in poems],
+            [("o/slow", 0), ("o/slow", 1), ("o/fast", 0), ("o/fast", 1), ("o/other", 0), ("o/other", 1)]
+        )
+        self.assertEqual(mock_collect.call_count, 3)
+        self.assertEqual(mock_collect.call_args.kwargs["concurrency"], 2)
+        self.assertTrue({"o/slow", "o/fast", "o/other"} <= get_new_flowers.run_stats["repositories_checked"])
+
+class TestWorkQueueCrawl(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        patch.stopall()
+        self.temp_dir.cleanup()
+
+    def test_coordinator_splits_processes_and_merges(self):
+        """The coordinator enqueues PR ranges, processes them and advances the watermark from the results."""
+        from src.work_queue import WorkQueue
+        from src.crawl_state import CrawlState
+
+        prs = [{"number": n, "updated_at": f"2025-05-{n:02d}T00:00:00Z"} for n in (5, 4, 3, 2, 1)]
+        patch('get_new_flowers._list_pull_requests', return_value=(prs, True)).start()
+
+        def collect(owner, repo, pr_numbers, model_name_to_use, **kwargs):
+            poems = [{"link": f"https://github.com/{owner}/{repo}/pull/{n}", "poem": ["line"]} for n in pr_numbers]
+            return poems, {"issue_comment_id": 100 + max(pr_numbers)}, True
+
+        mock_collect = patch('get_new_flowers.collect_poems_from_prs', side_effect=collect).start()
+        queue = WorkQueue(os.path.join(self.temp_dir.name, "queue.db"))
+        crawl_state = CrawlState(os.path.join(self.temp_dir.name, "state.json"))
+
+        poems = get_new_flowers.coordinate_queue(queue, [("o", "r")], "some/model", 10, "coordinator", task_size=2, crawl_state=crawl_state)
+
+        self.assertEqual([call.args[2] for call in mock_collect.call_args_list], [[5, 4], [3, 2], [1]])
+        self.assertEqual([poem["link"][-1] for poem in poems], ["5", "4", "3", "2", "1"])
+        self.assertEqual(
+            crawl_state.get_watermark("o/r"),
+            {"pr_updated_at": "2025-05-05T00:00:00Z", "issue_comment_id": 105}
+        )
+
+    def test_worker_waits_for_the_coordinator(self):
+        """A worker started before any task exists keeps polling until the coordinator finished enqueueing."""
+        from src.work_queue import WorkQueue
+
+        queue = WorkQueue(os.path.join(self.temp_dir.name, "queue.db"))
+        polls = []
+
+        def coordinator_step(seconds):
+            polls.append(seconds)
+            if len(polls) == 2:
+                queue.enqueue("o", "r", {"pr_numbers": [1], "pr_updated_at": "2025-05-01T00:00:00Z", "watermark": {}})
+                queue.finish_enqueueing()
+
+        patch('get_new_flowers.time.sleep', side_effect=coordinator_step).start()
+        mock_collect = patch('get_new_flowers.collect_poems_from_prs', return_value=([], {}, True)).start()
+
+        processed = get_new_flowers.process_queue(queue, "worker", "some/model", poll_interval=1)
+
+        self.assertEqual(processed, 1)
+        self.assertEqual(len(polls), 2)
+        mock_collect.assert_called_once()
+
+    def test_failed_task_keeps_watermark(self):
+        """A repository with a failed task does not advance its watermark."""
+        from src.work_queue import WorkQueue
+        from src.crawl_state import CrawlState
+
+        patch('get_new_flowers._list_pull_requests', return_value=([{"number": 1, "updated_at": "2025-05-01T00:00:00Z"}], True)).start()
+        patch('get_new_flowers.collect_poems_from_prs', side_effect=RuntimeError("boom")).start()
+        queue = WorkQueue(os.path.join(self.temp_dir.name, "queue.db"), max_attempts=1)
+        crawl_state = CrawlState(os.path.join(self.temp_dir.name, "state.json"))
+
+        poems = get_new_flowers.coordinate_queue(queue, [("o", "r")], "some/model", 10, "coordinator", crawl_state=crawl_state)
+
+        self.assertEqual(poems, [])
+        self.assertEqual(crawl_state.get_watermark("o/r"), {})
+
+class TestProcessedCommentIndex(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        patch.stopall()
+        self.temp_dir.cleanup()
+
+    def test_unchanged_comments_skip_extraction(self):
+        """Comments processed in a previous run are only sent to the LLM again when edited or failed."""
+        from src.comment_index import CommentIndex, NO_POEM, ERROR
+
+        gemini = {"login": "gemini-code-assist[bot]"}
+        comments = [
+            {"id": n, "user": gemini, "body": f"body {n}", "updated_at": "2025-05-01T00:00:00Z",
+             "html_url": f"https://github.com/o/r/pull/1#issuecomment-{n}"}
+            for n in (1, 2, 3)
+        ]
+        mock_extract = patch('get_new_flowers._aextract_poem_with_outcome', return_value=(None, None, NO_POEM)).start()
+        index = CommentIndex(os.path.join(self.temp_dir.name, "comment-index.json"))
+        index.record("comment", comments[0], NO_POEM)
+        index.record("comment", comments[1], ERROR)
+        index.record("comment", dict(comments[2], updated_at="2025-04-01T00:00:00Z"), NO_POEM)
+
+        get_new_flowers._extract_poems("o", "r", [1], [[(comment, "comment") for comment in comments]], "some/model", comment_index=index)
+
+        self.assertEqual([call.args[0] for call in mock_extract.call_args_list], ["body 2", "body 3"])
+        self.assertTrue(all(index.is_processed("comment", comment) for comment in comments))
+
+    def test_failed_comments_are_retried_under_the_watermark(self):
+        """A comment that failed stays out of the watermark and is extracted again by the next run."""
+        from src.comment_index import CommentIndex, POEM, ERROR
+        from src.crawl_state import CrawlState
+
+        gemini = {"login": "gemini-code-assist[bot]"}
+        prs = [{"number": n, "updated_at": f"2025-05-0{n}T00:00:00Z"} for n in (3, 2, 1)]
+        comments = {n: [({"id": n * 10, "user": gemini, "body": f"body {n}", "updated_at": "2025-05-01T00:00:00Z",
+                          "html_url": f"https://github.com/o/r/pull/{n}#issuecomment-{n * 10}"}, "comment")]
+                    for n in (3, 2, 1)}
+        patch('get_new_flowers._list_pull_requests', side_effect=lambda owner, repo, updated_after=None, max_prs=None: (
+            [pr for pr in prs if updated_after is None or pr["updated_at"] > updated_after], True)).start()
+        patch('get_new_flowers.fetch_gemini_comments', side_effect=lambda owner, repo, pr_numbers, concurrency, failed_prs=None: [comments[n] for n in pr_numbers]).start()
+        mock_extract = patch('get_new_flowers._aextract_poem_with_outcome',
+                             side_effect=lambda body, *args, **kwargs: (None, None, ERROR if body == "body 2" else POEM)).start()
+        crawl_state = CrawlState(os.path.join(self.temp_dir.name, "state.json"))
+        index = CommentIndex(os.path.join(self.temp_dir.name, "comment-index.json"))
+
+        get_new_flowers.collect_poems_from_repo("o", "r", "some/model", crawl_state=crawl_state, comment_index=index)
+        self.assertEqual(crawl_state.get_watermark("o/r"), {"pr_updated_at": "2025-05-01T00:00:00Z", "issue_comment_id": 10})
+
+        mock_extract.reset_mock()
+        get_new_flowers.collect_poems_from_repo("o", "r", "some/model", crawl_state=crawl_state, comment_index=index)
+        self.assertEqual([call.args[0] for call in mock_extract.call_args_list], ["body 2"])
+
+    def test_failed_fetch_keeps_watermark(self):
+        """A PR whose comments could not all be fetched holds the watermark back and is left for a later run."""
+        from src.crawl_state import CrawlState
+
+        prs = [{"number": n, "updated_at": f"2025-05-0{n}T00:00:00Z"} for n in (2, 1)]
+        patch('get_new_flowers._list_pull_requests', return_value=(prs, True)).start()
+
+        def fetch(owner, repo, pr_numbers, concurrency, failed_prs=None):
+            failed_prs.append(2)
+            return [[] for _ in pr_numbers]
+
+        patch('get_new_flowers.fetch_gemini_comments', side_effect=fetch).start()
+        mock_extract = patch('get_new_flowers._extract_poems', return_value=[]).start()
+        crawl_state = CrawlState(os.path.join(self.temp_dir.name, "state.json"))
+
+        get_new_flowers.collect_poems_from_repo("o", "r", "some/model", crawl_state=crawl_state)
+
+        self.assertEqual(mock_extract.call_args.args[2], [1])
+        self.assertEqual(crawl_state.get_watermark("o/r"), {})
+
+    def test_truncated_graphql_prs_are_fetched_through_rest(self):
+        """PRs whose GraphQL connections were cut at one page get their comments from the REST fetchers."""
+        gemini = {"login": "gemini-code-assist[bot]"}
+        graphql_comment = {"id": 10, "user": gemini, "body": "graphql poem"}
+        prs = [{"number": n, "updated_at": "2025-05-01T00:00:00Z", "comments": [dict(graphql_comment, id=n * 10)],
+                "reviews": [], "truncated": n == 2} for n in (2, 1)]
+        patch('get_new_flowers.list_pull_requests_with_comments', return_value=(prs, True)).start()
+        mock_fetch = patch('get_new_flowers.fetch_gemini_comments', return_value=[[({"id": 21, "user": gemini, "body": "rest poem"}, "comment")]]).start()
+        mock_extract = patch('get_new_flowers._extract_poems', return_value=[]).start()
+
+        get_new_flowers.collect_poems_from_repo("o", "r", "some/model", ingestion="graphql")
+
+        self.assertEqual(mock_fetch.call_args.args[2], [2])
+        self.assertEqual([[comment["id"] for comment, _ in comments] for comments in mock_extract.call_args.args[3]], [[21], [10]])
+
+    def test_failed_comments_bypass_the_comment_id_watermark(self):
+        """Comments the index holds as failed or edited are processed even at or below the comment id watermark."""
+        from src.comment_index import CommentIndex, POEM, ERROR
+
+        gemini = {"login": "gemini-code-assist[bot]"}
+        comments = [
+            {"id": n, "user": gemini, "body": f"body {n}", "updated_at": "2025-05-01T00:00:00Z",
+             "html_url": f"https://github.com/o/r/pull/1#issuecomment-{n}"}
+            for n in (1, 2, 3)
+        ]
+        mock_extract = patch('get_new_flowers._aextract_poem_with_outcome', return_value=(None, None, POEM)).start()
+        index = CommentIndex(os.path.join(self.temp_dir.name, "comment-index.json"))
+        index.record("comment", comments[0], POEM)
+        index.record("comment", comments[1], ERROR)
+
+        get_new_flowers._extract_poems("o", "r", [1], [[(comment, "comment") for comment in comments]], "some/model",
+                                       watermark={"issue_comment_id": 3}, comment_index=index)
+
+        self.assertEqual([call.args[0] for call in mock_extract.call_args_list], ["body 2"])
+
+class TestResumableRun(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        patch.stopall()
+        self.temp_dir.cleanup()
+
+    def test_resume_skips_completed_prs(self):
+        """PRs completed before an interruption are neither fetched nor processed again."""
+        from src.poem_journal import PoemJournal
+
+        journal = PoemJournal(os.path.join(self.temp_dir.name, "poem-journal.jsonl"))
+        journal.append_poem("o/r", 3, {"link": "https://github.com/o/r/pull/3", "poem": ["line"]})
+        journal.mark_pr_done("o/r", 3)
+        resumed = PoemJournal(journal.journal_file)
+        self.assertEqual(len(resumed.replay()), 1)
+
+        prs = [{"number": n, "updated_at": f"2025-05-0{n}T00:00:00Z"} for n in (3, 2)]
+        patch('get_new_flowers._list_pull_requests', return_value=(prs, True)).start()
+        mock_fetch = patch('get_new_flowers.fetch_gemini_comments', return_value=[[]]).start()
+
+        get_new_flowers.collect_poems_from_repo("o", "r", "some/model", 10, journal=resumed)
+
+        self.assertEqual(mock_fetch.call_args.args[2], [2])
+        self.assertTrue(resumed.is_pr_done("o/r", 2))
+
+    def test_resume_retries_prs_with_failed_comments(self):
+        """A PR whose LLM call failed before an interruption is processed again on resume, and the watermark waits for it."""
+        from src.poem_journal import PoemJournal
+        from src.crawl_state import CrawlState
+        from src.comment_index import CommentIndex, POEM, ERROR
+
+        gemini = {"login": "gemini-code-assist[bot]"}
+        prs = [{"number": n, "updated_at": f"2025-05-0{n}T00:00:00Z"} for n in (3, 2)]
+        comments = {n: [({"id": n * 10, "user": gemini, "body": f"body {n}", "updated_at": "2025-05-01T00:00:00Z",
+                          "html_url": f"https://github.com/o/r/pull/{n}#issuecomment-{n * 10}"}, "comment")]
+                    for n in (3, 2)}
+        patch('get_new_flowers._list_pull_requests', return_value=(prs, True)).start()
+        patch('get_new_flowers.fetch_gemini_comments', side_effect=lambda owner, repo, pr_numbers, concurrency, failed_prs=None: [comments[n] for n in pr_numbers]).start()
+        provider_down = {"body 2"}
+        mock_extract = patch('get_new_flowers._aextract_poem_with_outcome', side_effect=lambda body, *args, **kwargs: (
+            (None, None, ERROR) if body in provider_down else (["A line,", "Another line"], "<link>", POEM))).start()
+        journal_file = os.path.join(self.temp_dir.name, "poem-journal.jsonl")
+        state_file = os.path.join(self.temp_dir.name, "state.json")
+
+        # First run: the provider fails for PR 2, then the run is interrupted before saving the state or index
+        get_new_flowers.collect_poems_from_repo("o", "r", "some/model", journal=PoemJournal(journal_file),
+                                                crawl_state=CrawlState(state_file), comment_index=CommentIndex(os.path.join(self.temp_dir.name, "index.json")))
+
+        provider_down.clear()
+        mock_extract.reset_mock()
+        resumed = PoemJournal(journal_file)
+        recovered = resumed.replay()
+        crawl_state = CrawlState(state_file)
+        poems = get_new_flowers.collect_poems_from_repo("o", "r", "some/model", journal=resumed, crawl_state=crawl_state,
+                                                        comment_index=CommentIndex(os.path.join(self.temp_dir.name, "index.json")))
+
+        self.assertEqual([poem["pr_number"] for poem in recovered + poems], [3, 2])
+        self.assertEqual([call.args[0] for call in mock_extract.call_args_list], ["body 2"])
+        self.assertEqual(crawl_state.get_watermark("o/r"), {})
+
+class TestConcurrentExtraction(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_llm_calls_run_concurrently_and_keep_order(self):
+        """LLM calls from several PRs overlap up to the per-model cap and poems keep PR and comment order."""
+        import asyncio
+
+        in_flight = []
+        peak = []
+
+        class FakeClient:
+            async def aextract_poem(self, prompt):
+                in_flight.append(prompt)
+                peak.append(len(in_flight))
+                await asyncio.sleep(0.01 if "slow" in prompt else 0)
+                in_flight.remove(prompt)
+                body = prompt.split("BODY:")[1].strip()
+                return f"A line of {body}\nAnother line of {body}"
+
+        patch('get_new_flowers.get_client_for_model', return_value=FakeClient()).start()
+        patch.object(Config, 'POEM_EXTRACTION_PROMPT', "BODY: {comment_body}").start()
+        patch.object(get_new_flowers.poem_scorer, 'threshold', 0).start()
+        gemini = {"login": "gemini-code-assist[bot]"}
+
+        def comment(comment_id, body):
+            return ({"id": comment_id, "user": gemini, "body": body,
+                     "html_url": f"https://github.com/o/r/pull/1#issuecomment-{comment_id}"}, "comment")
+
+        comments_by_pr = [[comment(1, "slow one"), comment(2, "two")], [comment(3, "slow three")], [comment(4, "four")]]
+        poems = get_new_flowers._extract_poems("o", "r", [1, 2, 3], comments_by_pr, "some/model", llm_concurrency=2)
+
+        self.assertEqual([(poem["pr_number"], poem["link"][-1]) for poem in poems], [(1, "1"), (1, "2"), (2, "3"), (3, "4")])
+        self.assertEqual(max(peak), 2)
+
+    def test_failing_llm_calls_do_not_exit(self):
+        """Failed calls record their comments as errors instead of exiting once as many failures as models pile up."""
+        class FailingClient:
+            async def aextract_poem(self, prompt):
+                raise Exception("connection reset")
+
+        patch('get_new_flowers.get_client_for_model', return_value=FailingClient()).start()
+        patch('get_new_flowers.load_custom_llm_models', return_value=[f"custom/model-{n}" for n in range(6)]).start()
+        patch.object(get_new_flowers.poem_scorer, 'threshold', 0).start()
+        handler = get_new_flowers.ErrorHandler(Config.get_initial_stats())
+        patch.object(get_new_flowers, 'error_handler', handler).start()
+        gemini = {"login": "gemini-code-assist[bot]"}
+        comments_by_pr = [[({"id": comment_id, "user": gemini, "body": "some poem",
+                             "html_url": f"https://github.com/o/r/pull/1#issuecomment-{comment_id}"}, "comment")]
+                          for comment_id in range(1, 11)]
+
+        poems = get_new_flowers._extract_poems("o", "r", list(range(1, 11)), comments_by_pr, "some/model")
+
+        self.assertEqual(poems, [])
+        self.assertEqual(len(handler.failed_litellm_models), 10)
+
+    def test_repositories_share_loop_bound_clients(self):
+        """Repositories extracted one after the other reuse LiteLLM's async client, which is bound to the loop that created it."""
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from src.llm_client_template import LiteLLMClient
+
+        class ChatCompletions(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                body = json.dumps({
+                    "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "loop-test",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": "Roses in the diff\nViolets in the tests"}}],
+                    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), ChatCompletions)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        patch.object(Config, 'OLLAMA_API_URL', f"http://127.0.0.1:{server.server_port}").start()
+        patch.dict(os.environ, {"GITHUB_TOKEN": "fake_github_token", "OPENAI_API_KEY": "test-key"}).start()
+        patch.object(LiteLLMClient, 'response_cache', None).start()
+        patch.object(LiteLLMClient, 'cassette', None).start()
+        patch.object(get_new_flowers.poem_scorer, 'threshold', 0).start()
+        handler = get_new_flowers.ErrorHandler(Config.get_initial_stats())
+        patch.object(get_new_flowers, 'error_handler', handler).start()
+        gemini = {"login": "gemini-code-assist[bot]"}
+
+        for repo in ("first", "second"):
+            comments_by_pr = [[({"id": 1, "user": gemini, "body": "a poem",
+                                 "html_url": f"https://github.com/o/{repo}/pull/1#issuecomment-1"}, "comment")]]
+            failed = []
+            poems = get_new_flowers._extract_poems("o", repo, [1], comments_by_pr, "openai/loop-test", failed_comments=failed)
+
+            self.assertEqual(failed, [])
+            self.assertEqual([poem["repository"] for poem in poems], [f"o/{repo}"])
+
+class TestPoemGate(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_low_scoring_comments_skip_the_llm(self):
+        """Comments unlikely to contain a poem are settled as NO_POEM without an LLM call."""
+        mock_get_client = patch('get_new_flowers.get_client_for_model').start()
+        mock_get_client.return_value.extract_poem.return_value = "Quiet tests now pass,\nThe parser learns nested blocks,\nCode review is done."
+        patch.object(get_new_flowers.poem_scorer, 'threshold', 0.3).start()
+        review = "The function reads the file on every call, which is wasteful when it is called in a loop.\n\n```python\nload(path)\n```"
+        summary = ("This pull request tidies up the parser and adds tests for the nested block handling.\n\n"
+                   "> Quiet tests now pass,\n> The parser learns nested blocks,\n> Code review is done.\n")
+
+        self.assertEqual(get_new_flowers._extract_poem_with_outcome(review, "some/model"), (None, None, "no_poem"))
+        mock_get_client.return_value.extract_poem.assert_not_called()
+
+        get_new_flowers._extract_poem_with_outcome(summary, "some/model")
+        mock_get_client.return_value.extract_poem.assert_called_once()
+
+class TestModelRouting(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_failing_model_falls_over_to_the_next(self):
+        """With a router, a failing model is recorded and the comment is extracted by another model without exiting."""
+        import asyncio
+        from collections import defaultdict
+        from src.model_router import ModelRouter
+
+        class FakeClient:
+            def __init__(self, model_name):
+                self.model_name = model_name
+
+            async def aextract_poem(self, prompt):
+                if self.model_name == "bad/model":
+                    raise Exception("connection refused")
+                return "Quiet tests now pass,\nThe parser learns nested blocks"
+
+        router = ModelRouter(["bad/model", "good/model"])
+        patch('get_new_flowers.get_client_for_model', side_effect=FakeClient).start()
+        patch.object(get_new_flowers, 'model_router', router).start()
+        patch.object(get_new_flowers.poem_scorer, 'threshold', 0).start()
+        mock_handle = patch.object(get_new_flowers.error_handler, 'handle_litellm_error', return_value=(False, 0)).start()
+        mock_exit_check = patch.object(get_new_flowers.error_handler, 'check_all_models_failed').start()
+
+        semaphores = defaultdict(lambda: asyncio.Semaphore(1))
+        poem_lines, _, outcome = asyncio.run(get_new_flowers._aextract_poem_with_outcome("some poem", "bad/model", False, semaphores))
+
+        self.assertEqual(outcome, "poem")
+        self.assertEqual([line.strip() for line in poem_lines], ["Quiet tests now pass,", "The parser learns nested blocks"])
+        mock_handle.assert_called_once()
+        mock_exit_check.assert_not_called()
+        snapshot = router.snapshot()
+        self.assertEqual((snapshot["bad/model"]["error_rate"], snapshot["good/model"]["error_rate"]), (1.0, 0.0))
+
+class TestRateLimitDeferral(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_rate_limited_comment_is_deferred_without_blocking(self):
+        """A rate-limited comment waits for its model while comments for other models go through, then is retried."""
+        import asyncio
+        import time
+        from collections import defaultdict
+
+        calls = []
+        handler = get_new_flowers.ErrorHandler(Config.get_initial_stats())
+
+        def short_rate_limit(error_str, model_name):
+            handler.available_after[model_name] = time.monotonic() + 0.05
+            return True, 0.05
+
+        class FakeClient:
+            def __init__(self, model_name):
+                self.model_name = model_name
+
+            async def aextract_poem(self, prompt):
+                calls.append(self.model_name)
+                if calls.count("busy/model") == 1 and self.model_name == "busy/model":
+                    raise Exception("429 rate limit exceeded")
+                return "Quiet tests now pass,\nThe parser learns nested blocks"
+
+        patch('get_new_flowers.get_client_for_model', side_effect=FakeClient).start()
+        patch.object(get_new_flowers.poem_scorer, 'threshold', 0).start()
+        patch.object(handler, 'handle_rate_limit', side_effect=short_rate_limit).start()
+        patch.object(get_new_flowers, 'error_handler', handler).start()
+        mock_sleep = patch('src.error_handler.time.sleep').start()
+
+        async def run():
+            semaphores = defaultdict(lambda: asyncio.Semaphore(1))
+            return await asyncio.gather(
+                get_new_flowers._aextract_poem_with_outcome("some poem", "busy/model", False, semaphores),
+                get_new_flowers._aextract_poem_with_outcome("some poem", "idle/model", False, semaphores))
+
+        busy, idle = asyncio.run(run())
+
+        self.assertEqual((busy[2], idle[2]), ("poem", "poem"))
+        self.assertEqual(calls, ["busy/model", "idle/model", "busy/model"])
+        mock_sleep.assert_not_called()
+
+    def test_queued_comments_wait_out_the_cooldown(self):
+        """Comments already waiting on a model's semaphore do not call it while it is rate limited."""
+        import asyncio
+        import time
+        from collections import defaultdict
+
+        call_times = []
+        handler = get_new_flowers.ErrorHandler(Config.get_initial_stats())
+
+        def short_rate_limit(error_str, model_name):
+            handler.available_after[model_name] = time.monotonic() + 0.05
+            return True, 0.05
+
+        class FakeClient:
+            async def aextract_poem(self, prompt):
+                call_times.append(time.monotonic())
+                if len(call_times) == 1:
+                    raise Exception("429 rate limit exceeded")
+                return "Quiet tests now pass,\nThe parser learns nested blocks"
+
+        patch('get_new_flowers.get_client_for_model', return_value=FakeClient()).start()
+        patch.object(get_new_flowers.poem_scorer, 'threshold', 0).start()
+        patch.object(handler, 'handle_rate_limit', side_effect=short_rate_limit).start()
+        patch.object(get_new_flowers, 'error_handler', handler).start()
+
+        async def run():
+            semaphores = defaultdict(lambda: asyncio.Semaphore(1))
+            return await asyncio.gather(*(
+                get_new_flowers._aextract_poem_with_outcome(f"some poem {n}", "busy/model", False, semaphores)
+                for n in range(5)))
+
+        results = asyncio.run(run())
+
+        self.assertEqual([outcome for _, _, outcome in results], ["poem"] * 5)
+        self.assertEqual(len(call_times), 6)
+        self.assertTrue(all(call_time - call_times[0] >= 0.04 for call_time in call_times[1:]))
+
 if __name__ == '__main__':
     unittest.main()
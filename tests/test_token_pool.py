@@ -0,0 +1,104 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+from src.token_pool import TokenPool
+from src.rate_limiter import RateLimiter
+from src.github_client import GitHubClient
+from src.config import Config
+
+def make_response(status_code=200, headers=None, body=b"[]"):
+    """Build a requests.Response with the given status and headers."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+def quota_headers(remaining, reset=4102444800):
+    """Build rate-limit headers for a quota."""
+    return {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset), "X-RateLimit-Limit": "5000"}
+
+class TestTokenPool(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a pool of three tokens and a limiter that never sleeps."""
+        self.pool = TokenPool(["token-a", "token-b", "token-c", "token-a", ""])
+        self.limiter = RateLimiter(sleep=lambda seconds: None)
+
+    def test_deduplicates_tokens(self):
+        """Duplicate and empty tokens are dropped."""
+        self.assertEqual(self.pool.tokens, ["token-a", "token-b", "token-c"])
+        self.assertEqual(len(self.pool), 3)
+
+    def test_empty_pool(self):
+        """A pool needs at least one token."""
+        with self.assertRaises(ValueError):
+            TokenPool(["", None])
+
+    def test_prefers_most_headroom(self):
+        """Tokens with unknown quota count as fresh, then the highest remaining quota wins."""
+        self.limiter.update("core", make_response(headers=quota_headers(100)), token_id=0)
+        self.limiter.update("core", make_response(headers=quota_headers(4000)), token_id=1)
+        self.assertEqual(self.pool.select(self.limiter), (2, "token-c"))
+
+        self.limiter.update("core", make_response(headers=quota_headers(50)), token_id=2)
+        self.assertEqual(self.pool.select(self.limiter), (1, "token-b"))
+
+    def test_skips_exhausted_tokens(self):
+        """A token paused by the limiter is skipped while another one is available."""
+        for token_id in range(3):
+            self.limiter.update("core", make_response(headers=quota_headers(4000 + token_id)), token_id=token_id)
+        self.limiter.update("core", make_response(403, quota_headers(0)), token_id=2)
+        self.assertEqual(self.pool.select(self.limiter), (1, "token-b"))
+
+class TestGitHubClientTokenFailover(unittest.TestCase):
+
+    def test_rate_limited_request_fails_over(self):
+        """A request rejected for one token is retried with the next best token."""
+        client = GitHubClient(
+            token_pool=TokenPool(["token-a", "token-b"]),
+            rate_limiter=RateLimiter(sleep=lambda seconds: None)
+        )
+        responses = [
+            make_response(403, quota_headers(0), b'{"message": "API rate limit exceeded"}'),
+            make_response(200, quota_headers(4999)),
+        ]
+        with patch.object(client.session, 'get', side_effect=responses) as mock_get:
+            response = client.get(f"{Config.GITHUB_API_URL}/repos/o/r/pulls")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_get.call_args_list[0].kwargs["headers"]["Authorization"], "token token-a")
+        self.assertEqual(mock_get.call_args_list[1].kwargs["headers"]["Authorization"], "token token-b")
+        client.close()
+
+    def test_explicit_authorization_is_kept(self):
+        """Callers passing their own Authorization header bypass the pool."""
+        client = GitHubClient(token_pool=TokenPool(["token-a"]))
+        with patch.object(client.session, 'get', return_value=make_response()) as mock_get:
+            client.get("https://api.github.com/user", headers={"Authorization": "token mine"})
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"Authorization": "token mine"})
+        client.close()
+
+class TestConfigTokens(unittest.TestCase):
+
+    def test_tokens_from_all_sources(self):
+        """Tokens are gathered from GITHUB_TOKENS, the token file and GITHUB_TOKEN without duplicates."""
+        import tempfile
+        with tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False) as f:
+            f.write("# pool\ntoken-c\n\ntoken-a\n")
+        try:
+            with patch.object(Config, 'GITHUB_TOKENS', "token-a, token-b"), \
+                 patch.object(Config, 'GITHUB_TOKEN_FILE', f.name), \
+                 patch.object(Config, 'GITHUB_TOKEN', "token-d"):
+                self.assertEqual(Config.get_github_tokens(), ["token-a", "token-b", "token-c", "token-d"])
+        finally:
+            os.remove(f.name)
+
+if __name__ == '__main__':
+    unittest.main()
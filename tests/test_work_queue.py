@@ -0,0 +1,143 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+
+# Adjust sys.path to include the project root directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.work_queue import WorkQueue
+
+class FakeClock:
+    """Controllable wall clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestWorkQueue(unittest.TestCase):
+
+    def setUp(self):
+        """Create a queue in a temporary database."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "queue.db")
+        self.clock = FakeClock()
+        self.queue = WorkQueue(self.db_path, lease_seconds=60, max_attempts=2, clock=self.clock)
+
+    def tearDown(self):
+        """Remove the temporary database."""
+        self.temp_dir.cleanup()
+
+    def test_tasks_are_leased_in_order_once(self):
+        """Tasks are leased oldest first and never to two workers."""
+        first = self.queue.enqueue("o", "r", {"pr_numbers": [3, 2]})
+        second = self.queue.enqueue("o", "r", {"pr_numbers": [1]})
+
+        task = self.queue.lease("worker-a")
+        self.assertEqual((task["id"], task["payload"], task["attempts"]), (first, {"pr_numbers": [3, 2]}, 1))
+        self.assertEqual(self.queue.lease("worker-b")["id"], second)
+        self.assertIsNone(self.queue.lease("worker-c"))
+
+    def test_complete_stores_result(self):
+        """Completed tasks keep their result and the queue finishes."""
+        task_id = self.queue.enqueue("o", "r", {})
+        self.queue.lease("worker-a")
+        self.assertFalse(self.queue.is_finished())
+
+        self.assertTrue(self.queue.complete(task_id, "worker-a", {"poems": [{"link": "x"}]}))
+
+        self.assertTrue(self.queue.is_finished())
+        self.assertEqual(self.queue.tasks()[0]["result"], {"poems": [{"link": "x"}]})
+
+    def test_expired_lease_is_requeued(self):
+        """A task whose worker stopped responding is leased again, and the late result is dropped."""
+        task_id = self.queue.enqueue("o", "r", {})
+        self.queue.lease("dead-worker")
+        self.assertIsNone(self.queue.lease("worker-b"))
+
+        self.clock.now += 61
+        task = self.queue.lease("worker-b")
+        self.assertEqual((task["id"], task["attempts"]), (task_id, 2))
+        self.assertFalse(self.queue.complete(task_id, "dead-worker", {}))
+        self.assertTrue(self.queue.complete(task_id, "worker-b", {}))
+
+    def test_renewed_lease_is_kept(self):
+        """A renewed lease does not expire, and only its holder can renew it."""
+        task_id = self.queue.enqueue("o", "r", {})
+        self.queue.lease("worker-a")
+
+        self.clock.now += 50
+        self.assertTrue(self.queue.renew(task_id, "worker-a"))
+        self.assertFalse(self.queue.renew(task_id, "worker-b"))
+        self.clock.now += 50
+        self.assertIsNone(self.queue.lease("worker-b"))
+        self.assertTrue(self.queue.complete(task_id, "worker-a", {}))
+
+    def test_heartbeat_renews_the_lease(self):
+        """The heartbeat keeps renewing the lease while the block runs."""
+        task_id = self.queue.enqueue("o", "r", {})
+        self.queue.lease("worker-a")
+        renewed = threading.Event()
+        renew = self.queue.renew
+
+        def renew_and_signal(*args):
+            result = renew(*args)
+            renewed.set()
+            return result
+
+        self.queue.renew = renew_and_signal
+        self.clock.now += 50
+        with self.queue.heartbeat(task_id, "worker-a", interval=0.01):
+            self.assertTrue(renewed.wait(5))
+            self.clock.now += 50
+            self.assertIsNone(self.queue.lease("worker-b"))
+
+    def test_enqueueing_marker(self):
+        """The coordinator's marker is set by finish_enqueueing and cleared by reset."""
+        self.assertFalse(self.queue.is_enqueueing_done())
+        self.queue.finish_enqueueing()
+        self.assertTrue(self.queue.is_enqueueing_done())
+        self.queue.reset()
+        self.assertFalse(self.queue.is_enqueueing_done())
+
+    def test_attempts_are_limited(self):
+        """A task that keeps failing or expiring is marked failed after max_attempts leases."""
+        task_id = self.queue.enqueue("o", "r", {})
+        self.queue.lease("worker-a")
+        self.queue.fail(task_id, "worker-a", "boom")
+        self.assertEqual(self.queue.counts()["pending"], 1)
+
+        self.queue.lease("worker-a")
+        self.clock.now += 61
+        self.assertIsNone(self.queue.lease("worker-b"))
+        self.assertEqual(self.queue.tasks()[0]["status"], "failed")
+        self.assertTrue(self.queue.is_finished())
+
+    def test_concurrent_workers(self):
+        """Workers on separate connections lease every task exactly once."""
+        for number in range(40):
+            self.queue.enqueue("o", "r", {"pr_numbers": [number]})
+        leased = []
+        lock = threading.Lock()
+
+        def work(worker_id):
+            queue = WorkQueue(self.db_path, lease_seconds=60)
+            while (task := queue.lease(worker_id)) is not None:
+                with lock:
+                    leased.append(task["id"])
+                queue.complete(task["id"], worker_id, {})
+
+        threads = [threading.Thread(target=work, args=(f"worker-{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(leased), list(range(1, 41)))
+        self.assertEqual(self.queue.counts()["done"], 40)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,11 +33,20 @@ import sys
 from typing import Dict, List, Any
 from dotenv import load_dotenv
 
+# Make the project's src package importable when run as a script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import Config
+from src.github_client import GitHubClient
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Shared pooled session for all GitHub API calls; the per-call headers carry the token
+github_client = GitHubClient()
+
 # Configuration
-GITHUB_API_BASE_URL = "https://api.github.com"
+GITHUB_API_BASE_URL = Config.GITHUB_API_URL
 DEFAULT_REPO_OWNER = "octocat"  # Default repository owner
 DEFAULT_REPO_NAME = "hello-world"  # Default repository name
 
@@ -51,40 +60,22 @@ def get_headers(token: str) -> Dict[str, str]:
 def fetch_review_comments(owner: str, repo: str, pr_number: int, headers: Dict[str, str]) -> List[Dict[str, Any]]:
     """Fetch review comments from the pull request."""
     url = f"{GITHUB_API_BASE_URL}/repos/{owner}/{repo}/pulls/{pr_number}/comments"
-    comments = []
-    while url:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        comments.extend(response.json())
-        url = response.links.get("next", {}).get("url")  # Handle pagination
-    return comments
+    return list(github_client.paginate(url, params={"per_page": Config.GITHUB_PAGE_SIZE}, headers=headers))
 
 def fetch_issue_comments(owner: str, repo: str, pr_number: int, headers: Dict[str, str]) -> List[Dict[str, Any]]:
     """Fetch issue comments from the pull request."""
     url = f"{GITHUB_API_BASE_URL}/repos/{owner}/{repo}/issues/{pr_number}/comments"
-    comments = []
-    while url:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        comments.extend(response.json())
-        url = response.links.get("next", {}).get("url")  # Handle pagination
-    return comments
+    return list(github_client.paginate(url, params={"per_page": Config.GITHUB_PAGE_SIZE}, headers=headers))
 
 def fetch_reviews(owner: str, repo: str, pr_number: int, headers: Dict[str, str]) -> List[Dict[str, Any]]:
     """Fetch reviews from the pull request."""
     url = f"{GITHUB_API_BASE_URL}/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
-    reviews = []
-    while url:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        reviews.extend(response.json())
-        url = response.links.get("next", {}).get("url")  # Handle pagination
-    return reviews
+    return list(github_client.paginate(url, params={"per_page": Config.GITHUB_PAGE_SIZE}, headers=headers))
 
 def fetch_pr_details(owner: str, repo: str, pr_number: int, headers: Dict[str, str]) -> Dict[str, Any]:
     """Fetch basic details about the pull request."""
     url = f"{GITHUB_API_BASE_URL}/repos/{owner}/{repo}/pulls/{pr_number}"
-    response = requests.get(url, headers=headers)
+    response = github_client.get(url, headers=headers)
     response.raise_for_status()
     return response.json()
 
@@ -210,7 +201,7 @@ def parse_args():
 def fetch_latest_prs(owner: str, repo: str, count: int, headers: Dict[str, str]) -> List[int]:
     """Fetch the latest N pull request numbers."""
     url = f"{GITHUB_API_BASE_URL}/repos/{owner}/{repo}/pulls?state=all&sort=updated&direction=desc&per_page={count}"
-    response = requests.get(url, headers=headers)
+    response = github_client.get(url, headers=headers)
     response.raise_for_status()
     return [pr["number"] for pr in response.json()]
 
@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Fake GitHub REST API server for the Gemini Code Assist PR Poetry collection script.
+
+This serves synthetic repositories whose pull requests carry Gemini Code Assist
+comments, so the crawler can be exercised at scale without touching
+api.github.com. It implements the REST endpoints listed in `Config`: repository
+and issue search, pull request listing, issue comments, reviews and review
+comments (per PR and repository-wide), with `Link` pagination, ETags and
+rate-limit headers. The data is generated deterministically from a seed.
+
+Usage examples:
+    # Serve 5 repositories with 200 PRs each on port 8000
+    python utils/fake_github_server.py --repos 5 --prs 200
+
+    # Point the crawler at it
+    GITHUB_API_URL=http://127.0.0.1:8000 python get_new_flowers.py --search --max-repos 5
+
+    # Add 50ms of latency to every response and a low quota to exercise rate limiting
+    python utils/fake_github_server.py --latency 0.05 --rate-limit 500
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+BOT_LOGIN = "gemini-code-assist[bot]"
+HUMAN_LOGINS = ["octocat", "hubot", "monalisa", "defunkt"]
+
+DEFAULT_PAGE_SIZE = 30
+MAX_PAGE_SIZE = 100
+RATE_LIMIT_WINDOW_SECONDS = 3600
+
+# First timestamp of the synthetic history
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+HAIKU_LINES = (
+    ["Code flows like a stream,", "Tests turn red, then bloom to green,", "Refactor the past,"],
+    ["Bugs hide in the night,", "Logs whisper of what went wrong,", "Types guard every door,"],
+    ["Merged with quiet care.", "A cleaner path lies ahead.", "The build sings again."],
+)
+
+def _timestamp(moment):
+    """Format a datetime the way the GitHub API does."""
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class SyntheticGitHub:
+    """Deterministic synthetic repositories, pull requests and comments.
+
+    Every PR has `comments` issue comments. A share of the PRs (`bot_ratio`)
+    also gets a Gemini Code Assist summary comment and a review with inline
+    comments; a share of those summaries (`poem_ratio`) ends with a poem.
+    Comment ids grow with their timestamps, like on GitHub.
+    """
+
+    def __init__(self, owner="synthetic", repos=3, prs=50, comments=5, bot_ratio=0.8, poem_ratio=0.5, seed=0):
+        """Initialize the synthetic data set.
+
+        Args:
+            owner: Owner login of every synthetic repository.
+            repos: Number of repositories.
+            prs: Number of pull requests per repository.
+            comments: Number of human issue comments per pull request.
+            bot_ratio: Share of pull requests Gemini Code Assist commented on.
+            poem_ratio: Share of Gemini summaries that contain a poem.
+            seed: Seed of the generated data.
+        """
+        self.owner = owner
+        self.repo_names = [f"repo-{index}" for index in range(repos)]
+        self.prs_per_repo = prs
+        self.comments_per_pr = comments
+        self.bot_ratio = bot_ratio
+        self.poem_ratio = poem_ratio
+        self.seed = seed
+        self._repos = {}
+        self._lock = threading.Lock()
+
+    def get_repo(self, owner, name):
+        """Get the generated data of a repository, or None if it does not exist."""
+        if owner != self.owner or name not in self.repo_names:
+            return None
+        with self._lock:
+            if name not in self._repos:
+                self._repos[name] = self._generate_repo(self.repo_names.index(name), name)
+            return self._repos[name]
+
+    def repositories(self):
+        """List the repositories in the shape of the search API."""
+        return [{
+            "id": index + 1,
+            "name": name,
+            "full_name": f"{self.owner}/{name}",
+            "owner": {"login": self.owner},
+            "html_url": f"https://github.com/{self.owner}/{name}",
+        } for index, name in enumerate(self.repo_names)]
+
+    def _generate_repo(self, repo_index, name):
+        """Generate the pull requests and comments of a repository."""
+        rng = random.Random(f"{self.seed}/{name}")
+        html_base = f"https://github.com/{self.owner}/{name}"
+        api_base = f"/repos/{self.owner}/{name}"
+        repo = {"pulls": [], "bot_prs": set(), "issue_comments": {}, "reviews": {}, "review_comments": {}}
+        next_id = (repo_index + 1) * 10_000_000
+        moment = BASE_TIME
+
+        for number in range(1, self.prs_per_repo + 1):
+            # Each PR opens an hour after the previous one settled, so ids and timestamps grow together
+            moment += timedelta(hours=1)
+            opened = moment
+            issue_comments, reviews, review_comments = [], [], []
+
+            if rng.random() < self.bot_ratio:
+                moment += timedelta(minutes=1)
+                next_id += 1
+                body = self._summary(rng, rng.random() < self.poem_ratio)
+                issue_comments.append(self._comment(next_id, BOT_LOGIN, "Bot", body, moment,
+                                                    f"{html_base}/pull/{number}#issuecomment-{next_id}",
+                                                    issue_url=f"{api_base}/issues/{number}"))
+                next_id += 1
+                review_id = next_id
+                reviews.append({
+                    "id": review_id,
+                    "user": {"login": BOT_LOGIN, "type": "Bot"},
+                    "body": "## Code Review\n\nThe changes look solid. A few suggestions below.",
+                    "state": "COMMENTED",
+                    "html_url": f"{html_base}/pull/{number}#pullrequestreview-{review_id}",
+                    "submitted_at": _timestamp(moment),
+                })
+                for _ in range(rng.randint(1, 2)):
+                    moment += timedelta(minutes=1)
+                    next_id += 1
+                    review_comments.append(self._comment(
+                        next_id, BOT_LOGIN, "Bot", "![medium](https://www.gstatic.com/codereviewagent/medium-priority.svg)\n\nConsider extracting this into a helper.",
+                        moment, f"{html_base}/pull/{number}#discussion_r{next_id}",
+                        pull_request_url=f"{api_base}/pulls/{number}", pull_request_review_id=review_id
+                    ))
+
+            for _ in range(self.comments_per_pr):
+                moment += timedelta(minutes=rng.randint(1, 30))
+                next_id += 1
+                issue_comments.append(self._comment(next_id, rng.choice(HUMAN_LOGINS), "User", "Thanks, looks good to me.", moment,
+                                                    f"{html_base}/pull/{number}#issuecomment-{next_id}",
+                                                    issue_url=f"{api_base}/issues/{number}"))
+
+            repo["pulls"].append({
+                "number": number,
+                "title": f"Synthetic change #{number}",
+                "state": "closed" if number < self.prs_per_repo else "open",
+                "user": {"login": rng.choice(HUMAN_LOGINS)},
+                "html_url": f"{html_base}/pull/{number}",
+                "created_at": _timestamp(opened),
+                "updated_at": _timestamp(moment),
+            })
+            if reviews:
+                repo["bot_prs"].add(number)
+            repo["issue_comments"][number] = issue_comments
+            repo["reviews"][number] = reviews
+            repo["review_comments"][number] = review_comments
+
+        return repo
+
+    def _summary(self, rng, with_poem):
+        """Build a Gemini Code Assist summary comment."""
+        body = (
+            "## Summary of Changes\n\n"
+            "Hello! I'm Gemini Code Assist, and I'm currently reviewing this pull request. "
+            "This change tidies up the module and adds tests."
+        )
+        if with_poem:
+            body += "\n\n" + "\n".join(f"> {rng.choice(lines)}" for lines in HAIKU_LINES)
+        return body
+
+    def _comment(self, comment_id, login, user_type, body, moment, html_url, **extra):
+        """Build a comment in the REST API shape."""
+        return {
+            "id": comment_id,
+            "user": {"login": login, "type": user_type},
+            "body": body,
+            "html_url": html_url,
+            "created_at": _timestamp(moment),
+            "updated_at": _timestamp(moment),
+            **extra,
+        }
+
+class RateLimits:
+    """Per-client rate-limit quotas, keyed by Authorization header and resource."""
+
+    def __init__(self, limits):
+        """Initialize the quotas.
+
+        Args:
+            limits: Requests allowed per window, keyed by resource ("core", "search").
+        """
+        self.limits = limits
+        self._quotas = {}
+        self._lock = threading.Lock()
+
+    def consume(self, client, resource):
+        """Count a request against a quota.
+
+        Returns:
+            A (allowed, headers) tuple with the rate-limit headers to send.
+        """
+        now = int(time.time())
+        with self._lock:
+            used, reset = self._quotas.get((client, resource), (0, now + RATE_LIMIT_WINDOW_SECONDS))
+            if reset <= now:
+                used, reset = 0, now + RATE_LIMIT_WINDOW_SECONDS
+            allowed = used < self.limits[resource]
+            if allowed:
+                used += 1
+            self._quotas[(client, resource)] = (used, reset)
+        return allowed, {
+            "X-RateLimit-Limit": str(self.limits[resource]),
+            "X-RateLimit-Remaining": str(self.limits[resource] - used),
+            "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Used": str(used),
+            "X-RateLimit-Resource": resource,
+        }
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Request handler serving the synthetic data through GitHub's REST routes."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, keep-alive responses stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    ROUTES = [
+        (re.compile(r"^/search/repositories$"), "search_repositories"),
+        (re.compile(r"^/search/issues$"), "search_issues"),
+        (re.compile(r"^/repos/([^/]+)/([^/]+)/pulls$"), "list_pulls"),
+        (re.compile(r"^/repos/([^/]+)/([^/]+)/issues/comments$"), "list_repo_issue_comments"),
+        (re.compile(r"^/repos/([^/]+)/([^/]+)/pulls/comments$"), "list_repo_review_comments"),
+        (re.compile(r"^/repos/([^/]+)/([^/]+)/issues/(\d+)/comments$"), "list_issue_comments"),
+        (re.compile(r"^/repos/([^/]+)/([^/]+)/pulls/(\d+)/reviews$"), "list_reviews"),
+        (re.compile(r"^/repos/([^/]+)/([^/]+)/pulls/(\d+)/reviews/(\d+)/comments$"), "list_review_comments_for_review"),
+        (re.compile(r"^/repos/([^/]+)/([^/]+)/pulls/(\d+)/comments$"), "list_review_comments"),
+    ]
+
+    def log_message(self, format, *args):
+        """Only log requests when the server runs verbosely."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        """Route a GET request."""
+        url = urlsplit(self.path)
+        self.query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        for pattern, handler_name in self.ROUTES:
+            match = pattern.match(url.path)
+            if match:
+                resource = "search" if url.path.startswith("/search/") else "core"
+                return self._serve(resource, url.path, lambda: getattr(self, handler_name)(*match.groups()))
+        self._send_json(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        """Reject POST requests such as GraphQL queries, which are not simulated."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send_json(404, {"message": "Not Found: only the REST API is simulated"})
+
+    def _serve(self, resource, path, build):
+        """Check the quota, build the result and send it with pagination, ETag and rate-limit headers."""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        result = build()
+        if result is None:
+            return self._send_json(404, {"message": "Not Found"})
+
+        items, wrap = result
+        per_page = min(MAX_PAGE_SIZE, max(1, int(self.query.get("per_page", DEFAULT_PAGE_SIZE))))
+        page = max(1, int(self.query.get("page", 1)))
+        last_page = max(1, -(-len(items) // per_page))
+        page_items = items[(page - 1) * per_page:page * per_page]
+        body = json.dumps(wrap(page_items, len(items)) if wrap else page_items).encode("utf-8")
+
+        headers = {"ETag": f'W/"{hashlib.sha256(body).hexdigest()}"'}
+        links = self._links(path, page, last_page, per_page)
+        if links:
+            headers["Link"] = links
+
+        # Like GitHub, a 304 Not Modified answer does not count against the quota
+        if self.headers.get("If-None-Match") == headers["ETag"]:
+            return self._send(304, b"", headers)
+
+        client = self.headers.get("Authorization") or self.client_address[0]
+        allowed, rate_headers = self.server.rate_limits.consume(client, resource)
+        headers.update(rate_headers)
+        if not allowed:
+            return self._send_json(403, {"message": "API rate limit exceeded"}, rate_headers)
+        self._send(200, body, headers)
+
+    def _links(self, path, page, last_page, per_page):
+        """Build the Link header for a page."""
+        base = f"http://{self.headers.get('Host')}{path}"
+
+        def page_url(number):
+            return f"{base}?{urlencode({**self.query, 'per_page': per_page, 'page': number})}"
+
+        links = []
+        if page < last_page:
+            links += [f'<{page_url(page + 1)}>; rel="next"', f'<{page_url(last_page)}>; rel="last"']
+        if page > 1:
+            links += [f'<{page_url(1)}>; rel="first"', f'<{page_url(page - 1)}>; rel="prev"']
+        return ", ".join(links)
+
+    def _send_json(self, status, data, headers=None):
+        """Send a JSON response."""
+        self._send(status, json.dumps(data).encode("utf-8"), headers or {})
+
+    def _send(self, status, body, headers):
+        """Send a response."""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _absolute(self, items, *fields):
+        """Turn the API paths of some fields into absolute URLs on this server."""
+        base = f"http://{self.headers.get('Host')}"
+        return [{**item, **{field: base + item[field] for field in fields if field in item}} for item in items]
+
+    def _since(self, comments):
+        """Apply the `since`, `sort` and `direction` parameters of the repository-wide comment listings."""
+        since = self.query.get("since")
+        if since:
+            comments = [comment for comment in comments if comment["updated_at"] >= since]
+        reverse = self.query.get("direction", "asc" if "sort" not in self.query else "desc") == "desc"
+        key = "updated_at" if self.query.get("sort") == "updated" else "id"
+        return sorted(comments, key=lambda comment: (comment[key], comment["id"]), reverse=reverse)
+
+    def search_repositories(self):
+        """Handle GET /search/repositories."""
+        return self.server.github.repositories(), lambda page, total: {"total_count": total, "incomplete_results": False, "items": page}
+
+    def search_issues(self):
+        """Handle GET /search/issues for `repo:` queries, optionally filtered by `commenter:` and `updated:>`."""
+        query = self.query.get("q", "")
+        repo_match = re.search(r"repo:([^/\s]+)/(\S+)", query)
+        if not repo_match:
+            return [], lambda page, total: {"total_count": 0, "incomplete_results": False, "items": page}
+        repo = self.server.github.get_repo(*repo_match.groups())
+        if repo is None:
+            return None
+
+        pulls = repo["pulls"]
+        if "commenter:" in query:
+            pulls = [pr for pr in pulls if pr["number"] in repo["bot_prs"]]
+        if updated_match := re.search(r"updated:>(\S+)", query):
+            pulls = [pr for pr in pulls if pr["updated_at"] > updated_match[1]]
+        pulls = sorted(pulls, key=lambda pr: pr["updated_at"], reverse=True)
+        items = [{**pr, "pull_request": {"html_url": pr["html_url"]}} for pr in pulls]
+        return items, lambda page, total: {"total_count": total, "incomplete_results": False, "items": page}
+
+    def list_pulls(self, owner, name):
+        """Handle GET /repos/{owner}/{repo}/pulls."""
+        repo = self.server.github.get_repo(owner, name)
+        if repo is None:
+            return None
+        key = "updated_at" if self.query.get("sort") == "updated" else "created_at"
+        reverse = self.query.get("direction", "desc") == "desc"
+        return sorted(repo["pulls"], key=lambda pr: pr[key], reverse=reverse), None
+
+    def list_issue_comments(self, owner, name, number):
+        """Handle GET /repos/{owner}/{repo}/issues/{number}/comments."""
+        repo = self.server.github.get_repo(owner, name)
+        if repo is None or int(number) not in repo["issue_comments"]:
+            return None
+        return self._absolute(repo["issue_comments"][int(number)], "issue_url"), None
+
+    def list_reviews(self, owner, name, number):
+        """Handle GET /repos/{owner}/{repo}/pulls/{number}/reviews."""
+        repo = self.server.github.get_repo(owner, name)
+        if repo is None or int(number) not in repo["reviews"]:
+            return None
+        return repo["reviews"][int(number)], None
+
+    def list_review_comments(self, owner, name, number):
+        """Handle GET /repos/{owner}/{repo}/pulls/{number}/comments."""
+        repo = self.server.github.get_repo(owner, name)
+        if repo is None or int(number) not in repo["review_comments"]:
+            return None
+        return self._absolute(repo["review_comments"][int(number)], "pull_request_url"), None
+
+    def list_review_comments_for_review(self, owner, name, number, review_id):
+        """Handle GET /repos/{owner}/{repo}/pulls/{number}/reviews/{review_id}/comments."""
+        result = self.list_review_comments(owner, name, number)
+        if result is None:
+            return None
+        return [comment for comment in result[0] if comment["pull_request_review_id"] == int(review_id)], None
+
+    def list_repo_issue_comments(self, owner, name):
+        """Handle GET /repos/{owner}/{repo}/issues/comments."""
+        repo = self.server.github.get_repo(owner, name)
+        if repo is None:
+            return None
+        comments = [comment for comments in repo["issue_comments"].values() for comment in comments]
+        return self._absolute(self._since(comments), "issue_url"), None
+
+    def list_repo_review_comments(self, owner, name):
+        """Handle GET /repos/{owner}/{repo}/pulls/comments."""
+        repo = self.server.github.get_repo(owner, name)
+        if repo is None:
+            return None
+        comments = [comment for comments in repo["review_comments"].values() for comment in comments]
+        return self._absolute(self._since(comments), "pull_request_url"), None
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the synthetic data, quotas and settings."""
+
+    daemon_threads = True
+
+    def __init__(self, address, github, rate_limits, latency=0.0, verbose=False):
+        """Initialize the server.
+
+        Args:
+            address: (host, port) to listen on. Port 0 picks a free port.
+            github: The SyntheticGitHub to serve.
+            rate_limits: The RateLimits tracking client quotas.
+            latency: Seconds added to every response.
+            verbose: Whether to log every request.
+        """
+        super().__init__(address, FakeGitHubHandler)
+        self.github = github
+        self.rate_limits = rate_limits
+        self.latency = latency
+        self.verbose = verbose
+
+    @property
+    def url(self):
+        """Base URL to use as GITHUB_API_URL."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+def start_server(host="127.0.0.1", port=0, rate_limit=5000, search_rate_limit=30, latency=0.0, verbose=False, **synthetic):
+    """Start a fake GitHub server in a background thread.
+
+    Args:
+        host: Interface to listen on.
+        port: Port to listen on. The default 0 picks a free port.
+        rate_limit: Core requests allowed per client and hour.
+        search_rate_limit: Search requests allowed per client and hour.
+        latency: Seconds added to every response.
+        verbose: Whether to log every request.
+        **synthetic: Arguments for SyntheticGitHub (repos, prs, comments, ...).
+
+    Returns:
+        The running FakeGitHubServer. Call `shutdown()` to stop it.
+    """
+    server = FakeGitHubServer(
+        (host, port),
+        SyntheticGitHub(**synthetic),
+        RateLimits({"core": rate_limit, "search": search_rate_limit}),
+        latency=latency,
+        verbose=verbose,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Serve synthetic repositories through a fake GitHub REST API")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--owner", default="synthetic", help="Owner of the synthetic repositories")
+    parser.add_argument("--repos", type=int, default=3, help="Number of synthetic repositories")
+    parser.add_argument("--prs", type=int, default=50, help="Pull requests per repository")
+    parser.add_argument("--comments", type=int, default=5, help="Human issue comments per pull request")
+    parser.add_argument("--bot-ratio", type=float, default=0.8, help="Share of PRs Gemini Code Assist commented on")
+    parser.add_argument("--poem-ratio", type=float, default=0.5, help="Share of Gemini summaries containing a poem")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated data")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="Core requests allowed per token and hour")
+    parser.add_argument("--search-rate-limit", type=int, default=30, help="Search requests allowed per token and hour")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    return parser.parse_args()
+
+def main():
+    """Run the fake GitHub server until interrupted."""
+    args = parse_args()
+    server = FakeGitHubServer(
+        (args.host, args.port),
+        SyntheticGitHub(owner=args.owner, repos=args.repos, prs=args.prs, comments=args.comments,
+                        bot_ratio=args.bot_ratio, poem_ratio=args.poem_ratio, seed=args.seed),
+        RateLimits({"core": args.rate_limit, "search": args.search_rate_limit}),
+        latency=args.latency,
+        verbose=args.verbose,
+    )
+    print(f"Fake GitHub API serving {args.repos} repositories of {args.prs} PRs on {server.url}")
+    print(f"Point the crawler at it with: GITHUB_API_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down")
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())